@@ -1,23 +1,33 @@
 import json
 import sqlite3
-import requests
 import time
 import os
+import uuid
 import random
+import asyncio
+import argparse
 from pathlib import Path
 
+from syllabus_io import find_combined, iter_objectives
+from objective_links import ObjectiveLinks
+from ollama_client import AsyncOllamaClient, OllamaError, shared_client
+
 # Configuration
 OLLAMA_HOST = os.getenv('OLLAMA_HOST', 'http://127.0.0.1:11434')
 MODEL = 'llama3'
 DB_PATH = Path('data/questions.db')
-SYLLABUS_PATH = Path('syllabuses/output/combined_syllabuses.json')
+SYLLABUS_PATH = find_combined('syllabuses/output')  # combined_syllabuses.objs if current, else .ndjson, else .json
 QUESTIONS_PER_SUBJECT = 400  # Target roughly this many per subject
 VARIATIONS_PER_OBJECTIVE = 5 # How many questions to generate per objective found
+REQUEST_TIMEOUT = 120
+# Requests in flight in --concurrency mode; match the server's OLLAMA_NUM_PARALLEL
+DEFAULT_CONCURRENCY = int(os.getenv('OLLAMA_CONCURRENCY', '1'))
 
-def init_db():
+def init_db(db_path=DB_PATH):
     """Initialize SQLite database."""
-    DB_PATH.parent.mkdir(exist_ok=True)
-    conn = sqlite3.connect(DB_PATH)
+    db_path = Path(db_path)
+    db_path.parent.mkdir(exist_ok=True)
+    conn = sqlite3.connect(db_path)
     c = conn.cursor()
     c.execute('''
         CREATE TABLE IF NOT EXISTS questions (
@@ -34,6 +44,81 @@ def init_db():
     conn.commit()
     return conn
 
+def subject_for(obj):
+    """Infer the subject from the objective's source file."""
+    source = (obj.get('source_file') or '').lower()
+    if 'biol' in source: return 'Biology'
+    elif 'chem' in source: return 'Chemistry'
+    elif 'phys' in source: return 'Physics'
+    elif 'math' in source: return 'Mathematics'
+    elif 'eng' in source: return 'English'
+    elif 'social' in source: return 'Social Studies'
+    elif 'info' in source or 'it' in source: return 'Information Technology'
+    elif 'business' in source or 'pob' in source: return 'Principles of Business'
+    return 'General'
+
+def reuse_linked(cursor, obj, subject, links, needed):
+    """
+    Copy up to `needed` questions already stored for objectives linked to this one in
+    other subjects (objective_links.json), so equivalent content is not generated twice.
+    Returns the number of questions copied.
+    """
+    copied = 0
+    for link in links.linked(obj):
+        if copied >= needed:
+            break
+        # IDs can repeat across syllabuses with a shared prefix (BIO), so match the objective text too
+        cursor.execute('SELECT id, variation, question_json FROM questions WHERE objective_id = ? AND subject_id = ? '
+                       'AND substr(topic, 1, ?) = ? ORDER BY variation LIMIT ?',
+                       (link['id'], subject_for(link), len(link['objective']), link['objective'], needed - copied))
+        for source_id, variation, question_json in cursor.fetchall():
+            cursor.execute('''
+                INSERT OR IGNORE INTO questions (id, subject_id, objective_id, topic, difficulty, variation, question_json)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', (f"{obj['id']}_from_{source_id}", subject, obj['id'], obj.get('objective', ''),
+                  obj.get('difficulty', 1), variation, question_json))
+            copied += cursor.rowcount
+    return copied
+
+def target_variations_for(objs):
+    """Questions per objective so a subject lands near QUESTIONS_PER_SUBJECT."""
+    # If we have 100 objs, we need 4-5 per obj; with 10 objs, 40 per obj (capped at VARIATIONS_PER_OBJECTIVE)
+    return max(1, min(VARIATIONS_PER_OBJECTIVE, QUESTIONS_PER_SUBJECT // max(1, len(objs)) + 1))
+
+def pending_variations(conn, obj, subject, links, target_variations):
+    """
+    (existing, needed, reused) for one objective: stored questions, the variations still
+    to generate and how many were just copied from linked objectives.
+    """
+    cursor = conn.cursor()
+    cursor.execute('SELECT COUNT(*) FROM questions WHERE objective_id = ?', (obj['id'],))
+    existing_count = cursor.fetchone()[0]
+    if existing_count >= target_variations:
+        return existing_count, 0, 0
+    needed = target_variations - existing_count
+    reused = reuse_linked(cursor, obj, subject, links, needed)
+    if reused:
+        conn.commit()
+    return existing_count + reused, needed - reused, reused
+
+def save_question(cursor, obj, subject, variation, json_response):
+    """Validate one Ollama response and insert it; returns the question id, or None with the reason printed."""
+    try:
+        q_data = json.loads(json_response)
+    except json.JSONDecodeError:
+        print("    Failed to parse JSON")
+        return None
+    if not isinstance(q_data, dict) or 'question' not in q_data or 'options' not in q_data:
+        print("    Invalid JSON structure")
+        return None
+    # Objective IDs repeat across syllabuses with a shared prefix (BIO), so the hash keeps IDs apart
+    q_id = f"{obj['id']}_{variation}_{obj.get('hash') or uuid.uuid4().hex[:10]}_{int(time.time())}"
+    cursor.execute('''
+        INSERT INTO questions (id, subject_id, objective_id, topic, difficulty, variation, question_json)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    ''', (q_id, subject, obj['id'], obj.get('objective', ''), obj.get('difficulty', 1), variation, json_response))
+    return q_id
+
 def generate_prompt(objective, subject, variation):
     """Create a prompt for Ollama."""
     difficulty_text = "easy" if objective.get('difficulty', 1) == 1 else "medium" if objective.get('difficulty', 1) == 2 else "hard"
@@ -61,118 +146,179 @@ def generate_prompt(objective, subject, variation):
 def call_ollama(prompt):
     """Call the Ollama API."""
     try:
-        response = requests.post(
-            f"{OLLAMA_HOST}/api/generate",
-            json={
-                "model": MODEL,
-                "prompt": prompt,
-                "stream": False,
-                "format": "json",
-                "temperature": 0.7
-            },
-            timeout=120 
-        )
-        if response.status_code == 200:
-            return response.json().get('response', '')
-        else:
-            print(f"Error calling Ollama: {response.status_code} - {response.text}")
-            return None
-    except Exception as e:
-        print(f"Exception calling Ollama: {e}")
+        return shared_client(OLLAMA_HOST).generate(MODEL, prompt, timeout=REQUEST_TIMEOUT, format="json",
+                                                   temperature=0.7)
+    except OllamaError as e:
+        print(f"Error calling Ollama: {e}")
         return None
 
-def main():
-    if not SYLLABUS_PATH.exists():
-        print(f"Error: Syllabus file not found at {SYLLABUS_PATH}")
-        return
+async def call_ollama_async(client, prompt):
+    """call_ollama over a shared AsyncOllamaClient."""
+    try:
+        return await client.generate(MODEL, prompt, format="json", temperature=0.7)
+    except OllamaError as e:
+        print(f"Error calling Ollama: {e}")
+        return None
 
-    print("Loading syllabus data...")
-    with open(SYLLABUS_PATH, 'r', encoding='utf-8') as f:
-        objectives = json.load(f)
+def load_subjects():
+    """Objectives of the combined syllabus grouped by subject, in file order."""
+    subjects = {}
+    for obj in iter_objectives(SYLLABUS_PATH):
+        subjects.setdefault(subject_for(obj), []).append(obj)
+    return subjects
 
-    conn = init_db()
+def plan_jobs(conn, subjects, links):
+    """
+    Every (objective, subject, variation) still to generate, after linked reuse. Each
+    subject is capped at QUESTIONS_PER_SUBJECT counting planned questions, since in
+    async mode results are not known while planning.
+    """
+    jobs = []
+    seen = set()
+    for subject, objs in subjects.items():
+        target_variations = target_variations_for(objs)
+        planned = 0
+        for obj in objs:
+            if planned >= QUESTIONS_PER_SUBJECT:
+                break
+            # The same objective can appear in two syllabuses that map to one subject
+            key = (subject, obj.get('hash') or (obj['id'], obj.get('objective')))
+            if key in seen:
+                continue
+            seen.add(key)
+            existing_count, needed, reused = pending_variations(conn, obj, subject, links, target_variations)
+            planned += reused
+            if reused:
+                print(f"  Reused {reused} question(s) from linked objectives for {obj['id']}")
+            jobs.extend((obj, subject, existing_count + v) for v in range(needed))
+            planned += needed
+    return jobs
+
+async def _db_writer(conn, queue, counts):
+    """
+    The only task that writes: drains (obj, subject, variation, response) and commits
+    per batch. A failed insert is logged and skipped so the writer keeps draining.
+    """
     cursor = conn.cursor()
+    while True:
+        item = await queue.get()
+        batch = [item]
+        while not queue.empty():
+            batch.append(queue.get_nowait())
+        for entry in batch:
+            if entry is None:
+                continue
+            obj, subject, variation, json_response = entry
+            try:
+                q_id = save_question(cursor, obj, subject, variation, json_response)
+            except sqlite3.Error as e:
+                print(f"    Failed to save {obj['id']} variation {variation}: {e}")
+                continue
+            if q_id:
+                counts[subject] = counts.get(subject, 0) + 1
+                print(f"    Saved question {q_id}")
+        conn.commit()
+        for _ in batch:
+            queue.task_done()
+        if None in batch:
+            return
 
-    # Group objectives by subject
-    subjects = {}
-    for obj in objectives:
-        # Infer subject from ID or source file
-        source = obj.get('source_file', '').lower()
-        if 'biol' in source: subject = 'Biology'
-        elif 'chem' in source: subject = 'Chemistry'
-        elif 'phys' in source: subject = 'Physics'
-        elif 'math' in source: subject = 'Mathematics'
-        elif 'eng' in source: subject = 'English'
-        elif 'social' in source: subject = 'Social Studies'
-        elif 'info' in source or 'it' in source: subject = 'Information Technology'
-        elif 'business' in source or 'pob' in source: subject = 'Principles of Business'
-        else: subject = 'General'
-        
-        if subject not in subjects:
-            subjects[subject] = []
-        subjects[subject].append(obj)
-
-    print(f"Found {len(objectives)} objectives across {len(subjects)} subjects.")
+async def generate_concurrently(conn, jobs, concurrency):
+    """
+    Run jobs with up to `concurrency` requests in flight over one keep-alive pool;
+    responses go through a queue to a single SQLite writer. Returns {subject: saved}.
+    """
+    counts = {}
+    queue = asyncio.Queue()
+    semaphore = asyncio.Semaphore(concurrency)
+    writer = asyncio.create_task(_db_writer(conn, queue, counts))
+
+    async def run(obj, subject, variation):
+        async with semaphore:
+            json_response = await call_ollama_async(client, generate_prompt(obj, subject, variation))
+        if json_response:
+            await queue.put((obj, subject, variation, json_response))
+        else:
+            print(f"    No response from Ollama for {obj['id']} variation {variation}")
+
+    async with AsyncOllamaClient(OLLAMA_HOST, REQUEST_TIMEOUT, pool_size=concurrency) as client:
+        await asyncio.gather(*(run(*job) for job in jobs))
+    await queue.put(None)
+    await writer
+    return counts
 
+def run_concurrent(conn, subjects, links, concurrency):
+    jobs = plan_jobs(conn, subjects, links)
+    print(f"Generating {len(jobs)} questions with {concurrency} request(s) in flight...")
+    started = time.perf_counter()
+    counts = asyncio.run(generate_concurrently(conn, jobs, concurrency))
+    elapsed = time.perf_counter() - started
+    for subject in subjects:
+        print(f"Completed {subject}: Generated {counts.get(subject, 0)} questions.")
+    saved = sum(counts.values())
+    if elapsed > 0:
+        print(f"{saved} questions in {elapsed:.1f}s ({saved * 60 / elapsed:.1f} questions/min)")
+    return counts
+
+def run_sequential(conn, subjects, links):
+    cursor = conn.cursor()
     for subject, objs in subjects.items():
         print(f"\nProcessing {subject} ({len(objs)} objectives found)...")
-        
-        # Shuffle and select a subset if too many, but try to cover all if possible
-        # Loop through objectives
-        
         generated_count = 0
-        
-        # We want roughly QUESTIONS_PER_SUBJECT. 
-        # If we have 100 objs, we need 4-5 per obj.
-        # If we have 10 objs, we need 40 per obj (capped at logic limit).
-        
-        target_variations = max(1, min(VARIATIONS_PER_OBJECTIVE, QUESTIONS_PER_SUBJECT // max(1, len(objs)) + 1))
-        
+        target_variations = target_variations_for(objs)
+
         for obj in objs:
             if generated_count >= QUESTIONS_PER_SUBJECT:
                 break
-                
-            # Check if we already have enough questions for this objective
-            cursor.execute('SELECT COUNT(*) FROM questions WHERE objective_id = ?', (obj['id'],))
-            existing_count = cursor.fetchone()[0]
-            
-            if existing_count >= target_variations:
-                # print(f"  Skipping {obj['id']} - already has {existing_count} questions.")
-                continue
 
-            needed = target_variations - existing_count
+            existing_count, needed, reused = pending_variations(conn, obj, subject, links, target_variations)
+            if reused:
+                generated_count += reused
+                print(f"  Reused {reused} question(s) from linked objectives for {obj['id']}")
+            if not needed:
+                continue
             print(f"  Generating for Objective: {obj['id']} (Found: {existing_count}, Need: {needed})")
-            
+
             for v in range(needed):
-                
                 prompt = generate_prompt(obj, subject, v + existing_count)
                 json_response = call_ollama(prompt)
-                
                 if json_response:
-                    try:
-                        # Validate JSON
-                        q_data = json.loads(json_response)
-                        if 'question' in q_data and 'options' in q_data:
-                            # Save to DB
-                            q_id = f"{obj['id']}_{v}_{int(time.time())}"
-                            cursor.execute('''
-                                INSERT INTO questions (id, subject_id, objective_id, topic, difficulty, variation, question_json)
-                                VALUES (?, ?, ?, ?, ?, ?, ?)
-                            ''', (q_id, subject, obj['id'], obj.get('objective', ''), obj.get('difficulty', 1), v, json_response))
-                            conn.commit()
-                            generated_count += 1
-                            print(f"    Saved question {q_id}")
-                        else:
-                            print("    Invalid JSON structure")
-                    except json.JSONDecodeError:
-                        print("    Failed to parse JSON")
+                    q_id = save_question(cursor, obj, subject, v + existing_count, json_response)
+                    if q_id:
+                        conn.commit()
+                        generated_count += 1
+                        print(f"    Saved question {q_id}")
                 else:
                     print("    No response from Ollama")
-        
+
         print(f"Completed {subject}: Generated {generated_count} questions.")
 
+def main(concurrency=DEFAULT_CONCURRENCY):
+    if not SYLLABUS_PATH.exists():
+        print(f"Error: Syllabus file not found at {SYLLABUS_PATH}")
+        return
+
+    print(f"Loading syllabus data from {SYLLABUS_PATH}...")
+
+    conn = init_db()
+    links = ObjectiveLinks.load(SYLLABUS_PATH.parent)
+    if len(links):
+        print(f"Loaded {len(links)} cross-subject objective links.")
+
+    # Group objectives by subject
+    subjects = load_subjects()
+    print(f"Found {sum(len(objs) for objs in subjects.values())} objectives across {len(subjects)} subjects.")
+
+    if concurrency > 1:
+        run_concurrent(conn, subjects, links, concurrency)
+    else:
+        run_sequential(conn, subjects, links)
+
     conn.close()
     print("\nBatch generation complete!")
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Generate CSEC questions for every syllabus objective with Ollama.")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help="Requests in flight (default: $OLLAMA_CONCURRENCY or 1 = sequential)")
+    main(parser.parse_args().concurrency)
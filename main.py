@@ -2,14 +2,34 @@ import pdfplumber
 import json
 import re
 import os
+import sys
 from pathlib import Path
-from concurrent.futures import ProcessPoolExecutor, as_completed
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
+from functools import reduce
+from contextlib import ExitStack, nullcontext
 from typing import List, Dict, Optional
 from datetime import datetime
 import hashlib
+import math
+import sqlite3
+import shutil
+import time
 from tqdm import tqdm
+from syllabus_io import (iter_objectives, patch_combined, writer_for, JSONArrayWriter, NDJSONWriter,
+                         COMBINED_JSON, COMBINED_NDJSON, COMBINED_STORE)
+from objective_store import write_store
+from syllabus_index import SyllabusIndex, INDEX_DB, subject_from_source
+from objective_dedupe import (corpus_clusters, merge_near_duplicates, NearDuplicateMerger,
+                              DEFAULT_THRESHOLD as NEAR_DUP_THRESHOLD)
+import objective_keywords
+from objective_keywords import CorpusKeywords, DEFAULT_TOP_K as KEYWORD_TOP_K, STOPWORDS
+from objective_links import build_links, LINKS_FILE, DEFAULT_THRESHOLD as LINK_THRESHOLD
+from worker_pool import SupervisedPool, TaskTimeout, WorkerCrashed
 import logging
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
 
 
 # Setup logging
@@ -24,7 +44,13 @@ logging.basicConfig(
 
 @dataclass
 class Objective:
-    """Enhanced data class for storing objective information"""
+    """
+    Enhanced data class for storing objective information. Slotted, with the fields every
+    row of a document repeats (section, subsection, source file, date, skill labels and
+    keywords) interned, so a parent holding whole corpora keeps one copy of each string.
+    """
+    __slots__ = ('id', 'section', 'subsection', 'objective', 'content', 'specific_objectives', 'content_items',
+                 'skills', 'difficulty', 'page_number', 'keywords', 'hash', 'source_file', 'extraction_date')
     id: str
     section: str
     subsection: str
@@ -40,14 +66,797 @@ class Objective:
     source_file: str
     extraction_date: str
 
+    def __post_init__(self):
+        # section/subsection are None on objectives found before a page-range chunk's first header
+        if self.section is not None:
+            self.section = sys.intern(self.section)
+        if self.subsection is not None:
+            self.subsection = sys.intern(self.subsection)
+        self.source_file = sys.intern(self.source_file)
+        self.extraction_date = sys.intern(self.extraction_date)
+        self.skills = [sys.intern(s) for s in self.skills]
+        self.keywords = [sys.intern(k) for k in self.keywords]
+
+    def to_dict(self) -> Dict:
+        """Field-ordered dict like dataclasses.asdict, but sharing the lists instead of deep-copying them."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+# Bump whenever extraction output changes so the manifest re-parses everything
+PARSER_VERSION = "1.3"
+
+# Assumed worker peak for --memory-budget when the manifest has no measurement yet
+DEFAULT_WORKER_RSS_MB = 256
+
+# Seconds one work unit (a PDF, or a page range in page mode) may take before it is
+# stopped and retried in fallback mode; generous next to the slowest real syllabus
+DEFAULT_FILE_TIMEOUT = 600
+# processing_summary.json lists files that took more than this multiple of the median
+SLOW_FILE_FACTOR = 3.0
+
+LINE_TABLE_SETTINGS = {
+    "vertical_strategy": "lines",
+    "horizontal_strategy": "lines",
+    "snap_tolerance": 3,
+    "join_tolerance": 3,
+}
+TEXT_TABLE_SETTINGS = {"vertical_strategy": "text", "horizontal_strategy": "text"}
+# --crop-body: each document's running header/footer bands are learned from a sample of its
+# pages and cropped off before extraction. A line counts as a band when, with digits masked,
+# it recurs within band_fraction of the page edge on min_repeat of the sampled pages, its
+# heights spread over no more than line_tolerance points.
+CROP_SETTINGS = {'band_fraction': 0.12, 'sample_pages': 8, 'min_repeat': 0.5, 'line_tolerance': 12.0,
+                 'margin': 2.0}
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _proc_status_mb(field: str) -> Optional[float]:
+    try:
+        with open('/proc/self/status', 'r') as f:
+            for line in f:
+                if line.startswith(field + ':'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def reset_peak_rss() -> bool:
+    """Reset this process's RSS high-water mark so the next reading covers one file (Linux only)."""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak RSS since the last reset_peak_rss(); falls back to the lifetime peak of the process."""
+    peak = _proc_status_mb('VmHWM')
+    if peak is None and resource is not None:
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        peak = maxrss / (1024 * 1024) if sys.platform == 'darwin' else maxrss / 1024
+    return round(peak, 1) if peak is not None else None
+
+
+def current_rss_mb() -> float:
+    return _proc_status_mb('VmRSS') or peak_rss_mb() or 0.0
+
+
+class RawPageCache:
+    """
+    On-disk cache of raw pdfplumber output (page text + table cells).
+    Layout: <cache_dir>/<pdf stem>/<pdf hash>-<settings hash>/p0001.json, so tuning the
+    post-processing never re-runs pdfplumber, and a changed PDF or changed table
+    settings lands in a new directory while the stale ones are evicted.
+    """
+
+    def __init__(self, cache_dir: Path, settings: Dict):
+        self.cache_dir = Path(cache_dir)
+        encoded = json.dumps(settings, sort_keys=True).encode()
+        self.settings_key = hashlib.sha256(encoded).hexdigest()[:12]
+
+    def document_dir(self, pdf_path: Path, pdf_hash: str) -> Path:
+        return self.cache_dir / pdf_path.stem / f"{pdf_hash[:16]}-{self.settings_key}"
+
+    def evict_stale(self, pdf_path: Path, pdf_hash: str) -> None:
+        """Drop cached pages for older versions of this PDF or other table settings."""
+        current = self.document_dir(pdf_path, pdf_hash)
+        parent = current.parent
+        if not parent.exists():
+            return
+        for entry in parent.iterdir():
+            if entry != current and entry.is_dir():
+                shutil.rmtree(entry, ignore_errors=True)
+
+    def _write(self, path: Path, data: Dict) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+    def _read(self, path: Path) -> Optional[Dict]:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def get_page(self, doc_dir: Path, page_num: int) -> Optional[Dict]:
+        return self._read(doc_dir / f"p{page_num:04d}.json")
+
+    def put_page(self, doc_dir: Path, page_num: int, raw: Dict) -> None:
+        self._write(doc_dir / f"p{page_num:04d}.json", raw)
+
+    def get_meta(self, doc_dir: Path) -> Dict:
+        return self._read(doc_dir / "meta.json") or {}
+
+    def update_meta(self, doc_dir: Path, **fields) -> None:
+        self._write(doc_dir / "meta.json", {**self.get_meta(doc_dir), **fields})
+
+    def get_page_count(self, doc_dir: Path) -> Optional[int]:
+        return self.get_meta(doc_dir).get('page_count')
+
+    def put_page_count(self, doc_dir: Path, page_count: int) -> None:
+        self.update_meta(doc_dir, page_count=page_count)
+
+
+class _TimedStage:
+    __slots__ = ('samples', 'started')
+
+    def __init__(self, samples: List[float]):
+        self.samples = samples
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+
+    def __exit__(self, *exc):
+        self.samples.append(time.perf_counter() - self.started)
+
+
+class StageTimer:
+    """
+    Optional per-stage wall-clock samples for one document. When disabled, stage()
+    hands back a shared no-op context, so instrumented code costs almost nothing.
+    """
+
+    _NULL_STAGE = nullcontext()
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.samples: Dict[str, List[float]] = {}
+
+    def stage(self, name: str):
+        if not self.enabled:
+            return self._NULL_STAGE
+        return _TimedStage(self.samples.setdefault(name, []))
+
+    def add(self, name: str, seconds: float) -> None:
+        if self.enabled:
+            self.samples.setdefault(name, []).append(seconds)
+
+
+def merge_stage_samples(total: Dict[str, List[float]], samples: Optional[Dict[str, List[float]]]) -> Dict:
+    for name, values in (samples or {}).items():
+        total.setdefault(name, []).extend(values)
+    return total
+
+
+def summarize_stage_samples(samples: Dict[str, List[float]]) -> Dict:
+    """Nearest-rank percentiles (ms) and totals (s) per stage."""
+    summary = {}
+    for name, values in sorted(samples.items()):
+        if not values:
+            continue
+        ordered = sorted(values)
+        pick = lambda q: ordered[min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))]
+        summary[name] = {
+            'count': len(ordered),
+            'total_seconds': round(sum(ordered), 4),
+            'p50_ms': round(pick(0.50) * 1000, 3),
+            'p90_ms': round(pick(0.90) * 1000, 3),
+            'p99_ms': round(pick(0.99) * 1000, 3),
+            'max_ms': round(ordered[-1] * 1000, 3),
+        }
+    return summary
+
+
+def new_strategy_stats() -> Dict:
+    return {
+        'lines': {'attempts': 0, 'hits': 0, 'seconds': 0.0, 'miss_seconds': 0.0},
+        'text': {'attempts': 0, 'hits': 0, 'seconds': 0.0, 'miss_seconds': 0.0},
+        'pages': 0,
+        'lines_passes_skipped': 0,
+    }
+
+
+def merge_strategy_stats(total: Dict, stats: Optional[Dict]) -> Dict:
+    if not stats:
+        return total
+    for name in ('lines', 'text'):
+        for key, value in stats[name].items():
+            total[name][key] += value
+    total['pages'] += stats['pages']
+    total['lines_passes_skipped'] += stats['lines_passes_skipped']
+    return total
+
+
+def summarize_strategy_stats(stats: Dict) -> Dict:
+    """Hit rates per strategy plus an estimate of the time saved by skipped 'lines' passes."""
+    summary = {'pages': stats['pages'], 'lines_passes_skipped': stats['lines_passes_skipped']}
+    for name in ('lines', 'text'):
+        s = stats[name]
+        summary[name] = {
+            'attempts': s['attempts'],
+            'hits': s['hits'],
+            'hit_rate': round(s['hits'] / s['attempts'], 3) if s['attempts'] else None,
+            'seconds': round(s['seconds'], 3),
+        }
+    lines_misses = stats['lines']['attempts'] - stats['lines']['hits']
+    # A skipped pass is priced at what a failing 'lines' pass cost on this corpus
+    summary['estimated_seconds_saved'] = (
+        round(stats['lines_passes_skipped'] * stats['lines']['miss_seconds'] / lines_misses, 3)
+        if lines_misses else None
+    )
+    return summary
+
+
+class TableStrategySelector:
+    """
+    Picks the pdfplumber table strategy for a page up front from its ruling objects.
+    Pages without any lines/rects/curves cannot yield 'lines' tables, so they go straight
+    to 'text'; every other page tries 'lines' first as before, so the tables found are
+    the same as always trying 'lines'. Without text_tables (the fallback for documents
+    that ran out of time) only 'lines' is ever tried.
+    """
+
+    STRATEGIES = {'lines': LINE_TABLE_SETTINGS, 'text': TEXT_TABLE_SETTINGS}
+
+    def __init__(self, timer: Optional[StageTimer] = None, text_tables: bool = True):
+        self.timer = timer or StageTimer()
+        self.text_tables = text_tables
+        self.stats = new_strategy_stats()
+
+    def choose(self, page) -> List[str]:
+        ruling = len(page.lines) + len(page.rects) + len(page.curves)
+        if not self.text_tables:
+            return ['lines'] if ruling else []
+        return ['lines', 'text'] if ruling else ['text']
+
+    def extract_tables(self, page) -> tuple:
+        order = self.choose(page)
+        self.stats['pages'] += 1
+        if 'lines' not in order:
+            self.stats['lines_passes_skipped'] += 1
+        for name in order:
+            started = time.perf_counter()
+            tables = page.extract_tables(self.STRATEGIES[name])
+            elapsed = time.perf_counter() - started
+            self.timer.add(f"tables_{name}", elapsed)
+            stats = self.stats[name]
+            stats['attempts'] += 1
+            stats['seconds'] += elapsed
+            if tables:
+                stats['hits'] += 1
+                return tables, name
+            stats['miss_seconds'] += elapsed
+        return [], None
+
+
+class BodyRegion:
+    """
+    Per-document body box for --crop-body. Pages are grouped by size (portrait and
+    landscape pages, and appended specimen papers, carry their bands at different
+    heights), a few pages of each size are sampled, and the lines near the top and
+    bottom edge that recur at about the same height are taken as header/footer. cuts
+    maps "WxH" to [header depth, footer depth] in points from the page edges; sizes
+    without a recurring band are not cropped. The crop is for accuracy (footer text
+    stays out of text-strategy table columns), not speed: the layout parse it follows
+    dominates, and learning the bands adds a little per document.
+    """
+
+    def __init__(self, settings: Dict = CROP_SETTINGS, cuts: Optional[Dict[str, list]] = None):
+        self.settings = settings
+        self.cuts = cuts or {}
+
+    @staticmethod
+    def size_key(page) -> str:
+        return f"{page.width:.1f}x{page.height:.1f}"
+
+    def _band_lines(self, page) -> Dict[tuple, tuple]:
+        """{(zone, masked text): (top, bottom)} for the lines inside the edge bands of a page."""
+        x0, top0, x1, bottom0 = page.bbox
+        band = page.height * self.settings['band_fraction']
+        rows = {}
+        for char in page.chars:
+            top, bottom = char['top'] - top0, char['bottom'] - top0
+            zone = 'header' if bottom <= band else 'footer' if top >= page.height - band else None
+            if zone:
+                # 2pt buckets absorb baseline jitter within one printed line
+                rows.setdefault((zone, int(top // 2)), []).append(char)
+        lines = {}
+        for (zone, _), chars in rows.items():
+            text = re.sub(r'\d+', '#', ''.join(c['text'] for c in sorted(chars, key=lambda c: c['x0'])))
+            text = re.sub(r'\s+', '', text)
+            if text:
+                top = min(c['top'] for c in chars) - top0
+                bottom = max(c['bottom'] for c in chars) - top0
+                lines[(zone, text)] = (top, bottom)
+        return lines
+
+    @classmethod
+    def learn(cls, pdf, settings: Dict = CROP_SETTINGS) -> 'BodyRegion':
+        region = cls(settings)
+        groups = {}
+        for index, page in enumerate(pdf.pages):
+            groups.setdefault(cls.size_key(page), []).append(index)
+        margin = settings['margin']
+        for size, indexes in groups.items():
+            if len(indexes) < 2:
+                continue
+            step = max(1, len(indexes) // settings['sample_pages'])
+            sample = indexes[::step][:settings['sample_pages']]
+            seen = {}
+            height = None
+            for index in sample:
+                # Left open: the layout parsed here is reused when the page itself is
+                # extracted (and released by RawPageSource.raw_page's close)
+                page = pdf.pages[index]
+                height = page.height
+                for key, extent in region._band_lines(page).items():
+                    seen.setdefault(key, []).append(extent)
+            needed = max(2, math.ceil(settings['min_repeat'] * len(sample)))
+            header, footer = 0.0, 0.0
+            for (zone, _), extents in seen.items():
+                tops = [top for top, _ in extents]
+                if len(extents) < needed or max(tops) - min(tops) > settings['line_tolerance']:
+                    continue
+                if zone == 'header':
+                    header = max(header, max(bottom for _, bottom in extents) + margin)
+                else:
+                    footer = max(footer, height - min(tops) + margin)
+            if header or footer:
+                region.cuts[size] = [round(header, 2), round(footer, 2)]
+        return region
+
+    def bbox(self, page) -> Optional[tuple]:
+        cut = self.cuts.get(self.size_key(page))
+        if not cut:
+            return None
+        x0, top, x1, bottom = page.bbox
+        return (x0, top + cut[0], x1, bottom - cut[1])
+
+    def crop(self, page) -> tuple:
+        """
+        (page view without the bands, body bbox). Characters outside the body and graphics
+        lying wholly inside a band are dropped; rulings that cross into a band are kept
+        whole, so table edges survive. A filter rather than page.crop, which clips every
+        object on the page and costs more than the smaller page saves.
+        """
+        bbox = self.bbox(page)
+        if bbox is None:
+            return page, None
+        _, top, _, bottom = bbox
+
+        def in_body(obj) -> bool:
+            if obj.get('object_type') == 'char':
+                return obj['top'] >= top and obj['bottom'] <= bottom
+            return obj.get('bottom', bottom) > top and obj.get('top', top) < bottom
+
+        return page.filter(in_body), bbox
+
+
+class RowPostProcessor:
+    """
+    Turns a page's table rows into objective fields in one pass per row. Only the two
+    cells an objective is built from are cleaned, rows too short to be objectives are
+    rejected before any cleaning (cleaning never lengthens a cell), and the row is
+    tokenized once for both skill labels and keywords. Rows that are not plain ASCII or
+    carry parenthesized text, where that shortcut could tokenize differently, go through
+    the parser's own helpers. Output matches the per-row helpers exactly
+    (scripts/bench_row_postprocess.py and tests/test_row_postprocess.py check this).
+    """
+
+    CONTACT = ("ADDRESS", "E-MAIL", "TEL:", "FAX:", "WWW.", "HTTP")
+    MIN_OBJECTIVE_CHARS = 20
+    _TOKEN = re.compile(r'\w+')
+    _WHITESPACE_ONLY_NUMBER = re.compile(r'^\d+\.?\s*$')
+    _ITEM_SPLIT = re.compile(r'[;•]|\band\b')
+    _FOOTER = re.compile(r'CXC\s+\d+/G/SYLL\s+\d+|Page\s+\d+')
+
+    def __init__(self, parser: 'EnhancedCXCSyllabusParser'):
+        self.parser = parser
+        self.noise = parser.patterns['noise']
+        self.objective_number = parser.patterns['objective_number']
+        self.bullet_point = parser.patterns['bullet_point']
+        self.skill_codes = frozenset(code.upper() for code in
+                                     re.findall(r'[A-Z]+', parser.patterns['skills'].pattern))
+
+    def clean(self, text: str) -> str:
+        """clean_text: str.split() collapses the same whitespace as re's \\s, and the footer pass is skipped when it cannot match."""
+        if not text: return ""
+        text = ' '.join(text.split())
+        if 'CXC' in text or 'Page' in text:
+            text = self._FOOTER.sub('', text)
+        return text.strip()
+
+    def split_items(self, text: str) -> List[str]:
+        if not text: return []
+        items = []
+        for item in self._ITEM_SPLIT.split(text):
+            it = self.clean(item)
+            if len(it) > 4 and not self.noise.match(it):
+                it = self.objective_number.sub('', it)
+                it = self.bullet_point.sub('', it)
+                items.append(it.strip())
+        return items
+
+    def process(self, tables: List) -> List[tuple]:
+        """(objective, content, specific_objectives, content_items, skills, difficulty, keywords, hash) per kept row."""
+        parser = self.parser
+        clean = self.clean
+        split_items = self.split_items
+        noise_match = self.noise.match
+        min_chars = self.MIN_OBJECTIVE_CHARS
+        rows = []
+        for table in tables:
+            if not table: continue
+            for row in table:
+                present = [c for c in row if c]
+                if len(present) < 2: continue
+                # Cleaning only shortens a cell, so a short raw cell can never become an objective
+                if len(str(present[0])) < min_chars: continue
+                row_str = " ".join([str(c) for c in present])
+                if noise_match(row_str): continue
+                row_upper = row_str.upper()
+                if "SPECIFIC OBJECTIVE" in row_upper or "CONTENT" in row_upper: continue
+
+                obj_text = clean(present[0])
+                if len(obj_text) < min_chars: continue
+                if self._WHITESPACE_ONLY_NUMBER.match(obj_text): continue
+                obj_upper = obj_text.upper()
+                if any(kw in obj_upper for kw in self.CONTACT): continue
+                cont_text = clean(present[1])
+                combined = f"{obj_text} {cont_text}"
+
+                if combined.isascii() and '(' not in combined:
+                    tokens = self._TOKEN.findall(combined)
+                    skills = sorted({t.upper() for t in tokens if len(t) == 2 and t.upper() in self.skill_codes})
+                    keywords = sorted({w for w in (t.lower() for t in tokens if len(t) >= 3 and t.isalpha())
+                                       if w not in STOPWORDS})[:12]
+                    difficulty = self.difficulty(combined.lower()[:len(obj_text)])
+                else:
+                    skills = parser.extract_skills(combined)
+                    keywords = parser.extract_keywords(combined)
+                    difficulty = parser.estimate_difficulty(obj_text)
+                rows.append((obj_text, cont_text, split_items(obj_text), split_items(cont_text), skills,
+                             difficulty, keywords, hashlib.md5(combined.encode()).hexdigest()[:10]))
+        return rows
+
+    @staticmethod
+    def difficulty(text_lower: str) -> int:
+        for lvl, verbs in EnhancedCXCSyllabusParser.DIFFICULTY_VERBS.items():
+            if any(verb in text_lower for verb in verbs): return lvl
+        return 1
+
+
+class RawPageSource:
+    """
+    Serves raw pages from the cache, opening the PDF only on the first miss. In fallback
+    mode pages missing from the cache are extracted without text-strategy tables and
+    are not cached, so the degraded pages never stand in for a full extraction later.
+    """
+
+    def __init__(self, parser: 'EnhancedCXCSyllabusParser', pdf_path: Path, doc_dir: Optional[Path],
+                 fallback: bool = False):
+        self.parser = parser
+        self.pdf_path = pdf_path
+        self.doc_dir = doc_dir
+        self.cache = parser.raw_cache
+        self.fallback = fallback
+        self.timer = StageTimer(parser.profile)
+        self.selector = TableStrategySelector(self.timer, text_tables=not fallback)
+        self._pdf = None
+        self._body_region = None
+        # One timestamp per document (or page-range chunk) rather than one per row
+        self.extraction_date = datetime.now().isoformat()
+
+    def _open(self):
+        if self._pdf is None:
+            self._pdf = pdfplumber.open(self.pdf_path)
+        return self._pdf
+
+    @property
+    def page_count(self) -> int:
+        count = self.cache.get_page_count(self.doc_dir) if self.doc_dir else None
+        if count is None:
+            count = len(self._open().pages)
+            if self.doc_dir:
+                self.cache.put_page_count(self.doc_dir, count)
+        return count
+
+    @property
+    def body_region(self) -> BodyRegion:
+        """Learned once per document and kept in the cache's meta.json next to the pages it cropped."""
+        if self._body_region is None:
+            cuts = self.cache.get_meta(self.doc_dir).get('body_cuts') if self.doc_dir else None
+            if cuts is not None:
+                self._body_region = BodyRegion(self.parser.crop_settings, cuts)
+            else:
+                with self.timer.stage('learn_body'):
+                    self._body_region = BodyRegion.learn(self._open(), self.parser.crop_settings)
+                if self.doc_dir:
+                    self.cache.update_meta(self.doc_dir, body_cuts=self._body_region.cuts)
+        return self._body_region
+
+    def raw_page(self, page_num: int) -> Dict:
+        raw = None
+        if self.doc_dir:
+            with self.timer.stage('cache_read'):
+                raw = self.cache.get_page(self.doc_dir, page_num)
+        if raw is None:
+            page = self._open().pages[page_num - 1]
+            try:
+                if self.parser.crop_settings:
+                    body, bbox = self.body_region.crop(page)
+                    raw = self.parser.extract_raw_page(body, self.selector)
+                    raw['crop'] = list(bbox) if bbox else None
+                else:
+                    raw = self.parser.extract_raw_page(page, self.selector)
+            finally:
+                # pdfplumber keeps every page's layout objects alive until the page is closed
+                page.close()
+            if self.doc_dir and not self.fallback:
+                with self.timer.stage('cache_write'):
+                    self.cache.put_page(self.doc_dir, page_num, raw)
+        return raw
+
+    def parse_page(self, page_num: int, current_section: Optional[str], current_subsection: Optional[str]) -> tuple:
+        """Raw extraction plus post-processing for one page, timed as the 'page' stage."""
+        with self.timer.stage('page'):
+            return self.parser.objectives_from_raw(self.raw_page(page_num), page_num, current_section,
+                                                   current_subsection, self.pdf_path.name, self.timer,
+                                                   self.extraction_date)
+
+    def close(self) -> None:
+        if self._pdf is not None:
+            self._pdf.close()
+            self._pdf = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ParseManifest:
+    """
+    Content-hash manifest of parsed PDFs (<output>/manifest.json). Entries are keyed by
+    PDF sha256, so a syllabus copied between syllabuses/ and scripts/Syllabuses/ is
+    recognised as already parsed, and a skip only needs a stat of the recorded output.
+    Output-affecting settings are stored per entry; changing them forces a re-parse.
+    """
+
+    def __init__(self, path: Path, settings: Optional[Dict] = None):
+        self.path = Path(path)
+        self.settings = settings or {}
+        self.documents = {}
+        if self.path.exists():
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self.documents = json.load(f).get('documents', {})
+            except (OSError, ValueError):
+                self.documents = {}
+
+    def lookup(self, pdf_hash: str) -> Optional[Dict]:
+        """Return the entry if it was produced by this parser version and its output is intact."""
+        entry = self.documents.get(pdf_hash)
+        if not entry or entry.get('parser_version') != PARSER_VERSION or entry.get('settings', {}) != self.settings:
+            return None
+        output_file = self.path.parent / entry['output_file']
+        try:
+            if output_file.stat().st_size != entry.get('output_size'):
+                return None
+        except OSError:
+            return None
+        return entry
+
+    def record(self, pdf_hash: str, result: Dict) -> None:
+        output_file = Path(result['output_file'])
+        # A re-parsed PDF overwrites the same output, so older hashes pointing there are stale
+        for stale in [h for h, e in self.documents.items() if e.get('output_file') == output_file.name and h != pdf_hash]:
+            del self.documents[stale]
+        sources = set(self.documents.get(pdf_hash, {}).get('sources', []))
+        sources.add(result['source'])
+        self.documents[pdf_hash] = {
+            'filename': result['filename'],
+            'sources': sorted(sources),
+            'parser_version': PARSER_VERSION,
+            'settings': self.settings,
+            'count': result['count'],
+            'pages': result.get('pages', 0),
+            'output_file': output_file.name,
+            'output_hash': result['output_hash'],
+            'output_size': output_file.stat().st_size,
+            'near_duplicates': result.get('near_duplicates', []),
+            'peak_rss_mb': result.get('peak_rss_mb'),
+            'fallback': bool(result.get('fallback')),
+            'updated': datetime.now().isoformat()
+        }
+
+    def refresh_output(self, output_file: Path) -> None:
+        """Re-stat an output rewritten after parsing (re-ranked keywords) so its entries stay current."""
+        for entry in self.documents.values():
+            if entry.get('output_file') == output_file.name:
+                entry['output_size'] = output_file.stat().st_size
+                entry['output_hash'] = file_sha256(output_file)
+
+    def add_source(self, pdf_hash: str, pdf_path: Path) -> None:
+        entry = self.documents.get(pdf_hash)
+        if entry and str(pdf_path) not in entry['sources']:
+            entry['sources'] = sorted(entry['sources'] + [str(pdf_path)])
+
+    def save(self) -> None:
+        tmp = self.path.with_suffix(".json.tmp")
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'parser_version': PARSER_VERSION, 'documents': self.documents}, f, indent=2, sort_keys=True)
+        os.replace(tmp, self.path)
+
+
+class ObjectiveIdTable:
+    """
+    Persisted hash -> ID allocation for one source PDF (<output>/objective_ids/<stem>.json).
+    An objective keeps the ID it was first given; only hashes never seen before mint a
+    new one, numbered after the highest ID ever issued, so a new row on page 3 no longer
+    renumbers everything after it. An objective whose content column changed but whose
+    objective text did not inherits the ID of the row it replaced.
+    """
+
+    def __init__(self, path: Path, prefix: str, seed_file: Optional[Path] = None):
+        self.path = Path(path)
+        self.prefix = prefix
+        self.ids = {}
+        self.texts = {}
+        self.next = 1
+        self._retired = {}
+        if self.path.exists():
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                self.prefix = data.get('prefix', prefix)
+                self.ids = data.get('ids', {})
+                self.texts = data.get('texts', {})
+                self.next = data.get('next', 1)
+            except (OSError, ValueError):
+                self.ids, self.texts, self.next = {}, {}, 1
+        elif seed_file is not None and seed_file.exists():
+            self._seed(seed_file)
+
+    @staticmethod
+    def text_key(text: str) -> str:
+        return hashlib.md5(re.sub(r'\s+', ' ', text).strip().lower().encode()).hexdigest()[:10]
+
+    def _seed(self, output_file: Path) -> None:
+        """Adopt the IDs of an existing parser output; hand-made outputs without hashes are ignored."""
+        try:
+            objectives = list(iter_objectives(output_file))
+        except (OSError, ValueError):
+            return
+        for obj in objectives:
+            if not isinstance(obj, dict) or not obj.get('hash') or not obj.get('id'):
+                continue
+            self.ids[obj['hash']] = obj['id']
+            self.texts[obj['hash']] = self.text_key(obj.get('objective', ''))
+            match = re.search(r'(\d+)$', obj['id'])
+            if match:
+                self.next = max(self.next, int(match.group(1)) + 1)
+
+    def begin(self, live_hashes: set) -> None:
+        """Start an allocation pass over the objectives that will be written this time."""
+        # Retired rows whose objective text is unambiguous can hand their ID to an edited row
+        self._retired = {}
+        for h in self.ids:
+            if h not in live_hashes and h in self.texts:
+                key = self.texts[h]
+                self._retired[key] = None if key in self._retired else h
+
+    def id_for(self, obj: Objective) -> str:
+        oid = self.ids.get(obj.hash)
+        if oid is None:
+            key = self.text_key(obj.objective)
+            old_hash = self._retired.pop(key, None)
+            if old_hash:
+                oid = self.ids.pop(old_hash)
+                self.texts.pop(old_hash, None)
+            else:
+                oid = f"{self.prefix}-{self.next:05d}"
+                self.next += 1
+            self.ids[obj.hash] = oid
+            self.texts[obj.hash] = key
+        return oid
+
+    def assign(self, objectives: List[Objective]) -> None:
+        self.begin({obj.hash for obj in objectives})
+        for obj in objectives:
+            obj.id = self.id_for(obj)
+
+    def save(self) -> None:
+        self.path.parent.mkdir(exist_ok=True, parents=True)
+        tmp = self.path.with_suffix(".json.tmp")
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'prefix': self.prefix, 'next': self.next, 'ids': self.ids, 'texts': self.texts},
+                      f, indent=2, sort_keys=True)
+        os.replace(tmp, self.path)
+
+
 class EnhancedCXCSyllabusParser:
     """Overhauled parser with advanced extraction and noise filtering"""
+
+    # Highest level first: an objective takes the level of the first list with a verb in it
+    DIFFICULTY_VERBS = {
+        3: ['analyse', 'evaluate', 'synthesize', 'justify', 'critique', 'design', 'create'],
+        2: ['explain', 'describe', 'discuss', 'apply', 'demonstrate', 'calculate', 'interpret'],
+        1: ['list', 'state', 'define', 'label', 'identify', 'recall']
+    }
     
-    def __init__(self, output_dir: str = "output", num_workers: Optional[int] = None):
+    def __init__(self, output_dir: str = "output", num_workers: Optional[int] = None,
+                 cache_dir: Optional[str] = None, use_cache: bool = True,
+                 profile: bool = False,
+                 near_dup_threshold: float = NEAR_DUP_THRESHOLD, low_memory: bool = False,
+                 memory_budget_mb: Optional[float] = None, build_index: bool = True, emit_store: bool = True,
+                 crop_body: bool = False, tfidf_keywords: bool = True,
+                 keyword_top_k: int = KEYWORD_TOP_K, link_threshold: float = LINK_THRESHOLD,
+                 file_timeout: Optional[float] = DEFAULT_FILE_TIMEOUT, recycle_after: int = 0,
+                 recycle_rss_mb: Optional[float] = None):
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True, parents=True)
         self.num_workers = num_workers or os.cpu_count()
         self.logger = logging.getLogger(__name__)
+        self.use_cache = use_cache
+        # Per-page/per-stage timings; off by default and close to free when off
+        self.profile = profile
+        self._null_timer = StageTimer()
+        # Crop learned header/footer bands off each page before extraction (None = full pages).
+        # Only added to the cache/manifest keys when on, so existing caches stay valid.
+        self.crop_settings = dict(CROP_SETTINGS) if crop_body else None
+        raw_settings = {'lines': LINE_TABLE_SETTINGS, 'text': TEXT_TABLE_SETTINGS}
+        settings = {'near_dup_threshold': near_dup_threshold}
+        if self.crop_settings:
+            raw_settings['crop_body'] = settings['crop_body'] = self.crop_settings
+        self.raw_cache = RawPageCache(
+            Path(cache_dir) if cache_dir else self.output_dir / ".cache" / "raw", raw_settings
+        )
+        # Shingle Jaccard at which rows of one file are merged (0 disables merging and the report)
+        self.near_dup_threshold = near_dup_threshold
+        self.manifest = ParseManifest(self.output_dir / "manifest.json", settings)
+        # Spill objectives to <output>/.spill while parsing instead of holding a whole document
+        self.low_memory = low_memory
+        # Total RSS the pool may use; the worker count is derived from recorded per-file peaks
+        self.memory_budget_mb = memory_budget_mb
+        # SQLite/FTS5 index over the combined output (<output>/syllabus_index.db)
+        self.build_index = build_index
+        # Memory-mappable copy of the combined output (<output>/combined_syllabuses.objs)
+        self.emit_store = emit_store
+        # Re-rank the combined output's keywords by corpus TF-IDF; the model is kept for watch mode
+        self.tfidf_keywords = tfidf_keywords
+        self.keyword_top_k = keyword_top_k
+        self.keyword_model = None
+        # TF-IDF cosine at which objectives of different subjects are linked (0 disables objective_links.json)
+        self.link_threshold = link_threshold
+        # Worker supervision (see worker_pool): per-unit deadline (0/None = none), and a fresh
+        # pool after recycle_after files per worker or once a worker holds recycle_rss_mb
+        self.file_timeout = file_timeout or None
+        self.recycle_after = recycle_after
+        self.recycle_rss_mb = recycle_rss_mb
 
         
         # Priority patterns
@@ -59,13 +868,20 @@ class EnhancedCXCSyllabusParser:
             'bullet_point': re.compile(r'^[\-\•\*]\s+'),
             'noise': re.compile(r'^(TOTAL|SUMMARY|PAGE|TABLE|SECTION|SPECIFIC OBJECTIVES|CONTENT|SKILLS|ADDRESS|EMAIL|FAX|TELEPHONE|WEBSITE|REVISED|AMENDED|CORRIGENDA|APPENDIX)\s*$', re.IGNORECASE)
         }
+        self.row_processor = RowPostProcessor(self)
+
+    def __getstate__(self):
+        # Bound methods sent to the pool pickle the parser with every task; workers never
+        # rank keywords, so the corpus TF-IDF model stays in the parent
+        state = self.__dict__.copy()
+        state['keyword_model'] = None
+        return state
         
     def extract_keywords(self, text: str) -> List[str]:
         """Extract higher-quality keywords"""
-        stopwords = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'their', 'from', 'this', 'that'}
         text = re.sub(r'\(.*?\)', '', text) # Remove marks/skill labels in parens
         words = re.findall(r'\b[a-zA-Z]{3,}\b', text.lower())
-        return sorted(list(set([w for w in words if w not in stopwords])))[:12]
+        return sorted(list(set([w for w in words if w not in STOPWORDS])))[:12]
     
     def extract_skills(self, text: str) -> List[str]:
         """Extract skill labels (Knowledge, Application, etc)"""
@@ -95,12 +911,22 @@ class EnhancedCXCSyllabusParser:
                 cleaned.append(it.strip())
         return cleaned
 
+    def extract_raw_page(self, page, selector: Optional[TableStrategySelector] = None) -> Dict:
+        """Run the expensive pdfplumber passes for one page: page text and table cells."""
+        selector = selector or TableStrategySelector()
+        with selector.timer.stage('extract_text'):
+            text = page.extract_text() or ""
+        
+        # Enhanced Table Extraction: ruled tables, or text-based columns (CSEC uses both)
+        tables, strategy = selector.extract_tables(page)
+        return {'text': text, 'tables': tables, 'strategy': strategy}
+
     def extract_from_page(self, page, page_num: int, current_section: str, 
                          current_subsection: str, source_file: str) -> tuple:
-        objectives = []
-        text = page.extract_text() or ""
-        
-        # Update section/subsection from page text
+        return self.objectives_from_raw(self.extract_raw_page(page), page_num, current_section,
+                                        current_subsection, source_file)
+
+    def _update_context(self, text: str, current_section: str, current_subsection: str) -> tuple:
         section_matches = self.patterns['section'].findall(text)
         if section_matches:
             # Take the last one found on page as the current context
@@ -110,151 +936,478 @@ class EnhancedCXCSyllabusParser:
         subsection_matches = self.patterns['subsection'].findall(text)
         if subsection_matches:
             current_subsection = subsection_matches[-1].strip()
+        return current_section, current_subsection
+
+    def objectives_from_raw(self, raw: Dict, page_num: int, current_section: str,
+                            current_subsection: str, source_file: str,
+                            timer: Optional[StageTimer] = None, extraction_date: Optional[str] = None) -> tuple:
+        timer = timer or self._null_timer
+        extraction_date = extraction_date or datetime.now().isoformat()
+        objectives = []
+        text = raw['text']
+        tables = raw['tables']
         
-        # Enhanced Table Extraction
-        table_settings = {
-            "vertical_strategy": "lines",
-            "horizontal_strategy": "lines",
-            "snap_tolerance": 3,
-            "join_tolerance": 3,
-        }
-        
-        tables = page.extract_tables(table_settings)
-        if not tables:
-            # Try without strict lines if no tables found (CSEC sometimes uses text-based columns)
-            tables = page.extract_tables({"vertical_strategy": "text", "horizontal_strategy": "text"})
+        # Update section/subsection from page text
+        with timer.stage('headers'):
+            current_section, current_subsection = self._update_context(text, current_section, current_subsection)
 
-        for table in tables:
-            if not table or len(table) < 1: continue
-            
-            for row in table:
-                # Filter out obvious header/footer rows
-                row_str = " ".join([str(c) for c in row if c])
-                if self.patterns['noise'].match(row_str) or not row_str: continue
-                if "SPECIFIC OBJECTIVE" in row_str.upper() or "CONTENT" in row_str.upper(): continue
-
-                # Determine if this row has usable data (usually Objective in col 0, Content in col 1 or 2)
-                # We'll look for the first non-empty cell as objective
-                cells = [self.clean_text(c) for c in row if c]
-                if len(cells) < 2: continue
-                
-                obj_text = cells[0]
-                cont_text = cells[1] if len(cells) > 1 else ""
-                
-                if len(obj_text) < 20: continue # Likely a partial or noise, objectives are usually longer
-                
-                # Filter out numbers/noise at start
-                if re.match(r'^\d+\.?\s*$', obj_text): continue
-                
-                # Check for contact info / metadata noise
-                if any(kw in obj_text.upper() for kw in ["ADDRESS", "E-MAIL", "TEL:", "FAX:", "WWW.", "HTTP"]): continue
-                
-                skills = self.extract_skills(obj_text + " " + cont_text)
-                specific_objs = self.split_into_items(obj_text)
-                content_items = self.split_into_items(cont_text)
-                
-                combined_text = f"{obj_text} {cont_text}"
-                obj = Objective(
-                    id="", # Temp ID
-                    section=current_section,
-                    subsection=current_subsection,
-                    objective=obj_text,
-                    content=cont_text,
-                    specific_objectives=specific_objs,
-                    content_items=content_items,
-                    skills=skills,
-                    difficulty=self.estimate_difficulty(obj_text),
-                    page_number=page_num,
-                    keywords=self.extract_keywords(combined_text),
-                    hash=self.generate_hash(combined_text),
-                    source_file=source_file,
-                    extraction_date=datetime.now().isoformat()
-                )
-                objectives.append(obj)
+        # Noise filtering, cleaning, items, skills, difficulty, keywords and hash for every row
+        with timer.stage('rows'):
+            rows = self.row_processor.process(tables)
+        for obj_text, cont_text, specific_objs, content_items, skills, difficulty, keywords, obj_hash in rows:
+            obj = Objective(
+                id="", # Temp ID
+                section=current_section,
+                subsection=current_subsection,
+                objective=obj_text,
+                content=cont_text,
+                specific_objectives=specific_objs,
+                content_items=content_items,
+                skills=skills,
+                difficulty=difficulty,
+                page_number=page_num,
+                keywords=keywords,
+                hash=obj_hash,
+                source_file=source_file,
+                extraction_date=extraction_date
+            )
+            objectives.append(obj)
         
         return objectives, current_section, current_subsection
     
     def estimate_difficulty(self, text: str) -> int:
-        levels = {
-            3: ['analyse', 'evaluate', 'synthesize', 'justify', 'critique', 'design', 'create'],
-            2: ['explain', 'describe', 'discuss', 'apply', 'demonstrate', 'calculate', 'interpret'],
-            1: ['list', 'state', 'define', 'label', 'identify', 'recall']
-        }
         text_lower = text.lower()
-        for lvl, keywords in levels.items():
+        for lvl, keywords in self.DIFFICULTY_VERBS.items():
             if any(kw in text_lower for kw in keywords): return lvl
         return 1
     
-    def parse_single_pdf(self, pdf_path: Path, force: bool = False) -> Dict:
+    def _manifest_skip(self, pdf_path: Path, pdf_hash: str) -> Optional[Dict]:
+        """Return a skip result if the manifest already has output for this exact PDF content."""
+        entry = self.manifest.lookup(pdf_hash)
+        if not entry:
+            return None
+        if entry.get('fallback'):
+            self.logger.info(f"Skipping (Up to date, fallback output; --force re-attempts): {pdf_path.name}")
+        else:
+            self.logger.info(f"Skipping (Up to date): {pdf_path.name}")
+        return {'filename': pdf_path.name, 'source': str(pdf_path), 'output_file': str(self.output_dir / entry['output_file']),
+                'count': entry['count'], 'hash': pdf_hash, 'success': True, 'skipped': True, 'pages': 0,
+                'near_duplicates': entry.get('near_duplicates', [])}
+
+    def raw_document_dir(self, pdf_path: Path, pdf_hash: Optional[str] = None) -> Optional[Path]:
+        """Cache directory for this PDF's raw pages (None when caching is off)."""
+        if not self.use_cache:
+            return None
+        pdf_hash = pdf_hash or file_sha256(pdf_path)
+        self.raw_cache.evict_stale(pdf_path, pdf_hash)
+        return self.raw_cache.document_dir(pdf_path, pdf_hash)
+
+    def count_pages(self, pdf_path: Path, doc_dir: Optional[Path] = None) -> int:
+        with RawPageSource(self, pdf_path, doc_dir) as source:
+            return source.page_count
+
+    def parse_page_range(self, pdf_path: Path, first_page: int, last_page: int,
+                         doc_dir: Optional[Path] = None, fallback: bool = False) -> Dict:
+        """
+        Extract pages first_page..last_page (1-based, inclusive) as one work unit.
+        The chunk starts with no section/subsection context: objectives found before
+        the chunk's first header keep None there and are filled in by stitch_chunks.
+        """
+        started = time.perf_counter()
+        reset_peak_rss()
+        current_section = None
+        current_subsection = None
+        extracted_data = []
+        with RawPageSource(self, pdf_path, doc_dir, fallback) as source:
+            for page_num in range(first_page, last_page + 1):
+                objs, current_section, current_subsection = source.parse_page(
+                    page_num, current_section, current_subsection
+                )
+                extracted_data.extend(objs)
+        return {
+            'filename': pdf_path.name,
+            'first_page': first_page,
+            'fallback': fallback,
+            'objectives': extracted_data,
+            'section': current_section,
+            'subsection': current_subsection,
+            'elapsed_seconds': time.perf_counter() - started,
+            'table_strategy': source.selector.stats,
+            'stage_samples': source.timer.samples,
+            'peak_rss_mb': peak_rss_mb(),
+        }
+
+    @staticmethod
+    def stitch_chunks(chunks: List[Dict]) -> List[Objective]:
+        """Join page-range chunks in page order, carrying header context across boundaries."""
+        current_section = "General"
+        current_subsection = "Unknown"
+        extracted_data = []
+        for chunk in sorted(chunks, key=lambda c: c['first_page']):
+            for obj in chunk['objectives']:
+                if obj.section is None:
+                    obj.section = current_section
+                if obj.subsection is None:
+                    obj.subsection = current_subsection
+                extracted_data.append(obj)
+            if chunk['section'] is not None:
+                current_section = chunk['section']
+            if chunk['subsection'] is not None:
+                current_subsection = chunk['subsection']
+        return extracted_data
+
+    @staticmethod
+    def objective_prefix(pdf_path: Path) -> str:
+        prefix = "GEN"
+        fname = pdf_path.name.upper()
+        mappings = {
+            "BIO": "BIO", "CHEM": "CHEM", "PHYS": "PHYS", "MATH": "MATH",
+            "ENG": "ENG", "BUSINESS": "POB", "POB": "POB", "ECON": "ECON",
+            "IT": "IT", "SOC": "SOC", "GEO": "GEO", "HIST": "HIST", "AGRI": "AGRI"
+        }
+        for kw, pfx in mappings.items():
+            if kw in fname:
+                prefix = pfx
+                break
+        return prefix
+
+    def _id_table(self, pdf_path: Path) -> ObjectiveIdTable:
+        # Stable IDs: known objectives keep theirs, new ones are numbered after the last issued
+        return ObjectiveIdTable(self.output_dir / "objective_ids" / f"{pdf_path.stem}.json",
+                                self.objective_prefix(pdf_path), seed_file=self.output_dir / f"{pdf_path.stem}.json")
+
+    def finalize_objectives(self, pdf_path: Path, extracted_data: List[Objective]) -> tuple:
+        """Deduplicate, assign IDs and write the per-file JSON. Returns (objectives, near-duplicate clusters)."""
+        # Deduplicate
+        unique_data = {}
+        for obj in extracted_data:
+            if obj.hash not in unique_data:
+                unique_data[obj.hash] = obj
+        
+        extracted_data = list(unique_data.values())
+        
+        # Rows differing only by footer text, hyphenation or punctuation
+        near_duplicates = []
+        if self.near_dup_threshold:
+            extracted_data, near_duplicates = merge_near_duplicates(extracted_data, self.near_dup_threshold)
+        
+        id_table = self._id_table(pdf_path)
+        id_table.assign(extracted_data)
+        id_table.save()
+        
+        final_list = [o.to_dict() for o in extracted_data]
+        
+        # Save individual; written to a .partial file and swapped in, so a TaskTimeout
+        # mid-write leaves the previous output in place rather than a truncated one
+        with JSONArrayWriter(self.output_dir / f"{pdf_path.stem}.json") as writer:
+            writer.write_many(final_list)
+        return final_list, near_duplicates
+
+    def finalize_spilled(self, pdf_path: Path, spill_path: Path) -> tuple:
+        """
+        finalize_objectives for objectives spilled to NDJSON: two streaming passes (select,
+        then assign IDs and write) so only hashes and shingles are held in memory.
+        The per-file JSON is byte-identical. Returns (count, near-duplicate clusters).
+        """
+        merger = NearDuplicateMerger(self.near_dup_threshold) if self.near_dup_threshold else None
+        live = set()
+        seen = set()
+        for row in iter_objectives(spill_path):
+            obj = Objective(**row)
+            if obj.hash in seen:
+                continue
+            seen.add(obj.hash)
+            if merger is None or merger.offer(obj):
+                live.add(obj.hash)
+        del seen
+
+        id_table = self._id_table(pdf_path)
+        id_table.begin(live)
+        with JSONArrayWriter(self.output_dir / f"{pdf_path.stem}.json") as writer:
+            for row in iter_objectives(spill_path):
+                obj = Objective(**row)
+                if obj.hash not in live:
+                    continue
+                live.discard(obj.hash)
+                obj.id = id_table.id_for(obj)
+                writer.write_many([obj.to_dict()])
+        id_table.save()
+        return writer.count, merger.report() if merger else []
+
+    def parse_single_pdf(self, pdf_path: Path, force: bool = False, return_objectives: bool = True,
+                         pdf_hash: Optional[str] = None, fallback: bool = False) -> Dict:
+        """
+        Parse one PDF and write its per-file JSON. With return_objectives=False only
+        lightweight metadata (output path, count, PDF hash, timings) travels back
+        through the process pool; the parent reads the objectives from the shard file.
+        In low-memory mode each page's objectives are appended to an NDJSON spill file
+        and finalized from there, so memory stays flat as the page count grows.
+        fallback skips text-strategy table detection on uncached pages (see RawPageSource).
+        """
         # Incremental check
-        output_file = self.output_dir / f"{pdf_path.stem}.json"
-        if not force and output_file.exists():
-            # Check if source is newer
-            if pdf_path.stat().st_mtime < output_file.stat().st_mtime:
-                self.logger.info(f"Skipping (Up to date): {pdf_path.name}")
-                with open(output_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                return {'filename': pdf_path.name, 'objectives': data, 'count': len(data), 'success': True, 'skipped': True}
+        pdf_hash = pdf_hash or file_sha256(pdf_path)
+        if not force:
+            skipped = self._manifest_skip(pdf_path, pdf_hash)
+            if skipped:
+                return skipped
 
         extracted_data = []
         current_section = "General"
         current_subsection = "Unknown"
         
-        self.logger.info(f"Processing: {pdf_path.name}")
+        self.logger.info(f"Processing: {pdf_path.name}" + (" (fallback)" if fallback else ""))
+        started = time.perf_counter()
+        reset_peak_rss()
+        spill_path = self.output_dir / ".spill" / f"{pdf_path.stem}.ndjson"
         
         try:
-            with pdfplumber.open(pdf_path) as pdf:
-                for page_num, page in enumerate(pdf.pages, 1):
-                    objs, current_section, current_subsection = self.extract_from_page(
-                        page, page_num, current_section, current_subsection, pdf_path.name
+            with ExitStack() as stack:
+                source = stack.enter_context(RawPageSource(self, pdf_path, self.raw_document_dir(pdf_path, pdf_hash),
+                                                           fallback))
+                spill = stack.enter_context(NDJSONWriter(spill_path)) if self.low_memory else None
+                page_count = source.page_count
+                for page_num in range(1, page_count + 1):
+                    objs, current_section, current_subsection = source.parse_page(
+                        page_num, current_section, current_subsection
                     )
-                    extracted_data.extend(objs)
-            
-            # Deduplicate
-            unique_data = {}
-            for obj in extracted_data:
-                if obj.hash not in unique_data:
-                    unique_data[obj.hash] = obj
-            
-            extracted_data = list(unique_data.values())
-            
-            # Prefix Logic
-            prefix = "GEN"
-            fname = pdf_path.name.upper()
-            mappings = {
-                "BIO": "BIO", "CHEM": "CHEM", "PHYS": "PHYS", "MATH": "MATH",
-                "ENG": "ENG", "BUSINESS": "POB", "POB": "POB", "ECON": "ECON",
-                "IT": "IT", "SOC": "SOC", "GEO": "GEO", "HIST": "HIST", "AGRI": "AGRI"
-            }
-            for kw, pfx in mappings.items():
-                if kw in fname:
-                    prefix = pfx
-                    break
-            
-            for idx, obj in enumerate(extracted_data, 1):
-                obj.id = f"{prefix}-{idx:05d}"
+                    if spill is not None:
+                        spill.write_many(o.to_dict() for o in objs)
+                    else:
+                        extracted_data.extend(objs)
             
-            final_list = [asdict(o) for o in extracted_data]
-            
-            # Save individual
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(final_list, f, indent=2, ensure_ascii=False)
+            if self.low_memory:
+                count, near_duplicates = self.finalize_spilled(pdf_path, spill_path)
+                final_list = None
+            else:
+                final_list, near_duplicates = self.finalize_objectives(pdf_path, extracted_data)
+                count = len(final_list)
+            output_file = self.output_dir / f"{pdf_path.stem}.json"
                 
-            return {
+            result = {
                 'filename': pdf_path.name,
-                'objectives': final_list,
-                'count': len(final_list),
+                'source': str(pdf_path),
+                'output_file': str(output_file),
+                'output_hash': file_sha256(output_file),
+                'count': count,
+                'hash': pdf_hash,
                 'success': True,
-                'skipped': False
+                'skipped': False,
+                'fallback': fallback,
+                'pages': page_count,
+                'timings': {'elapsed_seconds': round(time.perf_counter() - started, 3)},
+                'table_strategy': source.selector.stats,
+                'stage_samples': source.timer.samples,
+                'near_duplicates': near_duplicates,
+                'peak_rss_mb': peak_rss_mb()
             }
+            if return_objectives:
+                result['objectives'] = final_list if final_list is not None else list(iter_objectives(output_file))
+            return result
             
         except Exception as e:
             self.logger.error(f"Error processing {pdf_path.name}: {str(e)}")
-            return {'filename': pdf_path.name, 'objectives': [], 'count': 0, 'success': False, 'error': str(e)}
-    
-    def process_directory(self, directory: str, force: bool = False) -> Dict:
+            return {'filename': pdf_path.name, 'objectives': [], 'count': 0, 'success': False, 'error': str(e), 'pages': 0}
+        finally:
+            spill_path.unlink(missing_ok=True)
+
+    def worker_pool(self, workers: int) -> SupervisedPool:
+        return SupervisedPool(workers, self.file_timeout, self.recycle_after, self.recycle_rss_mb, current_rss_mb)
+
+    def _failure(self, filename: str, error: BaseException, fallback: bool = False) -> Dict:
+        """Failed result for a work unit the pool gave up on (or that raised in the worker)."""
+        if isinstance(error, TaskTimeout):
+            message = f"Timed out after {self.file_timeout:g}s" + (" in fallback mode" if fallback else "")
+        else:
+            message = str(error) or type(error).__name__
+        self.logger.error(f"Error processing {filename}: {message}")
+        return {'filename': filename, 'objectives': [], 'count': 0, 'success': False, 'error': message, 'pages': 0,
+                'timed_out': isinstance(error, TaskTimeout), 'crashed': isinstance(error, WorkerCrashed)}
+
+    def _retry_message(self, what: str) -> str:
+        return f"Timed out after {self.file_timeout:g}s: {what}; retrying without text-strategy tables"
+
+    def _run_file_jobs(self, pool: SupervisedPool, jobs: List[tuple], force: bool, on_result,
+                       return_objectives: bool = True) -> Dict:
+        results = {}
+        by_name = {pdf.name: (pdf, pdf_hash) for pdf, pdf_hash in jobs}
+        for pdf, pdf_hash in jobs:
+            pool.submit((pdf.name, False), self.parse_single_pdf, pdf, force, return_objectives, pdf_hash)
+        with tqdm(total=len(jobs), desc="Parsing Syllabuses") as pbar:
+            for (name, fallback), result, error in pool.completed():
+                if isinstance(error, TaskTimeout) and not fallback:
+                    self.logger.warning(self._retry_message(name))
+                    pdf, pdf_hash = by_name[name]
+                    pool.submit((name, True), self.parse_single_pdf, pdf, force, return_objectives, pdf_hash, True)
+                    continue
+                if error is not None:
+                    result = self._failure(name, error, fallback)
+                results[name] = result
+                on_result(result)
+                pbar.update(1)
+        return results
+
+    def _run_page_jobs(self, pool: SupervisedPool, jobs: List[tuple], pages_per_chunk: int, on_result,
+                       return_objectives: bool = True) -> Dict:
+        results = {}
+        pending = {}
+        chunks = 0
+        for pdf, pdf_hash in jobs:
+            try:
+                doc_dir = self.raw_document_dir(pdf, pdf_hash)
+                page_count = self.count_pages(pdf, doc_dir)
+            except Exception as e:
+                self.logger.error(f"Error processing {pdf.name}: {str(e)}")
+                results[pdf.name] = {'filename': pdf.name, 'objectives': [], 'count': 0, 'success': False, 'error': str(e), 'pages': 0}
+                continue
+            self.logger.info(f"Processing: {pdf.name} ({page_count} pages)")
+            ranges = [(start, min(start + pages_per_chunk - 1, page_count))
+                      for start in range(1, page_count + 1, pages_per_chunk)]
+            pending[pdf.name] = {'pdf': pdf, 'hash': pdf_hash, 'pages': page_count, 'remaining': len(ranges),
+                                 'chunks': [], 'failure': None, 'doc_dir': doc_dir}
+            for first, last in ranges:
+                pool.submit((pdf.name, first, last, False), self.parse_page_range, pdf, first, last, doc_dir)
+            chunks += len(ranges)
+
+        with tqdm(total=chunks, desc="Parsing Syllabus Pages") as pbar:
+            for (name, first, last, fallback), chunk, error in pool.completed():
+                state = pending[name]
+                if isinstance(error, TaskTimeout) and not fallback:
+                    self.logger.warning(self._retry_message(f"{name} pages {first}-{last}"))
+                    pool.submit((name, first, last, True), self.parse_page_range, state['pdf'], first, last,
+                                state['doc_dir'], True)
+                    continue
+                if error is not None:
+                    state['failure'] = state['failure'] or (error, fallback)
+                else:
+                    state['chunks'].append(chunk)
+                state['remaining'] -= 1
+                pbar.update(1)
+                if state['remaining']:
+                    continue
+
+                pdf = state['pdf']
+                del pending[name]
+                if state['failure']:
+                    results[name] = self._failure(name, *state['failure'])
+                    continue
+                final_list, near_duplicates = self.finalize_objectives(pdf, self.stitch_chunks(state['chunks']))
+                output_file = self.output_dir / f"{pdf.stem}.json"
+                result = {
+                    'filename': pdf.name,
+                    'source': str(pdf),
+                    'output_file': str(output_file),
+                    'output_hash': file_sha256(output_file),
+                    'count': len(final_list),
+                    'hash': state['hash'],
+                    'success': True,
+                    'skipped': False,
+                    'fallback': any(c['fallback'] for c in state['chunks']),
+                    'pages': state['pages'],
+                    'timings': {'elapsed_seconds': round(sum(c['elapsed_seconds'] for c in state['chunks']), 3)},
+                    'table_strategy': reduce(merge_strategy_stats, (c['table_strategy'] for c in state['chunks']),
+                                             new_strategy_stats()),
+                    'stage_samples': reduce(merge_stage_samples, (c['stage_samples'] for c in state['chunks']), {}),
+                    'near_duplicates': near_duplicates,
+                    'peak_rss_mb': max((c['peak_rss_mb'] or 0 for c in state['chunks']), default=None)
+                }
+                if return_objectives:
+                    result['objectives'] = final_list
+                results[name] = result
+                on_result(result)
+        return results
+
+    @staticmethod
+    def _file_summary(result: Dict) -> Dict:
+        entry = {k: result.get(k) for k in ('count', 'pages', 'hash', 'timings', 'peak_rss_mb', 'skipped',
+                                            'duplicate_of', 'error')
+                 if result.get(k) is not None}
+        entry.update({k: True for k in ('fallback', 'timed_out', 'crashed') if result.get(k)})
+        if result.get('table_strategy'):
+            entry['table_strategy'] = summarize_strategy_stats(result['table_strategy'])
+        if result.get('stage_samples'):
+            entry['stage_timings'] = summarize_stage_samples(result['stage_samples'])
+        if result.get('near_duplicates'):
+            entry['near_duplicates_merged'] = sum(len(c['merged']) for c in result['near_duplicates'])
+        return entry
+
+    def outliers(self, results: Dict[str, Dict]) -> List[Dict]:
+        """
+        Files that timed out, crashed a worker or needed fallback mode, plus those that
+        took over SLOW_FILE_FACTOR times the median parse time, slowest first.
+        """
+        elapsed = {name: r['timings']['elapsed_seconds'] for name, r in results.items()
+                   if r.get('success') and not r.get('skipped') and r.get('timings')}
+        ordered = sorted(elapsed.values())
+        median = ordered[len(ordered) // 2] if len(ordered) >= 3 else None
+        outliers = []
+        for name, result in results.items():
+            seconds = elapsed.get(name)
+            if result.get('crashed'):
+                reason = 'crashed'
+            elif result.get('timed_out'):
+                reason = 'timed_out'
+            elif result.get('fallback'):
+                reason = 'fallback'
+            elif median and seconds is not None and seconds > SLOW_FILE_FACTOR * median:
+                reason = 'slow'
+            else:
+                continue
+            outlier = {'file': name, 'reason': reason, 'pages': result.get('pages', 0)}
+            outlier['elapsed_seconds'] = self.file_timeout if reason == 'timed_out' else seconds
+            if median and seconds:
+                outlier['times_median'] = round(seconds / median, 1)
+            if result.get('error'):
+                outlier['error'] = result['error']
+            outliers.append(outlier)
+        return sorted(outliers, key=lambda o: -(o['elapsed_seconds'] or 0))
+
+    def workers_for_budget(self, pdf_hashes: List[str]) -> int:
+        """
+        Largest pool that fits memory_budget_mb even if the hungriest files run together.
+        Per-file peaks come from the manifest; files never measured assume the largest
+        recorded peak (or DEFAULT_WORKER_RSS_MB on a fresh output directory).
+        """
+        if not self.memory_budget_mb:
+            return self.num_workers
+        recorded = {h: e['peak_rss_mb'] for h, e in self.manifest.documents.items() if e.get('peak_rss_mb')}
+        fallback = max(recorded.values(), default=DEFAULT_WORKER_RSS_MB)
+        estimates = sorted((recorded.get(h, fallback) for h in pdf_hashes), reverse=True) or [fallback]
+        available = self.memory_budget_mb - current_rss_mb()
+        workers = 0
+        for estimate in estimates[:self.num_workers]:
+            if available < estimate:
+                break
+            available -= estimate
+            workers += 1
+        workers = max(workers, 1)
+        self.logger.info(f"Memory budget {self.memory_budget_mb:.0f} MB: using {workers} worker(s) "
+                         f"(largest expected peak {estimates[0]:.0f} MB)")
+        return workers
+
+    def _dispatch(self, pool: SupervisedPool, jobs: List[tuple], force: bool, pages_per_chunk: int, on_result,
+                  return_objectives: bool = True) -> Dict:
+        if pages_per_chunk > 0:
+            return self._run_page_jobs(pool, jobs, pages_per_chunk, on_result, return_objectives)
+        return self._run_file_jobs(pool, jobs, force, on_result, return_objectives)
+
+    def process_directory(self, directory: str, force: bool = False, pages_per_chunk: int = 0,
+                          output_format: str = "json", lean_ipc: bool = False,
+                          pool: Optional[SupervisedPool] = None) -> Dict:
+        """
+        Parse every PDF in a directory. With pages_per_chunk > 0 each PDF is split into
+        page ranges so one large syllabus is spread across the pool instead of one worker.
+        The combined file is streamed as each PDF completes; output_format="ndjson"
+        writes combined_syllabuses.ndjson instead of the JSON array. With lean_ipc the
+        workers return metadata only and the combined file is built from the shards.
+        An existing pool can be passed in to reuse warm workers (see watch_directory).
+        low_memory implies lean_ipc; in page mode worker memory is already bounded by
+        pages_per_chunk. With a memory budget the pool size comes from workers_for_budget.
+        A work unit past file_timeout is stopped and retried once in fallback mode, and a
+        worker crash fails only the file that caused it; both are listed under 'outliers'.
+        """
         input_dir = Path(directory)
-        pdf_files = list(input_dir.glob("*.pdf"))
+        # Largest first so the pool is not left waiting on one big file at the end
+        pdf_files = sorted(input_dir.glob("*.pdf"), key=lambda p: p.stat().st_size, reverse=True)
         
         if not pdf_files:
             self.logger.warning(f"No PDF files found in '{directory}'")
@@ -262,35 +1415,116 @@ class EnhancedCXCSyllabusParser:
         
         self.logger.info(f"Scanning {len(pdf_files)} PDFs in {directory}...")
         
+        mode = 'page' if pages_per_chunk > 0 else 'file'
         results = {}
-        all_objectives = []
+        jobs = []
+        first_by_hash = {}
+        for pdf in pdf_files:
+            pdf_hash = file_sha256(pdf)
+            if pdf_hash in first_by_hash:
+                # Same bytes under another name: parse once, report the copy
+                self.logger.info(f"Skipping (Duplicate of {first_by_hash[pdf_hash]}): {pdf.name}")
+                results[pdf.name] = {'filename': pdf.name, 'count': 0, 'hash': pdf_hash, 'success': True,
+                                     'skipped': True, 'duplicate_of': first_by_hash[pdf_hash], 'pages': 0}
+                continue
+            first_by_hash[pdf_hash] = pdf.name
+            skipped = None if force else self._manifest_skip(pdf, pdf_hash)
+            if skipped:
+                self.manifest.add_source(pdf_hash, pdf)
+                results[pdf.name] = skipped
+            else:
+                jobs.append((pdf, pdf_hash))
+
+        writer = writer_for(self.combined_path(output_format))
+        # A spilled document is never held in a worker, so do not ship it back either
+        lean_ipc = lean_ipc or self.low_memory
+        workers = pool.workers if pool is not None else self.workers_for_budget([h for _, h in jobs])
+
+        def on_result(result: Dict) -> None:
+            if result.get('success') and not result.get('skipped'):
+                self.manifest.record(result['hash'], result)
+                self.manifest.save()
+            # Drop the rows once they are on disk so the parent stays flat
+            objectives = result.pop('objectives', None)
+            if objectives is None and result.get('success'):
+                objectives = iter_objectives(result['output_file'])
+            writer.write_many(objectives or [])
+
+        started = time.perf_counter()
         
         # Parallel processing
-        with ProcessPoolExecutor(max_workers=self.num_workers) as executor:
-            futures = {executor.submit(self.parse_single_pdf, pdf, force): pdf for pdf in pdf_files}
-            with tqdm(total=len(pdf_files), desc="Parsing Syllabuses") as pbar:
-                for future in as_completed(futures):
-                    result = future.result()
-                    results[result['filename']] = result
-                    all_objectives.extend(result['objectives'])
-                    pbar.update(1)
+        with ExitStack() as stack:
+            if pool is None:
+                pool = stack.enter_context(self.worker_pool(workers))
+            faults_before = dict(pool.stats)
+            stack.enter_context(writer)
+            for result in results.values():
+                if not result.get('duplicate_of'):
+                    on_result(result)
+            results.update(self._dispatch(pool, jobs, force, pages_per_chunk, on_result, not lean_ipc))
+        faults = {k: v - faults_before[k] for k, v in pool.stats.items()}
+        # A byte-identical copy is a source of the same output, so deleting one of them keeps it
+        for result in results.values():
+            if result.get('duplicate_of'):
+                self.manifest.add_source(result['hash'], input_dir / result['filename'])
+        self.manifest.save()
+        elapsed = time.perf_counter() - started
+        near_duplicates = self.write_near_duplicate_report(output_format)
+        keyword_stats, _ = self.write_keywords(output_format)
+        link_stats = self.write_objective_links(output_format)
+        if self.build_index:
+            self.write_index(output_format)
+        if self.emit_store:
+            self.write_objective_store(output_format)
         
         # Combined summary metrics
-        total_extracted = len(all_objectives)
+        total_extracted = writer.count
+        pages_parsed = sum(r.get('pages', 0) for r in results.values())
         
-        # Save Combined
-        combined_file = self.output_dir / "combined_syllabuses.json"
-        with open(combined_file, 'w', encoding='utf-8') as f:
-            json.dump(all_objectives, f, indent=2, ensure_ascii=False)
-            
         summary = {
             'stats': {
                 'total_files': len(pdf_files),
                 'processed': sum(1 for r in results.values() if r.get('success') and not r.get('skipped')),
                 'skipped': sum(1 for r in results.values() if r.get('skipped')),
+                'duplicates': sum(1 for r in results.values() if r.get('duplicate_of')),
                 'failed': sum(1 for r in results.values() if not r.get('success')),
-                'total_objectives': total_extracted
+                'fallback': sum(1 for r in results.values() if r.get('success') and r.get('fallback')
+                                and not r.get('skipped')),
+                'total_objectives': total_extracted,
+                'near_duplicates_merged': near_duplicates['within_file_merged'] if near_duplicates else 0,
+                'cross_file_clusters': len(near_duplicates['cross_file']['clusters']) if near_duplicates else 0
             },
+            'throughput': {
+                'mode': mode,
+                'workers': workers,
+                'pages_per_chunk': pages_per_chunk if mode == 'page' else None,
+                'pages_parsed': pages_parsed,
+                'elapsed_seconds': round(elapsed, 3),
+                'pages_per_second': round(pages_parsed / elapsed, 2) if elapsed > 0 else 0.0
+            },
+            'table_strategy': summarize_strategy_stats(
+                reduce(merge_strategy_stats, (r.get('table_strategy') for r in results.values()), new_strategy_stats())
+            ),
+            'stage_timings': summarize_stage_samples(
+                reduce(merge_stage_samples, (r.get('stage_samples') for r in results.values()), {})
+            ) if self.profile else None,
+            'keywords': keyword_stats,
+            'links': link_stats,
+            'faults': {
+                'file_timeout': self.file_timeout,
+                'recycle_after': self.recycle_after or None,
+                'recycle_rss_mb': self.recycle_rss_mb,
+                **faults
+            },
+            'outliers': self.outliers(results),
+            'memory': {
+                'low_memory': self.low_memory,
+                'budget_mb': self.memory_budget_mb,
+                'max_file_peak_rss_mb': max((r.get('peak_rss_mb') or 0 for r in results.values()), default=0)
+            },
+            'output_format': output_format,
+            'lean_ipc': lean_ipc,
+            'files': {name: self._file_summary(r) for name, r in sorted(results.items())},
             'timestamp': datetime.now().isoformat()
         }
         
@@ -298,8 +1532,262 @@ class EnhancedCXCSyllabusParser:
             json.dump(summary, f, indent=2)
             
         self.logger.info(f"Done! Extracted {total_extracted} objectives across {len(pdf_files)} files.")
+        self.logger.info(f"Throughput ({mode} mode): {pages_parsed} pages in {elapsed:.1f}s "
+                         f"({summary['throughput']['pages_per_second']} pages/sec)")
         return summary
 
+    def combined_path(self, output_format: str = "json") -> Path:
+        return self.output_dir / (COMBINED_NDJSON if output_format == "ndjson" else COMBINED_JSON)
+
+    def write_objective_store(self, output_format: str = "json") -> None:
+        """Rewrite <output>/combined_syllabuses.objs from the combined output."""
+        count = write_store(self.output_dir / COMBINED_STORE, iter_objectives(self.combined_path(output_format)))
+        self.logger.info(f"Wrote {count} objectives to {COMBINED_STORE}")
+
+    def write_index(self, output_format: str = "json") -> None:
+        """Rebuild <output>/syllabus_index.db from the combined output."""
+        started = time.perf_counter()
+        try:
+            index = SyllabusIndex.build(self.output_dir / INDEX_DB, iter_objectives(self.combined_path(output_format)))
+        except sqlite3.Error as e:
+            self.logger.warning(f"Search index not built ({e}); this SQLite build may lack FTS5")
+            return
+        with index:
+            count = sum(index.subjects().values())
+        self.logger.info(f"Indexed {count} objectives into {INDEX_DB} in {time.perf_counter() - started:.2f}s")
+
+    def write_keywords(self, output_format: str = "json", changed: Optional[List[str]] = None,
+                       removed: List[str] = ()) -> tuple:
+        """
+        Replace the combined output's per-row keywords with corpus TF-IDF top-k terms, and
+        those of each re-ranked source's per-file JSON, so a row carries the same keywords
+        in both. A full pass tokenizes every source; with changed/removed (watch mode) only
+        those sources are re-tokenized and re-ranked, and other rows keep the keywords they have.
+        Returns (stats or None, {source_file: re-ranked rows} for the changed sources).
+        """
+        combined = self.combined_path(output_format)
+        if not self.tfidf_keywords or not combined.exists():
+            return None, {}
+        if not objective_keywords.available():
+            self.logger.warning("TF-IDF keywords skipped: numpy is not installed")
+            return None, {}
+        started = time.perf_counter()
+        targets = None
+        if changed is None or self.keyword_model is None:
+            self.keyword_model = CorpusKeywords(self.keyword_top_k)
+        else:
+            targets = set(changed)
+            for src in list(removed) + list(targets):
+                self.keyword_model.remove(src)
+        tokenized = self.keyword_model.update(iter_objectives(combined), targets)
+        ranked = self.keyword_model.rank(targets)
+
+        rows = {}
+
+        def reranked():
+            for obj in iter_objectives(combined):
+                keywords = ranked.get(obj.get('source_file'), {}).get(obj.get('hash'))
+                if keywords is not None:
+                    obj['keywords'] = keywords
+                    if targets is not None:
+                        rows.setdefault(obj['source_file'], []).append(obj)
+                yield obj
+
+        with writer_for(combined) as writer:
+            writer.write_many(reranked())
+        for src, keywords in ranked.items():
+            self._patch_shard_keywords(src, keywords)
+        self.manifest.save()
+        stats = {
+            'top_k': self.keyword_top_k,
+            'objectives': self.keyword_model.rows,
+            'tokenized': tokenized,
+            'vocabulary': len(self.keyword_model.terms),
+            'seconds': round(time.perf_counter() - started, 3)
+        }
+        self.logger.info(f"TF-IDF keywords: re-ranked {tokenized} of {stats['objectives']} objectives "
+                         f"in {stats['seconds']:.2f}s")
+        return stats, rows
+
+    def _patch_shard_keywords(self, source_file: str, keywords: Dict[str, List[str]]) -> None:
+        # Copies of one PDF share the output named after the source_file its rows carry
+        shard = self.output_dir / f"{Path(source_file).stem}.json"
+        if not shard.exists():
+            return
+
+        def patched():
+            for obj in iter_objectives(shard):
+                obj['keywords'] = keywords.get(obj.get('hash'), obj.get('keywords'))
+                yield obj
+
+        with JSONArrayWriter(shard) as writer:
+            writer.write_many(patched())
+        self.manifest.refresh_output(shard)
+
+    def write_objective_links(self, output_format: str = "json") -> Optional[Dict]:
+        """
+        Write <output>/objective_links.json: pairs of objectives from different subjects
+        whose TF-IDF cosine is at least link_threshold, for the question generators to
+        reuse questions across (see objective_links). Reuses the keyword stage's model.
+        """
+        combined = self.combined_path(output_format)
+        if not self.link_threshold or not combined.exists():
+            return None
+        if not objective_keywords.available():
+            self.logger.warning("Objective links skipped: numpy is not installed")
+            return None
+        started = time.perf_counter()
+        table = build_links(iter_objectives(combined), self.link_threshold, subject_from_source,
+                            model=self.keyword_model if self.tfidf_keywords else None)
+        table['timestamp'] = datetime.now().isoformat()
+        with open(self.output_dir / LINKS_FILE, 'w', encoding='utf-8') as f:
+            json.dump(table, f, indent=2, ensure_ascii=False)
+        stats = {'threshold': self.link_threshold, 'links': len(table['links']),
+                 'linked_objectives': len({(side['source_file'], side['hash'])
+                                           for link in table['links'] for side in (link['a'], link['b'])}),
+                 'seconds': round(time.perf_counter() - started, 3)}
+        self.logger.info(f"Objective links: {stats['links']} cross-subject links over "
+                         f"{stats['linked_objectives']} objectives in {stats['seconds']:.2f}s")
+        return stats
+
+    def write_near_duplicate_report(self, output_format: str = "json") -> Optional[Dict]:
+        """
+        Write <output>/near_duplicates.json: the clusters merged inside each file (kept in
+        the manifest, so skipped files still report) and near-duplicates across syllabuses,
+        which are only reported since each subject keeps its own copy.
+        """
+        if not self.near_dup_threshold:
+            return None
+        within = {entry['filename']: entry['near_duplicates']
+                  for entry in sorted(self.manifest.documents.values(), key=lambda e: e['filename'])
+                  if entry.get('near_duplicates')}
+        combined = self.combined_path(output_format)
+        cross = corpus_clusters(iter_objectives(combined) if combined.exists() else [], self.near_dup_threshold)
+        report = {
+            'threshold': self.near_dup_threshold,
+            'within_file_merged': sum(len(c['merged']) for clusters in within.values() for c in clusters),
+            'within_file': within,
+            'cross_file': cross,
+            'timestamp': datetime.now().isoformat()
+        }
+        with open(self.output_dir / "near_duplicates.json", 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        self.logger.info(f"Near-duplicates: {report['within_file_merged']} merged within files, "
+                         f"{len(cross['clusters'])} clusters across files")
+        return report
+
+    @staticmethod
+    def _snapshot(input_dir: Path) -> Dict[str, tuple]:
+        snapshot = {}
+        for pdf in input_dir.glob("*.pdf"):
+            try:
+                stat = pdf.stat()
+            except OSError:
+                continue  # removed between glob and stat
+            snapshot[pdf.name] = (stat.st_size, stat.st_mtime_ns)
+        return snapshot
+
+    def _forget_source(self, pdf_path: Path) -> List[str]:
+        """
+        Drop a deleted PDF from the manifest, removing its output once no copy of it is
+        left. Returns the source_file names whose objectives went with that output.
+        """
+        dropped = []
+        for pdf_hash, entry in list(self.manifest.documents.items()):
+            if str(pdf_path) not in entry.get('sources', []):
+                continue
+            entry['sources'] = [src for src in entry['sources'] if src != str(pdf_path)]
+            if not entry['sources']:
+                (self.output_dir / entry['output_file']).unlink(missing_ok=True)
+                del self.manifest.documents[pdf_hash]
+                dropped.append(entry['filename'])
+        return dropped
+
+    def _apply_changes(self, pool: SupervisedPool, input_dir: Path, changed: List[str], removed: List[str],
+                       output_format: str, pages_per_chunk: int) -> None:
+        started = time.perf_counter()
+        jobs = []
+        for name in changed:
+            pdf = input_dir / name
+            pdf_hash = file_sha256(pdf)
+            if self._manifest_skip(pdf, pdf_hash):
+                # Touched, or a copy of bytes already parsed: one more source keeping that output alive
+                self.manifest.add_source(pdf_hash, pdf)
+                continue
+            jobs.append((pdf, pdf_hash))
+
+        def on_result(result: Dict) -> None:
+            if result.get('success') and not result.get('skipped'):
+                self.manifest.record(result['hash'], result)
+
+        results = self._dispatch(pool, jobs, False, pages_per_chunk, on_result, return_objectives=False)
+        replacements = {r['filename']: r['output_file'] for r in results.values() if r.get('success')}
+        # A deleted PDF whose bytes survive under another name keeps its objectives
+        removed = [src for name in removed for src in self._forget_source(input_dir / name)]
+        self.manifest.save()
+        if not replacements and not removed:
+            return
+
+        stats = patch_combined(self.combined_path(output_format), replacements, removed)
+        self.write_near_duplicate_report(output_format)
+        _, reranked = self.write_keywords(output_format, list(replacements), removed)
+        self.write_objective_links(output_format)
+        if self.build_index:
+            if (self.output_dir / INDEX_DB).exists():
+                with SyllabusIndex(self.output_dir / INDEX_DB) as index:
+                    index.replace_sources({src: reranked.get(src, shard) for src, shard in replacements.items()},
+                                          removed)
+            else:
+                self.write_index(output_format)
+        if self.emit_store:
+            self.write_objective_store(output_format)
+        failed = [r['filename'] for r in results.values() if not r.get('success')]
+        self.logger.info(
+            f"Patched {self.combined_path(output_format).name} in {time.perf_counter() - started:.1f}s: "
+            f"{len(replacements)} re-parsed, {len(removed)} removed, {stats['added']} objectives added, "
+            f"{stats['updated']} updated, {stats['removed']} dropped"
+            + (f" (failed: {', '.join(failed)})" if failed else "")
+        )
+
+    def watch_directory(self, directory: str, interval: float = 2.0, pages_per_chunk: int = 0,
+                        output_format: str = "json") -> None:
+        """
+        Long-running mode: parse everything once, then poll the input directory and
+        re-parse only added or changed PDFs in a warm worker pool. The combined output is
+        patched in place by objective hash and objectives from deleted PDFs are dropped.
+        A file is picked up once its size/mtime has been stable for one poll interval.
+        """
+        input_dir = Path(directory)
+        with self.worker_pool(self.workers_for_budget(list(self.manifest.documents))) as pool:
+            self.process_directory(directory, pages_per_chunk=pages_per_chunk, output_format=output_format,
+                                   lean_ipc=True, pool=pool)
+            known = self._snapshot(input_dir)
+            pending = {}
+            self.logger.info(f"Watching {directory} every {interval}s (Ctrl+C to stop)")
+            try:
+                while True:
+                    time.sleep(interval)
+                    current = self._snapshot(input_dir)
+                    changed, unsettled = [], {}
+                    for name, stat in current.items():
+                        if known.get(name) == stat:
+                            continue
+                        if pending.get(name) == stat:
+                            changed.append(name)
+                        else:
+                            unsettled[name] = stat  # still being written; look again next poll
+                    pending = unsettled
+                    removed = [name for name in known if name not in current]
+                    if not changed and not removed:
+                        continue
+                    self._apply_changes(pool, input_dir, changed, removed, output_format, pages_per_chunk)
+                    for name in changed:
+                        known[name] = current[name]
+                    for name in removed:
+                        del known[name]
+            except KeyboardInterrupt:
+                self.logger.info("Watch stopped.")
+
 if __name__ == "__main__":
     import argparse
     parser = argparse.ArgumentParser(description="Overhauled CXC Syllabus Parser")
@@ -307,12 +1795,71 @@ if __name__ == "__main__":
     parser.add_argument("--output", type=str, default="syllabuses/output", help="Output directory for JSONs")
     parser.add_argument("--workers", type=int, default=None, help="Number of parallel workers")
     parser.add_argument("--force", action="store_true", help="Force re-processing of all PDFs")
+    parser.add_argument("--cache-dir", type=str, default=None,
+                        help="Raw page extraction cache (default: <output>/.cache/raw)")
+    parser.add_argument("--no-cache", action="store_true", help="Always re-run pdfplumber instead of using the raw page cache")
+    parser.add_argument("--profile", action="store_true",
+                        help="Record per-page and per-stage timings into processing_summary.json")
+    parser.add_argument("--format", type=str, choices=["json", "ndjson"], default="json",
+                        help="Combined output format; ndjson streams objectives to disk as files finish")
+    parser.add_argument("--lean-ipc", action="store_true",
+                        help="Workers return only metadata; the combined file is rebuilt from the per-file JSONs")
+    parser.add_argument("--watch", action="store_true",
+                        help="Keep running: re-parse added/changed PDFs and patch the combined output in place")
+    parser.add_argument("--watch-interval", type=float, default=2.0, help="Seconds between directory polls in --watch mode")
+    parser.add_argument("--near-dup-threshold", type=float, default=NEAR_DUP_THRESHOLD,
+                        help="Shingle Jaccard similarity at which objectives of one file are merged (0 = off)")
+    parser.add_argument("--low-memory", action="store_true",
+                        help="Spill objectives to disk page by page instead of holding whole documents in memory")
+    parser.add_argument("--memory-budget", type=float, default=None, metavar="MB",
+                        help="Pick the worker count so recorded per-file peak RSS fits in this many MB")
+    parser.add_argument("--no-index", action="store_true",
+                        help="Skip building the SQLite/FTS5 search index (syllabus_index.db)")
+    parser.add_argument("--no-store", action="store_true",
+                        help="Skip writing the memory-mappable objective store (combined_syllabuses.objs)")
+    parser.add_argument("--no-tfidf-keywords", action="store_true",
+                        help="Keep each row's own keywords instead of re-ranking them by corpus TF-IDF")
+    parser.add_argument("--keyword-top-k", type=int, default=KEYWORD_TOP_K,
+                        help="Keywords kept per objective by the TF-IDF stage")
+    parser.add_argument("--link-threshold", type=float, default=LINK_THRESHOLD,
+                        help="TF-IDF cosine at which objectives of different subjects are linked (0 = off)")
+    parser.add_argument("--crop-body", action="store_true",
+                        help="Learn each document's running header/footer bands and crop them off before extraction "
+                             "(cleaner table columns; slightly slower)")
+    parser.add_argument("--file-timeout", type=float, default=DEFAULT_FILE_TIMEOUT, metavar="SECONDS",
+                        help="Stop a PDF (or page range) after this long and retry it without text-strategy tables (0 = no limit)")
+    parser.add_argument("--recycle-after", type=int, default=0, metavar="N",
+                        help="Start a fresh worker pool after N files per worker (0 = never)")
+    parser.add_argument("--recycle-rss", type=float, default=None, metavar="MB",
+                        help="Start a fresh worker pool once a worker holds more than this many MB")
+    parser.add_argument("--pages-per-chunk", type=int, default=0,
+                        help="Split each PDF into page ranges of this size and parse them in parallel (0 = one job per file)")
     
     args = parser.parse_args()
     
     parser_instance = EnhancedCXCSyllabusParser(
         output_dir=args.output,
-        num_workers=args.workers
+        num_workers=args.workers,
+        cache_dir=args.cache_dir,
+        use_cache=not args.no_cache,
+        profile=args.profile,
+        near_dup_threshold=args.near_dup_threshold,
+        low_memory=args.low_memory,
+        memory_budget_mb=args.memory_budget,
+        build_index=not args.no_index,
+        emit_store=not args.no_store,
+        crop_body=args.crop_body,
+        tfidf_keywords=not args.no_tfidf_keywords,
+        keyword_top_k=args.keyword_top_k,
+        link_threshold=args.link_threshold,
+        file_timeout=args.file_timeout,
+        recycle_after=args.recycle_after,
+        recycle_rss_mb=args.recycle_rss
     )
     
-    parser_instance.process_directory(args.input, force=args.force)
\ No newline at end of file
+    if args.watch:
+        parser_instance.watch_directory(args.input, interval=args.watch_interval,
+                                        pages_per_chunk=args.pages_per_chunk, output_format=args.format)
+    else:
+        parser_instance.process_directory(args.input, force=args.force, pages_per_chunk=args.pages_per_chunk,
+                                         output_format=args.format, lean_ipc=args.lean_ipc)
\ No newline at end of file
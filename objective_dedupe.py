@@ -0,0 +1,213 @@
+"""
+Near-duplicate detection for extracted objectives: word-shingle MinHash signatures
+bucketed by an LSH band index, so only rows sharing a band are ever compared.
+Pure Python and free of pdfplumber, like syllabus_io.
+"""
+
+import re
+import zlib
+from typing import Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_THRESHOLD = 0.85
+DEFAULT_NUM_PERM = 64
+SHINGLE_SIZE = 3
+# Chance a pair at exactly the threshold becomes an LSH candidate; more similar pairs are likelier
+LSH_RECALL = 0.99
+
+_MERSENNE = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_HYPHENATION = re.compile(r'(\w)-\s+(\w)')
+_NON_WORD = re.compile(r'[^a-z0-9]+')
+
+
+def normalize(text: str) -> List[str]:
+    """Lowercase word tokens with line-break hyphenation rejoined and punctuation dropped."""
+    return _NON_WORD.sub(' ', _HYPHENATION.sub(r'\1\2', text.lower())).split()
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> frozenset:
+    tokens = normalize(text)
+    if len(tokens) <= size:
+        return frozenset([zlib.crc32(' '.join(tokens).encode())]) if tokens else frozenset()
+    return frozenset(zlib.crc32(' '.join(tokens[i:i + size]).encode()) for i in range(len(tokens) - size + 1))
+
+
+def jaccard(a: frozenset, b: frozenset) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+def candidate_probability(similarity: float, bands: int, rows: int) -> float:
+    """Chance that a pair at this Jaccard similarity shares at least one band."""
+    return 1.0 - (1.0 - similarity ** rows) ** bands
+
+
+def lsh_params(threshold: float, num_perm: int, recall: float = LSH_RECALL) -> Tuple[int, int]:
+    """
+    Pick (bands, rows) with bands * rows <= num_perm: the most rows per band (fewest
+    spurious candidates) that still make a pair at threshold a candidate with at least
+    the given probability, which puts the S-curve knee well below the threshold.
+    """
+    best = (num_perm, 1)
+    for rows in range(2, num_perm + 1):
+        bands = num_perm // rows
+        if candidate_probability(threshold, bands, rows) >= recall:
+            best = (bands, rows)
+    return best
+
+
+class MinHasher:
+    """Fixed-seed universal hash family, so signatures are comparable across runs and processes."""
+
+    def __init__(self, num_perm: int = DEFAULT_NUM_PERM, seed: int = 1):
+        self.num_perm = num_perm
+        state = seed
+        self.perms = []
+        for _ in range(num_perm):
+            # 64-bit LCG keeps the permutations reproducible without the random module
+            state = (state * 6364136223846793005 + 1442695040888963407) & ((1 << 64) - 1)
+            a = (state >> 3) % (_MERSENNE - 1) + 1
+            state = (state * 6364136223846793005 + 1442695040888963407) & ((1 << 64) - 1)
+            b = (state >> 3) % _MERSENNE
+            self.perms.append((a, b))
+
+    def signature(self, shingle_set: Iterable[int]) -> Tuple[int, ...]:
+        rows = [[((a * h + b) % _MERSENNE) & _MAX_HASH for a, b in self.perms] for h in shingle_set]
+        if not rows:
+            return (_MAX_HASH,) * self.num_perm
+        return tuple(map(min, zip(*rows)))
+
+
+class LSHIndex:
+    """Band index over MinHash signatures; candidates are keys sharing at least one band."""
+
+    def __init__(self, bands: int, rows: int):
+        self.bands = bands
+        self.rows = rows
+        self.buckets: List[Dict[Tuple[int, ...], List]] = [{} for _ in range(bands)]
+
+    def insert(self, key, signature: Tuple[int, ...]) -> List:
+        """Add a key and return the keys already indexed that share one of its bands."""
+        candidates = []
+        seen = set()
+        for band, bucket in enumerate(self.buckets):
+            start = band * self.rows
+            members = bucket.setdefault(signature[start:start + self.rows], [])
+            for other in members:
+                if other not in seen:
+                    seen.add(other)
+                    candidates.append(other)
+            members.append(key)
+        return candidates
+
+
+class NearDuplicateFinder:
+    """
+    Incrementally cluster texts whose shingle Jaccard similarity is at least threshold.
+    LSH proposes candidates, the exact Jaccard confirms them, and a union-find joins
+    confirmed pairs into clusters. Cost grows with the number of candidate pairs rather
+    than the square of the corpus.
+    """
+
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD, num_perm: int = DEFAULT_NUM_PERM):
+        self.threshold = threshold
+        self.hasher = MinHasher(num_perm)
+        self.bands, self.rows = lsh_params(threshold, num_perm)
+        self.index = LSHIndex(self.bands, self.rows)
+        self.shingles = {}
+        self.parent = {}
+        self.candidate_pairs = 0
+
+    def _find(self, key):
+        root = key
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[key] != root:
+            self.parent[key], key = root, self.parent[key]
+        return root
+
+    def add(self, key, text: str, accept=None) -> Optional[object]:
+        """
+        Index a text. Returns the first key it was confirmed against, or None. accept(a, b)
+        can veto a confirmed pair (e.g. to keep cross-file matches out of a merge).
+        """
+        shingle_set = shingles(text)
+        self.shingles[key] = shingle_set
+        self.parent[key] = key
+        matched = None
+        for other in self.index.insert(key, self.hasher.signature(shingle_set)):
+            self.candidate_pairs += 1
+            if accept is not None and not accept(other, key):
+                continue
+            if jaccard(self.shingles[other], shingle_set) >= self.threshold:
+                root = self._find(other)
+                if matched is None:
+                    matched = other
+                if self._find(key) != root:
+                    self.parent[self._find(key)] = root
+        return matched
+
+    def clusters(self) -> List[List]:
+        """Clusters of two or more keys, members in insertion order."""
+        groups = {}
+        for key in self.shingles:
+            groups.setdefault(self._find(key), []).append(key)
+        return [members for members in groups.values() if len(members) > 1]
+
+
+class NearDuplicateMerger:
+    """
+    Streaming within-file merge: offer() objectives in reading order and it returns
+    whether each one is kept. Only kept rows are matched against, so a chain of small
+    edits cannot drift. Holds shingles and hashes, not the objectives themselves.
+    """
+
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD, num_perm: int = DEFAULT_NUM_PERM):
+        self.finder = NearDuplicateFinder(threshold, num_perm)
+        self.kept = {}
+        self.merged_into = {}
+
+    def offer(self, obj) -> bool:
+        idx = len(self.finder.parent)
+        match = self.finder.add(idx, f"{obj.objective} {obj.content}", accept=lambda a, b: a in self.kept)
+        if match is None:
+            self.kept[idx] = (obj.hash, obj.objective[:120])
+            return True
+        self.merged_into.setdefault(match, []).append(obj.hash)
+        return False
+
+    def report(self) -> List[Dict]:
+        """The hashes folded into each kept row."""
+        return [{'kept': self.kept[root][0], 'objective': self.kept[root][1], 'merged': merged}
+                for root, merged in self.merged_into.items()]
+
+
+def merge_near_duplicates(objectives: List, threshold: float = DEFAULT_THRESHOLD,
+                          num_perm: int = DEFAULT_NUM_PERM) -> Tuple[List, List[Dict]]:
+    """
+    Collapse near-duplicate objectives within one file. The first row of each cluster
+    (in reading order) is kept; the report lists the hashes folded into it.
+    """
+    merger = NearDuplicateMerger(threshold, num_perm)
+    kept = [obj for obj in objectives if merger.offer(obj)]
+    return kept, merger.report()
+
+
+def corpus_clusters(objectives: Iterable[Dict], threshold: float = DEFAULT_THRESHOLD,
+                    num_perm: int = DEFAULT_NUM_PERM) -> Dict:
+    """Report near-duplicate clusters that span more than one source file (nothing is merged)."""
+    finder = NearDuplicateFinder(threshold, num_perm)
+    rows = []
+    for obj in objectives:
+        key = len(rows)
+        rows.append({'id': obj.get('id'), 'source_file': obj.get('source_file'),
+                     'objective': (obj.get('objective') or '')[:120]})
+        finder.add(key, f"{obj.get('objective', '')} {obj.get('content', '')}",
+                   accept=lambda a, b: rows[a]['source_file'] != rows[b]['source_file'])
+    clusters = [[rows[k] for k in members] for members in finder.clusters()]
+    return {
+        'objectives': len(rows),
+        'candidate_pairs': finder.candidate_pairs,
+        'clusters': sorted(clusters, key=len, reverse=True)
+    }
@@ -0,0 +1,155 @@
+"""
+Corpus-level TF-IDF keywords for extracted objectives. Each source file's rows are
+tokenized once into a block of term counts; ranking stacks the blocks into one sparse
+row/term matrix and picks every row's top-k terms in a single NumPy pass, so a
+changed syllabus only costs re-tokenizing that file. Free of pdfplumber, like
+syllabus_io; numpy is optional and the stage is skipped without it.
+"""
+
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Optional
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+DEFAULT_TOP_K = 12
+# Same tokens and stopwords as EnhancedCXCSyllabusParser.extract_keywords; IDF does the rest
+STOPWORDS = frozenset({'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by',
+                       'their', 'from', 'this', 'that'})
+_PARENS = re.compile(r'\(.*?\)')
+_WORD = re.compile(r'\b[a-zA-Z]{3,}\b')
+
+
+def available() -> bool:
+    return np is not None
+
+
+def terms(text: str) -> Counter:
+    return Counter(w for w in _WORD.findall(_PARENS.sub('', text).lower()) if w not in STOPWORDS)
+
+
+class _Block:
+    """One source file's rows: objective hashes, row lengths and the flattened (term id, count) pairs."""
+
+    __slots__ = ('hashes', 'lengths', 'term_ids', 'counts')
+
+    def __init__(self, hashes: List[str], lengths: List[int], term_ids: List[int], counts: List[int]):
+        self.hashes = hashes
+        self.lengths = np.asarray(lengths, dtype=np.int64)
+        self.term_ids = np.asarray(term_ids, dtype=np.int64)
+        self.counts = np.asarray(counts, dtype=np.float64)
+
+
+class CorpusKeywords:
+    """
+    Term counts for every objective in the corpus, kept per source_file so one file can
+    be replaced or dropped without re-reading the rest. rank() scores rows by
+    (1 + log tf) * smoothed idf and keeps the top_k terms, ties broken alphabetically
+    so a full rebuild and an incremental update agree.
+    """
+
+    def __init__(self, top_k: int = DEFAULT_TOP_K):
+        if np is None:
+            raise ImportError("numpy is required for TF-IDF keywords")
+        self.top_k = top_k
+        self.vocab: Dict[str, int] = {}
+        self.terms: List[str] = []
+        self.blocks: Dict[str, _Block] = {}
+        self._term_array = None
+        self._alpha_rank = None
+
+    def _term_id(self, term: str) -> int:
+        term_id = self.vocab.get(term)
+        if term_id is None:
+            term_id = self.vocab[term] = len(self.terms)
+            self.terms.append(term)
+            self._term_array = None
+        return term_id
+
+    def update(self, objectives: Iterable[Dict], sources: Optional[set] = None) -> int:
+        """
+        (Re)tokenize the objectives of each source_file seen, replacing its previous block.
+        With sources given, rows from other files are ignored. Returns the rows tokenized.
+        """
+        pending = {}
+        for obj in objectives:
+            src = obj.get('source_file')
+            if sources is not None and src not in sources:
+                continue
+            hashes, lengths, term_ids, counts = pending.setdefault(src, ([], [], [], []))
+            row = terms(f"{obj.get('objective') or ''} {obj.get('content') or ''}")
+            hashes.append(obj.get('hash'))
+            lengths.append(len(row))
+            for term, count in row.items():
+                term_ids.append(self._term_id(term))
+                counts.append(count)
+        for src, parts in pending.items():
+            self.blocks[src] = _Block(*parts)
+        return sum(len(parts[0]) for parts in pending.values())
+
+    def remove(self, source_file: str) -> None:
+        self.blocks.pop(source_file, None)
+
+    @property
+    def rows(self) -> int:
+        return sum(len(block.hashes) for block in self.blocks.values())
+
+    def _idf(self):
+        """Smoothed idf over the whole corpus (terms are unique within a row, so df is a bincount)."""
+        df = np.zeros(len(self.terms), dtype=np.int64)
+        for block in self.blocks.values():
+            df += np.bincount(block.term_ids, minlength=len(self.terms))
+        return np.log((1.0 + self.rows) / (1.0 + df)) + 1.0
+
+    def matrix(self, sources: Optional[Iterable[str]] = None, normalize: bool = False) -> tuple:
+        """
+        TF-IDF rows of the given sources (default: all) as CSR arrays:
+        (names, blocks, indptr, term_ids, weights). With normalize each row has unit L2 norm.
+        """
+        names = [src for src in (self.blocks if sources is None else sources) if src in self.blocks]
+        blocks = [self.blocks[src] for src in names]
+        if not blocks:
+            empty = np.zeros(0, dtype=np.int64)
+            return names, blocks, np.zeros(1, dtype=np.int64), empty, empty.astype(np.float64)
+        lengths = np.concatenate([b.lengths for b in blocks])
+        term_ids = np.concatenate([b.term_ids for b in blocks])
+        weights = (1.0 + np.log(np.concatenate([b.counts for b in blocks]))) * self._idf()[term_ids]
+        indptr = np.concatenate(([0], np.cumsum(lengths)))
+        if normalize:
+            row_of = np.repeat(np.arange(len(lengths)), lengths)
+            norms = np.sqrt(np.bincount(row_of, weights=weights * weights, minlength=len(lengths)))
+            weights = weights / norms[row_of]
+        return names, blocks, indptr, term_ids, weights
+
+    def rank(self, sources: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, List[str]]]:
+        """{source_file: {objective hash: keywords}} for the given sources (default: all), best first."""
+        names, blocks, indptr, term_ids, scores = self.matrix(sources)
+        if not names:
+            return {}
+        if self._term_array is None:
+            self._term_array = np.array(self.terms, dtype=object)
+            self._alpha_rank = np.empty(len(self.terms), dtype=np.int64)
+            self._alpha_rank[np.argsort(self._term_array)] = np.arange(len(self.terms))
+
+        lengths = np.diff(indptr)
+        row_of = np.repeat(np.arange(len(lengths)), lengths)
+        # Row-major, best score first: each row's top_k terms are the first top_k of its run
+        order = np.lexsort((self._alpha_rank[term_ids], -scores, row_of))
+        position = np.arange(len(order)) - indptr[row_of[order]]
+        words = self._term_array[term_ids[order][position < self.top_k]].tolist()
+        kept = np.cumsum(np.minimum(lengths, self.top_k)).tolist()
+
+        ranked = {}
+        row = 0
+        start = 0
+        for src, block in zip(names, blocks):
+            per_hash = ranked[src] = {}
+            for obj_hash in block.hashes:
+                end = kept[row]
+                per_hash[obj_hash] = words[start:end]
+                start = end
+                row += 1
+        return ranked
@@ -0,0 +1,140 @@
+"""
+Cross-syllabus objective links: TF-IDF cosine similarity between every pair of
+objectives from different subjects, so the question generators can reuse questions
+already written for an equivalent objective instead of paying for new ones.
+Similarity is exact: blocks of rows are densified and multiplied against the sparse
+rows that share a rare enough term with them, in NumPy. Writing links needs numpy (see objective_keywords);
+reading the link table does not.
+"""
+
+import json
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Union
+
+from objective_keywords import CorpusKeywords, np
+
+LINKS_FILE = "objective_links.json"
+DEFAULT_THRESHOLD = 0.6
+# Rows densified per step; the dense block is vocabulary x BLOCK_ROWS floats
+BLOCK_ROWS = 64
+
+
+def _gather(starts, counts):
+    """Flat indexes of the ranges [start, start + count) for each pair, in order."""
+    offsets = np.cumsum(counts) - counts
+    return np.arange(counts.sum()) - np.repeat(offsets - starts, counts)
+
+
+def similar_pairs(model: CorpusKeywords, threshold: float, groups: Callable[[str], str],
+                  block_rows: int = BLOCK_ROWS) -> tuple:
+    """
+    (keys, pairs): keys are (source_file, hash) per row; pairs are (i, j, cosine) with
+    i < j, cosine >= threshold and groups(source_file) differing between the two rows.
+
+    Only rows that can reach the threshold are scored. Each row indexes its rarer
+    terms and leaves out its most common ones while their weight times the term's
+    highest weight in any row sums below the threshold: a row sharing none of the
+    indexed terms cannot reach it. Rows sharing an indexed term with a block are
+    then scored exactly against the densified block.
+    """
+    names, blocks, indptr, term_ids, weights = model.matrix(normalize=True)
+    keys = [(src, obj_hash) for src, block in zip(names, blocks) for obj_hash in block.hashes]
+    if not keys:
+        return keys, []
+    group_ids = {}
+    row_group = np.concatenate([np.full(len(block.hashes), group_ids.setdefault(groups(src), len(group_ids)))
+                                for src, block in zip(names, blocks)])
+    lengths = np.diff(indptr)
+    row_of = np.repeat(np.arange(len(keys)), lengths)
+    weights = weights.astype(np.float32)
+    vocabulary = len(model.terms)
+
+    df = np.bincount(term_ids, minlength=vocabulary)
+    max_weight = np.zeros(vocabulary, dtype=np.float32)
+    np.maximum.at(max_weight, term_ids, weights)
+    # Within each row, most common terms first; a term stays unindexed while the bound is below threshold
+    order = np.lexsort((term_ids, -df[term_ids], row_of))
+    bound = np.cumsum((weights * max_weight[term_ids])[order], dtype=np.float64)
+    bound -= np.repeat(np.concatenate(([0.0], bound))[indptr[:-1]], lengths)
+    indexed = np.zeros(len(term_ids), dtype=bool)
+    # The margin keeps float32 rounding from dropping a pair right at the threshold
+    indexed[order] = bound >= threshold - 1e-4
+    postings = row_of[np.argsort(term_ids, kind='stable')]
+    posting_starts = np.cumsum(df) - df
+
+    dense = np.zeros((vocabulary, block_rows), dtype=np.float32)
+    pairs = []
+    for first in range(0, len(keys), block_rows):
+        last = min(first + block_rows, len(keys))
+        lo, hi = indptr[first], indptr[last]
+        terms = np.unique(term_ids[lo:hi][indexed[lo:hi]])
+        if not len(terms):
+            continue
+        later = np.unique(postings[_gather(posting_starts[terms], df[terms])])
+        later = later[later >= first]
+        dense[term_ids[lo:hi], row_of[lo:hi] - first] = weights[lo:hi]
+        # Candidate rows as segments of the flattened (term, weight) pairs; each holds an indexed term
+        segments = _gather(indptr[later], lengths[later])
+        products = dense[term_ids[segments]] * weights[segments, None]
+        sims = np.add.reduceat(products, np.cumsum(lengths[later]) - lengths[later], axis=0)[:, :last - first]
+        i_local, j_index = np.nonzero(sims.T >= threshold)
+        i = i_local + first
+        j = later[j_index]
+        keep = (j > i) & (row_group[i] != row_group[j])
+        pairs.extend(zip(i[keep].tolist(), j[keep].tolist(), sims[j_index[keep], i_local[keep]].tolist()))
+        dense[term_ids[lo:hi], row_of[lo:hi] - first] = 0.0
+    return keys, pairs
+
+
+def build_links(objectives: Iterable[Dict], threshold: float = DEFAULT_THRESHOLD,
+                groups: Optional[Callable[[str], str]] = None, model: Optional[CorpusKeywords] = None) -> Dict:
+    """
+    Link table over parsed objectives. groups maps a source_file to its subject (rows of
+    one subject are never linked); by default every file is its own subject. A model
+    already holding these objectives (the TF-IDF keyword stage's) skips re-tokenizing.
+    """
+    groups = groups or (lambda src: src)
+    meta = {}
+    rows = []
+    for obj in objectives:
+        key = (obj.get('source_file'), obj.get('hash'))
+        meta[key] = {'id': obj.get('id'), 'source_file': key[0], 'hash': key[1], 'subject': groups(key[0]),
+                     'objective': (obj.get('objective') or '')[:120]}
+        if model is None:
+            rows.append(obj)
+    if model is None:
+        model = CorpusKeywords()
+        model.update(rows)
+    keys, pairs = similar_pairs(model, threshold, groups)
+    links = [{'similarity': round(sim, 4), 'a': meta[keys[i]], 'b': meta[keys[j]]}
+             for i, j, sim in sorted(pairs, key=lambda p: -p[2]) if keys[i] in meta and keys[j] in meta]
+    return {'threshold': threshold, 'objectives': len(meta), 'links': links}
+
+
+class ObjectiveLinks:
+    """Lookup over objective_links.json: the objectives linked to a given one, most similar first."""
+
+    def __init__(self, table: Optional[Dict] = None):
+        self.by_key: Dict[tuple, List[Dict]] = {}
+        for link in (table or {}).get('links', []):
+            a, b = link['a'], link['b']
+            self.by_key.setdefault((a['source_file'], a['hash']), []).append(dict(b, similarity=link['similarity']))
+            self.by_key.setdefault((b['source_file'], b['hash']), []).append(dict(a, similarity=link['similarity']))
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> 'ObjectiveLinks':
+        """The table at path (a file, or an output directory holding LINKS_FILE); empty if absent."""
+        path = Path(path)
+        if path.is_dir():
+            path = path / LINKS_FILE
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return cls(json.load(f))
+        except (OSError, ValueError):
+            return cls()
+
+    def linked(self, obj: Dict) -> List[Dict]:
+        return self.by_key.get((obj.get('source_file'), obj.get('hash')), [])
+
+    def __len__(self) -> int:
+        return sum(len(v) for v in self.by_key.values()) // 2
@@ -0,0 +1,232 @@
+"""
+Compact, memory-mappable store for parser output (combined_syllabuses.objs).
+
+Layout (little-endian):
+    magic b"OBJSTOR1" | u32 header length | JSON header (fields, counts, section offsets
+                                                          relative to the end of the header)
+    strings:  u32 offsets[n_strings + 1] | UTF-8 blob           every string interned once
+    records:  u32 offsets[n_records + 1] | packed records       one per objective
+    id index: (u32 id string, u32 record)[n_ids], sorted by ID   binary-searched in place
+
+Each record is the objective's fields in header order: 's' fields are a string
+number (NULL_REF for None), 'i' fields an i64, 'l' fields a u32 count followed by
+string numbers, and 'j' fields the string number of their JSON encoding. Opening a
+store maps the file and reads the header; objectives are decoded only when touched.
+Stdlib only, like syllabus_io.
+"""
+
+import json
+import mmap
+import os
+import struct
+from bisect import bisect_left
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+MAGIC = b"OBJSTOR1"
+STORE_VERSION = 1
+STORE_SUFFIX = ".objs"
+NULL_REF = 0xFFFFFFFF
+
+_U32 = struct.Struct("<I")
+_I64 = struct.Struct("<q")
+_PAIR = struct.Struct("<II")
+
+
+def _field_kind(values: List) -> str:
+    if all(isinstance(v, int) and not isinstance(v, bool) for v in values):
+        return 'i'
+    if all(v is None or isinstance(v, str) for v in values):
+        return 's'
+    if all(isinstance(v, list) and all(isinstance(x, str) for x in v) for v in values):
+        return 'l'
+    return 'j'
+
+
+def write_store(path: Union[str, Path], objectives: Iterable[Dict]) -> int:
+    """Write objectives to path (via '<path>.partial'); returns the number written."""
+    path = Path(path)
+    objectives = list(objectives)
+    names = []
+    for obj in objectives:
+        for name in obj:
+            if name not in names:
+                names.append(name)
+    kinds = [_field_kind([obj.get(name) for obj in objectives]) for name in names]
+
+    strings = {}
+    blob = bytearray()
+    string_offsets = [0]
+
+    def intern(text: Optional[str]) -> int:
+        if text is None:
+            return NULL_REF
+        ref = strings.get(text)
+        if ref is None:
+            ref = strings[text] = len(string_offsets) - 1
+            blob.extend(text.encode('utf-8'))
+            string_offsets.append(len(blob))
+        return ref
+
+    records = bytearray()
+    record_offsets = [0]
+    ids = []
+    for number, obj in enumerate(objectives):
+        for name, kind in zip(names, kinds):
+            value = obj.get(name)
+            if kind == 's':
+                records += _U32.pack(intern(value))
+            elif kind == 'i':
+                records += _I64.pack(value)
+            elif kind == 'l':
+                records += _U32.pack(len(value))
+                records += struct.pack(f"<{len(value)}I", *(intern(v) for v in value))
+            else:
+                records += _U32.pack(intern(json.dumps(value, ensure_ascii=False)))
+        record_offsets.append(len(records))
+        if isinstance(obj.get('id'), str):
+            ids.append((obj['id'], intern(obj['id']), number))
+    ids.sort()
+
+    sections = [
+        struct.pack(f"<{len(string_offsets)}I", *string_offsets) + bytes(blob),
+        struct.pack(f"<{len(record_offsets)}I", *record_offsets) + bytes(records),
+        b"".join(_PAIR.pack(ref, number) for _, ref, number in ids),
+    ]
+    header = {'version': STORE_VERSION, 'fields': names, 'kinds': kinds, 'records': len(objectives),
+              'strings': len(string_offsets) - 1, 'ids': len(ids),
+              'sections': [0, len(sections[0]), len(sections[0]) + len(sections[1])]}
+    encoded = json.dumps(header).encode('utf-8')
+
+    partial = path.with_name(path.name + ".partial")
+    with open(partial, 'wb') as f:
+        f.write(MAGIC + _U32.pack(len(encoded)) + encoded)
+        for section in sections:
+            f.write(section)
+    os.replace(partial, path)
+    return len(objectives)
+
+
+class ObjectiveStore:
+    """
+    Read-only view of a store file. Indexing returns objective dicts decoded on demand;
+    fields= restricts decoding to the named fields, which is what makes scans cheap.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self._file = open(self.path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(f"{self.path} is not an objective store")
+        (length,) = _U32.unpack_from(self._map, len(MAGIC))
+        start = len(MAGIC) + _U32.size
+        self.header = json.loads(self._map[start:start + length])
+        self.fields = self.header['fields']
+        self.kinds = dict(zip(self.fields, self.header['kinds']))
+        self._plan = list(self.kinds.items())
+        self._strings_at, self._records_at, self._ids_at = (start + length + at for at in self.header['sections'])
+        self._blob_at = self._strings_at + (self.header['strings'] + 1) * _U32.size
+        self._packed_at = self._records_at + (self.header['records'] + 1) * _U32.size
+        self._string_cache = {}
+
+    def __len__(self) -> int:
+        return self.header['records']
+
+    def string(self, ref: int) -> Optional[str]:
+        if ref == NULL_REF:
+            return None
+        text = self._string_cache.get(ref)
+        if text is None:
+            start, end = struct.unpack_from("<II", self._map, self._strings_at + ref * _U32.size)
+            text = self._string_cache[ref] = self._map[self._blob_at + start:self._blob_at + end].decode('utf-8')
+        return text
+
+    def record(self, number: int, fields: Optional[Sequence[str]] = None) -> Dict:
+        if not 0 <= number < len(self):
+            raise IndexError(number)
+        wanted = set(fields) if fields is not None else None
+        data, string = self._map, self.string
+        (pos,) = _U32.unpack_from(data, self._records_at + number * _U32.size)
+        pos += self._packed_at
+        obj = {}
+        for name, kind in self._plan:
+            keep = wanted is None or name in wanted
+            if kind == 's':
+                if keep:
+                    obj[name] = string(_U32.unpack_from(data, pos)[0])
+                pos += 4
+            elif kind == 'i':
+                if keep:
+                    obj[name] = _I64.unpack_from(data, pos)[0]
+                pos += 8
+            elif kind == 'l':
+                (count,) = _U32.unpack_from(data, pos)
+                if keep:
+                    obj[name] = [string(r) for r in struct.unpack_from(f"<{count}I", data, pos + 4)]
+                pos += 4 + count * 4
+            else:
+                if keep:
+                    obj[name] = json.loads(string(_U32.unpack_from(data, pos)[0]))
+                pos += 4
+        return obj
+
+    __getitem__ = record
+
+    def __iter__(self) -> Iterator[Dict]:
+        return self.iter()
+
+    def iter(self, fields: Optional[Sequence[str]] = None) -> Iterator[Dict]:
+        for number in range(len(self)):
+            yield self.record(number, fields)
+
+    def where(self, field: str, value) -> Iterator[Dict]:
+        """Full objectives whose field equals value, decoding only that field for the rest."""
+        for number in range(len(self)):
+            if self.record(number, (field,)).get(field) == value:
+                yield self.record(number)
+
+    def _id_entry(self, position: int) -> tuple:
+        return _PAIR.unpack_from(self._map, self._ids_at + position * _PAIR.size)
+
+    def by_id(self, objective_id: str) -> List[Dict]:
+        """Objectives with this ID (several syllabuses share a prefix), via the sorted ID index."""
+        ids = _SortedIds(self)
+        found = []
+        position = bisect_left(ids, objective_id)
+        while position < len(ids) and ids[position] == objective_id:
+            found.append(self.record(self._id_entry(position)[1]))
+            position += 1
+        return found
+
+    def close(self) -> None:
+        if getattr(self, '_map', None) is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class _SortedIds:
+    """Sequence view of the ID index for bisect; decodes only the probed entries."""
+
+    def __init__(self, store: ObjectiveStore):
+        self.store = store
+
+    def __len__(self) -> int:
+        return self.store.header['ids']
+
+    def __getitem__(self, position: int) -> str:
+        return self.store.string(self.store._id_entry(position)[0])
+
+
+def load_objectives(path: Union[str, Path], fields: Optional[Sequence[str]] = None) -> List[Dict]:
+    """Loader for the generator scripts: every objective as a dict (optionally only some fields)."""
+    with ObjectiveStore(path) as store:
+        return list(store.iter(fields))
@@ -0,0 +1,193 @@
+"""
+Shared Ollama client for the question generators. One keep-alive connection pool per
+host (requests.Session for sync callers, aiohttp.ClientSession for asyncio ones), so
+a batch run pays one TCP handshake per slot rather than one per question.
+build_payload() is the single place request options are shaped: sampling settings
+always go under "options", where /api/generate reads them (top-level fields such as
+"temperature" are ignored by the server). aiohttp is only imported by the async client.
+"""
+
+import os
+import threading
+from typing import Dict, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_HOST = os.getenv('OLLAMA_HOST', 'http://127.0.0.1:11434')
+# Seconds to wait for a generation; per-call overrides keep each tool's old limit
+DEFAULT_TIMEOUT = 120
+CONNECT_TIMEOUT = 5
+# Connections kept open per host; raise to the number of requests a caller keeps in flight
+DEFAULT_POOL_SIZE = 8
+
+
+class OllamaError(Exception):
+    """Ollama answered with an error status or a body that is not a generate response."""
+
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+
+
+class OllamaUnavailable(OllamaError):
+    """No connection to the Ollama server (not running, wrong host, or the connect timed out)."""
+
+
+class OllamaTimeout(OllamaError):
+    """Connected, but the server did not answer within the read timeout (a slow generation)."""
+
+
+def build_payload(model: str, prompt: str, format: Optional[str] = None, temperature: Optional[float] = None,
+                  num_predict: Optional[int] = None, options: Optional[Dict] = None) -> Dict:
+    """Non-streaming /api/generate body; temperature/num_predict are merged into options."""
+    merged = dict(options or {})
+    if temperature is not None:
+        merged['temperature'] = temperature
+    if num_predict is not None:
+        merged['num_predict'] = num_predict
+    payload = {'model': model, 'prompt': prompt, 'stream': False}
+    if format:
+        payload['format'] = format
+    if merged:
+        payload['options'] = merged
+    return payload
+
+
+def _response_text(data) -> str:
+    if not isinstance(data, dict) or 'response' not in data:
+        raise OllamaError(f"unexpected response: {str(data)[:200]}")
+    return data['response']
+
+
+class OllamaClient:
+    """Blocking client over a pooled requests.Session; safe to share between threads."""
+
+    def __init__(self, host: str = DEFAULT_HOST, timeout: float = DEFAULT_TIMEOUT,
+                 pool_size: int = DEFAULT_POOL_SIZE):
+        self.host = host.rstrip('/')
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def _request(self, method: str, path: str, timeout: float, **kwargs):
+        try:
+            response = self.session.request(method, f"{self.host}{path}", timeout=(CONNECT_TIMEOUT, timeout), **kwargs)
+        except requests.ConnectionError as e:
+            # ConnectTimeout is a ConnectionError too; a ReadTimeout is only a Timeout
+            raise OllamaUnavailable(f"unreachable at {self.host}: {e}") from e
+        except requests.Timeout as e:
+            raise OllamaTimeout(f"no response from {self.host} within {timeout}s: {e}") from e
+        except requests.RequestException as e:
+            raise OllamaError(str(e)) from e
+        if response.status_code != 200:
+            raise OllamaError(f"HTTP {response.status_code}: {response.text}", response.status_code)
+        try:
+            return response.json()
+        except ValueError as e:
+            raise OllamaError(f"invalid JSON: {response.text[:200]}") from e
+
+    def generate(self, model: str, prompt: str, timeout: Optional[float] = None, **options) -> str:
+        """The generated text; options are build_payload's (format, temperature, num_predict, options)."""
+        data = self._request('POST', '/api/generate', timeout or self.timeout, json=build_payload(model, prompt, **options))
+        return _response_text(data)
+
+    def models(self, timeout: float = 5) -> List[str]:
+        return [m['name'] for m in self._request('GET', '/api/tags', timeout).get('models', [])]
+
+    def available(self, timeout: float = 2) -> bool:
+        try:
+            self._request('GET', '/api/tags', timeout)
+            return True
+        except OllamaError:
+            return False
+
+    def close(self) -> None:
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class AsyncOllamaClient:
+    """asyncio twin of OllamaClient; the aiohttp session is opened on first use inside the running loop."""
+
+    def __init__(self, host: str = DEFAULT_HOST, timeout: float = DEFAULT_TIMEOUT,
+                 pool_size: int = DEFAULT_POOL_SIZE):
+        self.host = host.rstrip('/')
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self._session = None
+
+    def _get_session(self):
+        import aiohttp
+        if self._session is None:
+            self._session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=self.pool_size))
+        return self._session
+
+    async def _request(self, method: str, path: str, timeout: float, **kwargs):
+        import aiohttp
+        client_timeout = aiohttp.ClientTimeout(total=timeout, connect=CONNECT_TIMEOUT)
+        try:
+            async with self._get_session().request(method, f"{self.host}{path}", timeout=client_timeout,
+                                                   **kwargs) as response:
+                if response.status != 200:
+                    raise OllamaError(f"HTTP {response.status}: {await response.text()}", response.status)
+                try:
+                    return await response.json(content_type=None)
+                except ValueError as e:
+                    raise OllamaError("invalid JSON") from e
+        except aiohttp.ConnectionTimeoutError as e:
+            raise OllamaUnavailable(f"unreachable at {self.host}: {e!r}") from e
+        except TimeoutError as e:
+            # The total timeout, or a read timeout (ServerTimeoutError is a TimeoutError too)
+            raise OllamaTimeout(f"no response from {self.host} within {timeout}s: {e!r}") from e
+        except aiohttp.ClientConnectionError as e:
+            raise OllamaUnavailable(f"unreachable at {self.host}: {e!r}") from e
+        except aiohttp.ClientError as e:
+            raise OllamaError(repr(e)) from e
+
+    async def generate(self, model: str, prompt: str, timeout: Optional[float] = None, **options) -> str:
+        data = await self._request('POST', '/api/generate', timeout or self.timeout,
+                                   json=build_payload(model, prompt, **options))
+        return _response_text(data)
+
+    async def models(self, timeout: float = 5) -> List[str]:
+        return [m['name'] for m in (await self._request('GET', '/api/tags', timeout)).get('models', [])]
+
+    async def available(self, timeout: float = 2) -> bool:
+        try:
+            await self._request('GET', '/api/tags', timeout)
+            return True
+        except OllamaError:
+            return False
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+
+_shared: Dict[tuple, OllamaClient] = {}
+_shared_lock = threading.Lock()
+
+
+def shared_client(host: str = DEFAULT_HOST, pool_size: int = DEFAULT_POOL_SIZE) -> OllamaClient:
+    """Process-wide OllamaClient per host, for module-level helpers called once per question."""
+    key = (host.rstrip('/'), pool_size)
+    with _shared_lock:
+        client = _shared.get(key)
+        if client is None:
+            client = _shared[key] = OllamaClient(host, pool_size=pool_size)
+        return client
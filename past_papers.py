@@ -0,0 +1,370 @@
+"""
+CSEC past-paper ingestion: pull numbered multiple-choice items (stem + options A-D)
+out of past-paper PDFs into per-paper JSONs. With --load-db, items whose answer is
+known from the paper's answer key are loaded into data/questions.db in the same schema
+generate_questions.py writes, so real exam items sit next to the generated ones.
+
+Built on the syllabus parser's machinery: one process-pool job per paper, the raw
+page cache (pdfplumber runs once per page) and a content-hash manifest so unchanged
+papers are skipped. Scanned papers without a text layer are reported, not guessed at.
+"""
+
+import json
+import logging
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pdfplumber
+from tqdm import tqdm
+
+from generate_questions import DB_PATH, init_db
+from main import ParseManifest, RawPageCache, file_sha256
+
+# Bump whenever the extracted questions change so the manifest re-parses every paper
+PAST_PAPER_VERSION = "1.0"
+
+# A page counts as two-column when almost no words straddle the centre line
+COLUMN_STRADDLE_RATIO = 0.03
+
+OPTION_LETTERS = "ABCD"
+
+# An option longer than this swallowed the next item (a marker OCR could not read)
+MAX_OPTION_CHARS = 250
+
+# Option markers as printed, plus the OCR misreads seen in scanned papers: (8) for (B),
+# (1}) for (B), lc) for (C), ( D ) with padding. Lowercase (a)-(d) are sub-parts, not options.
+OPTION_MARKERS = {
+    'A': r'A|4', 'B': r'B|8|1\}|13', 'C': r'C|c|G', 'D': r'D|0|O'
+}
+OPTION_PATTERN = re.compile(
+    r'^[\(\[\{lI1]?\s*(' + '|'.join(f'(?P<{k}>{v})' for k, v in OPTION_MARKERS.items()) + r")\s*[`'\u2019]?\s*[\)\]\}]\s*(?P<text>.*)$"
+)
+# "I." / "l." is how OCR tends to read item 1
+STEM_PATTERN = re.compile(r'^(\d{1,2}|[Il])\s*[\.\)]\s+(.+)$')
+SHARED_STIMULUS_PATTERN = re.compile(r'^Items?\s+(\d{1,2})(?:\s+\S{1,5}\s+|\s*[-–]\s*)(\d{1,2})\b', re.IGNORECASE)
+ANSWER_KEY_HEADING = re.compile(r'\b(ANSWER\s+KEY|KEY\s+TO\s+ITEMS|MARK\s+SCHEME)\b', re.IGNORECASE)
+ANSWER_KEY_ENTRY = re.compile(r'\b(\d{1,2})\s*[\.\)\-:]?\s*([A-D])\b')
+NOISE_PATTERN = re.compile(
+    r'^(-\s*\d+\s*-|GO\s+\S+\s+TO\s+.*PAGE|END\s+OF\s+TEST|\d{6,}.*CSEC.*|PAGE\s+\d+|'
+    r'TEST\s+CODE.*|FORM\s+TP.*|DO\s+NOT\s+TURN.*|CamScanner)$',
+    re.IGNORECASE
+)
+
+
+class PastPaperParser:
+    """Parallel MCQ extractor for a folder of past papers (one sub-folder per subject)."""
+
+    def __init__(self, output_dir: str = "syllabuses/past_papers", num_workers: Optional[int] = None,
+                 cache_dir: Optional[str] = None, use_cache: bool = True):
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(exist_ok=True, parents=True)
+        self.num_workers = num_workers or os.cpu_count()
+        self.logger = logging.getLogger(__name__)
+        self.use_cache = use_cache
+        self.raw_cache = RawPageCache(
+            Path(cache_dir) if cache_dir else self.output_dir / ".cache" / "raw",
+            {'past_papers': PAST_PAPER_VERSION, 'column_straddle_ratio': COLUMN_STRADDLE_RATIO}
+        )
+        self.manifest = ParseManifest(self.output_dir / "manifest.json", {'past_paper_version': PAST_PAPER_VERSION})
+
+    # -- raw extraction -------------------------------------------------------
+
+    @staticmethod
+    def extract_raw_page(page) -> Dict:
+        """Column texts in reading order; image-only pages come back with no columns."""
+        words = page.extract_words()
+        if not words:
+            return {'columns': [], 'image_only': bool(page.images)}
+        middle = page.width / 2
+        straddling = sum(1 for w in words if w['x0'] < middle < w['x1'])
+        both_sides = any(w['x1'] <= middle for w in words) and any(w['x0'] >= middle for w in words)
+        if both_sides and straddling / len(words) < COLUMN_STRADDLE_RATIO:
+            halves = [page.crop((0, 0, middle, page.height)), page.crop((middle, 0, page.width, page.height))]
+            columns = [half.extract_text() or "" for half in halves]
+        else:
+            columns = [page.extract_text() or ""]
+        return {'columns': columns, 'image_only': False}
+
+    def raw_pages(self, pdf_path: Path, pdf_hash: str) -> List[Dict]:
+        doc_dir = None
+        if self.use_cache:
+            self.raw_cache.evict_stale(pdf_path, pdf_hash)
+            doc_dir = self.raw_cache.document_dir(pdf_path, pdf_hash)
+            page_count = self.raw_cache.get_page_count(doc_dir)
+            if page_count is not None:
+                cached = [self.raw_cache.get_page(doc_dir, n) for n in range(1, page_count + 1)]
+                if all(raw is not None for raw in cached):
+                    return cached
+        raws = []
+        with pdfplumber.open(pdf_path) as pdf:
+            for page_num, page in enumerate(pdf.pages, 1):
+                try:
+                    raw = self.extract_raw_page(page)
+                finally:
+                    page.close()
+                if doc_dir:
+                    self.raw_cache.put_page(doc_dir, page_num, raw)
+                raws.append(raw)
+        if doc_dir:
+            self.raw_cache.put_page_count(doc_dir, len(raws))
+        return raws
+
+    # -- MCQ parsing -----------------------------------------------------------
+
+    @staticmethod
+    def _option(line: str, expected: str) -> Optional[str]:
+        """Text of an option line if its marker reads as the expected letter."""
+        match = OPTION_PATTERN.match(line)
+        if match and match.group(expected):
+            return match.group('text').strip()
+        return None
+
+    @staticmethod
+    def parse_answer_key(raws: List[Dict]) -> Dict[int, int]:
+        """Item number -> option index from an answer-key page, if the paper has one."""
+        key = {}
+        for raw in raws:
+            text = "\n".join(raw['columns'])
+            if ANSWER_KEY_HEADING.search(text):
+                for number, letter in ANSWER_KEY_ENTRY.findall(text):
+                    key.setdefault(int(number), OPTION_LETTERS.index(letter))
+        return key
+
+    def parse_items(self, raws: List[Dict]) -> List[Dict]:
+        """
+        Walk column text in reading order and keep items that have a stem and all four
+        options. OCR often drops an item number; a capitalised line straight after an
+        option D starts the next item, which takes the next number in sequence. Text
+        collected without a number in front of a numbered stem becomes its stimulus
+        ("Items 4 and 5 refer to ..." applies to the whole range).
+        """
+        items = []
+        shared = {}
+        current = None
+        last_number = 0
+
+        def complete(item) -> bool:
+            return item is not None and len(item['options']) == len(OPTION_LETTERS)
+
+        def finish():
+            nonlocal current, last_number
+            if complete(current) and max(len(o) for o in current['options']) <= MAX_OPTION_CHARS:
+                if current['number'] is None:
+                    current['number'] = last_number + 1
+                last_number = current['number']
+                current['stimulus'] = current['stimulus'] or shared.get(last_number, "")
+                items.append(current)
+            current = None
+
+        def start(number: Optional[int], text: str, page_num: int, stimulus: str = ""):
+            nonlocal current
+            finish()
+            current = {'number': number, 'stem': text, 'options': [], 'page': page_num, 'stimulus': stimulus}
+
+        for page_num, raw in enumerate(raws, 1):
+            for column in raw['columns']:
+                for line in (l.strip() for l in column.splitlines()):
+                    if not line or NOISE_PATTERN.match(line):
+                        continue
+                    if current and not complete(current):
+                        option = self._option(line, OPTION_LETTERS[len(current['options'])])
+                        if option is not None:
+                            current['options'].append(option)
+                            continue
+                    stem = STEM_PATTERN.match(line)
+                    number = (int(stem.group(1)) if stem.group(1).isdigit() else 1) if stem else None
+                    if stem and number > last_number:
+                        stimulus = ""
+                        if current and current['number'] is None and not current['options']:
+                            stimulus = current['stem']
+                            shared_range = SHARED_STIMULUS_PATTERN.match(stimulus)
+                            if shared_range:
+                                for shared_number in range(int(shared_range.group(1)), int(shared_range.group(2)) + 1):
+                                    shared[shared_number] = stimulus
+                            current = None
+                        start(number, stem.group(2), page_num, stimulus)
+                    elif current is None:
+                        start(None, line, page_num)
+                    elif complete(current):
+                        if line[0].islower():
+                            current['options'][-1] += " " + line  # option D wraps
+                        else:
+                            start(None, line, page_num)
+                    elif current['options']:
+                        current['options'][-1] += " " + line
+                    else:
+                        current['stem'] += " " + line
+        finish()
+        return items
+
+    # -- per-paper job ---------------------------------------------------------
+
+    def output_file(self, pdf_path: Path) -> Path:
+        return self.output_dir / f"{pdf_path.parent.name}-{pdf_path.stem}.json"
+
+    def parse_paper(self, pdf_path: Path, pdf_hash: str, force: bool = False) -> Dict:
+        output_file = self.output_file(pdf_path)
+        base = {'filename': pdf_path.name, 'source': str(pdf_path), 'subject': pdf_path.parent.name,
+                'hash': pdf_hash, 'output_file': str(output_file)}
+        entry = None if force else self.manifest.lookup(pdf_hash)
+        # lookup() has checked the recorded output, which is another paper's when the bytes were
+        # seen under another name; entries from before image_only_pages was recorded are re-parsed
+        if entry and 'image_only_pages' in entry:
+            return {**base, 'output_file': str(self.output_dir / entry['output_file']), 'count': entry['count'],
+                    'pages': entry['pages'], 'image_only_pages': entry['image_only_pages'],
+                    'success': True, 'skipped': True}
+
+        started = time.perf_counter()
+        try:
+            raws = self.raw_pages(pdf_path, pdf_hash)
+            items = self.parse_items(raws)
+            answer_key = self.parse_answer_key(raws)
+            for item in items:
+                item['correctAnswer'] = answer_key.get(item['number'])
+            paper = {
+                'source_file': pdf_path.name,
+                'subject': pdf_path.parent.name,
+                'pages': len(raws),
+                'image_only_pages': sum(1 for raw in raws if not raw['columns']),
+                'has_answer_key': bool(answer_key),
+                'items': items,
+                'extraction_date': datetime.now().isoformat()
+            }
+            with open(output_file, 'w', encoding='utf-8') as f:
+                json.dump(paper, f, indent=2, ensure_ascii=False)
+            return {**base, 'count': len(items), 'pages': len(raws), 'image_only_pages': paper['image_only_pages'],
+                    'output_hash': file_sha256(output_file), 'success': True, 'skipped': False,
+                    'timings': {'elapsed_seconds': round(time.perf_counter() - started, 3)}}
+        except Exception as e:
+            self.logger.error(f"Error processing {pdf_path.name}: {str(e)}")
+            return {**base, 'count': 0, 'pages': 0, 'success': False, 'error': str(e)}
+
+    # -- database --------------------------------------------------------------
+
+    @staticmethod
+    def question_rows(paper: Dict) -> List[tuple]:
+        """
+        Rows for the generate_questions.py questions table (objective_id is unknown for real
+        items). Items without an answer from the paper's answer key are left out.
+        """
+        stem = Path(paper['source_file']).stem
+        rows = []
+        for item in paper['items']:
+            if item.get('correctAnswer') is None:
+                continue
+            question = item['stem'] if not item.get('stimulus') else f"{item['stimulus']}\n\n{item['stem']}"
+            question_json = {
+                'question': question,
+                'options': item['options'],
+                'correctAnswer': item.get('correctAnswer'),
+                'explanation': "",
+                'storyElement': "",
+                'source': {'paper': paper['source_file'], 'item': item['number'], 'page': item['page']}
+            }
+            rows.append((f"PP_{paper['subject']}_{stem}_{item['number']:03d}", paper['subject'], None,
+                         f"{paper['subject']} past paper", 2, 0, json.dumps(question_json, ensure_ascii=False)))
+        return rows
+
+    def load_questions(self, output_files: List[Path], db_path: Path = DB_PATH) -> int:
+        """Insert (or refresh) every answered item in one transaction."""
+        rows = []
+        for output_file in output_files:
+            with open(output_file, 'r', encoding='utf-8') as f:
+                rows.extend(self.question_rows(json.load(f)))
+        conn = init_db(db_path)
+        try:
+            with conn:
+                conn.executemany('''
+                    INSERT OR REPLACE INTO questions (id, subject_id, objective_id, topic, difficulty, variation, question_json)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                ''', rows)
+        finally:
+            conn.close()
+        return len(rows)
+
+    # -- directory run ---------------------------------------------------------
+
+    def process_directory(self, directory: str, force: bool = False, db_path: Optional[Path] = None) -> Dict:
+        """Parse every paper under directory (recursively) in parallel, then load the bank if db_path is given."""
+        papers = sorted(Path(directory).rglob("*.pdf"), key=lambda p: p.stat().st_size, reverse=True)
+        if not papers:
+            self.logger.warning(f"No past papers found in '{directory}'")
+            return {}
+
+        self.logger.info(f"Scanning {len(papers)} past papers in {directory}...")
+        started = time.perf_counter()
+        results = {}
+        with ProcessPoolExecutor(max_workers=self.num_workers) as executor:
+            futures = {executor.submit(self.parse_paper, pdf, file_sha256(pdf), force): pdf for pdf in papers}
+            with tqdm(total=len(futures), desc="Parsing Past Papers") as pbar:
+                for future in as_completed(futures):
+                    result = future.result()
+                    results[result['source']] = result
+                    if result['success'] and not result['skipped']:
+                        self.manifest.record(result['hash'], result)
+                        self.manifest.documents[result['hash']]['image_only_pages'] = result['image_only_pages']
+                        self.manifest.save()
+                    pbar.update(1)
+        self.manifest.save()
+
+        # Copies of one paper share its output, so load each output once
+        output_files = sorted({Path(r['output_file']) for r in results.values() if r['success']})
+        loaded = self.load_questions(output_files, db_path) if db_path else 0
+        elapsed = time.perf_counter() - started
+
+        summary = {
+            'stats': {
+                'total_papers': len(papers),
+                'processed': sum(1 for r in results.values() if r['success'] and not r['skipped']),
+                'skipped': sum(1 for r in results.values() if r.get('skipped')),
+                'failed': sum(1 for r in results.values() if not r['success']),
+                'image_only_pages': sum(r.get('image_only_pages', 0) for r in results.values()),
+                'questions': sum(r['count'] for r in results.values()),
+                'loaded_into_db': loaded
+            },
+            'elapsed_seconds': round(elapsed, 3),
+            'papers': {Path(src).parent.name + "/" + Path(src).name: {k: r.get(k) for k in
+                       ('count', 'pages', 'image_only_pages', 'skipped', 'error') if r.get(k) is not None}
+                       for src, r in sorted(results.items())},
+            'timestamp': datetime.now().isoformat()
+        }
+        with open(self.output_dir / "processing_summary.json", 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2)
+
+        self.logger.info(f"Done! Extracted {summary['stats']['questions']} questions from {len(papers)} papers "
+                         + (f"({loaded} with answers loaded into {db_path}) " if db_path else "")
+                         + f"in {elapsed:.1f}s.")
+        if summary['stats']['image_only_pages']:
+            self.logger.warning(f"{summary['stats']['image_only_pages']} pages have no text layer (scans); "
+                                f"run them through OCR first to ingest their items.")
+        return summary
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="CSEC past-paper MCQ ingestion")
+    parser.add_argument("--input", type=str, default="scripts/Syllabuses/Csec PastPapers",
+                        help="Directory of past papers (one sub-folder per subject)")
+    parser.add_argument("--output", type=str, default="syllabuses/past_papers", help="Output directory for per-paper JSONs")
+    parser.add_argument("--workers", type=int, default=None, help="Number of parallel workers")
+    parser.add_argument("--force", action="store_true", help="Force re-processing of all papers")
+    parser.add_argument("--cache-dir", type=str, default=None,
+                        help="Raw page extraction cache (default: <output>/.cache/raw)")
+    parser.add_argument("--no-cache", action="store_true", help="Always re-run pdfplumber instead of using the raw page cache")
+    parser.add_argument("--load-db", action="store_true",
+                        help="Also load items with a known answer into the question bank (default: JSONs only)")
+    parser.add_argument("--db", type=str, default=str(DB_PATH), help="Question bank to load into with --load-db")
+
+    args = parser.parse_args()
+
+    PastPaperParser(
+        output_dir=args.output,
+        num_workers=args.workers,
+        cache_dir=args.cache_dir,
+        use_cache=not args.no_cache
+    ).process_directory(args.input, force=args.force, db_path=Path(args.db) if args.load_db else None)
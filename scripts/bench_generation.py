@@ -0,0 +1,141 @@
+"""
+Questions/min of generate_questions.py at several concurrency levels.
+
+By default runs against a stand-in Ollama server started in-process: it serves
+/api/generate with a fixed latency and only --slots requests at a time, like
+`ollama serve` with OLLAMA_NUM_PARALLEL=slots. Pass --host to measure a real
+server instead (the model is generate_questions.MODEL). Level 1 is the sequential
+requests path; higher levels use the asyncio engine. Each level writes to its own
+temporary SQLite database.
+
+Usage (from the repo root):
+    python scripts/bench_generation.py                              # stand-in, 4 slots
+    python scripts/bench_generation.py --levels 1,2,4,8 --slots 8 --latency 1.0
+    python scripts/bench_generation.py --host http://127.0.0.1:11434 --questions 24
+"""
+
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import tempfile
+import threading
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import generate_questions as gq  # noqa: E402
+
+QUESTION = {"question": "Which organelle releases energy from food?",
+            "options": ["Nucleus", "Mitochondrion", "Ribosome", "Vacuole"],
+            "correctAnswer": 1, "explanation": "Aerobic respiration happens in the mitochondria.",
+            "storyElement": "Spot on!"}
+
+
+class StandInOllama:
+    """A /api/generate that answers after `latency` seconds, `slots` requests at a time."""
+
+    def __init__(self, slots: int, latency: float):
+        self.slots = slots
+        self.latency = latency
+        self.requests = 0
+        self.connections = set()
+        self.port = None
+        self._ready = threading.Event()
+
+    async def generate(self, request):
+        from aiohttp import web
+        await request.json()
+        self.requests += 1
+        self.connections.add(request.transport.get_extra_info('peername'))
+        async with self._slots:
+            await asyncio.sleep(self.latency * random.uniform(0.9, 1.1))
+        return web.json_response({'response': json.dumps(QUESTION), 'done': True})
+
+    async def _serve(self):
+        from aiohttp import web
+        self._slots = asyncio.Semaphore(self.slots)
+        app = web.Application()
+        app.router.add_post('/api/generate', self.generate)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+        self._ready.set()
+        await asyncio.Event().wait()
+
+    def start(self) -> str:
+        threading.Thread(target=lambda: asyncio.run(self._serve()), daemon=True).start()
+        self._ready.wait()
+        return f"http://127.0.0.1:{self.port}"
+
+
+def synthetic_jobs(count: int) -> list:
+    objs = [{'id': f"BIO-{i:03d}", 'objective': f"describe the structure of cell type {i}",
+             'content': "organelles and their functions", 'difficulty': 1 + i % 3} for i in range(count)]
+    return [(obj, 'Biology', 0) for obj in objs]
+
+
+def run_level(level: int, jobs: list, workdir: Path) -> int:
+    conn = gq.init_db(workdir / f"questions-{level}.db")
+    try:
+        if level == 1:
+            cursor = conn.cursor()
+            saved = 0
+            for obj, subject, variation in jobs:
+                response = gq.call_ollama(gq.generate_prompt(obj, subject, variation))
+                if response and gq.save_question(cursor, obj, subject, variation, response):
+                    conn.commit()
+                    saved += 1
+            return saved
+        return sum(asyncio.run(gq.generate_concurrently(conn, jobs, level)).values())
+    finally:
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Questions/min of generate_questions.py by concurrency level.")
+    parser.add_argument("--levels", type=str, default="1,2,4,8,16", help="Comma-separated concurrency levels")
+    parser.add_argument("--questions", type=int, default=48, help="Questions generated per level")
+    parser.add_argument("--host", type=str, default=None, help="Real Ollama server (default: in-process stand-in)")
+    parser.add_argument("--slots", type=int, default=4, help="Stand-in server: requests served in parallel")
+    parser.add_argument("--latency", type=float, default=0.5, help="Stand-in server: seconds per request")
+    args = parser.parse_args()
+
+    stand_in = None
+    if args.host:
+        gq.OLLAMA_HOST = args.host
+    else:
+        stand_in = StandInOllama(args.slots, args.latency)
+        gq.OLLAMA_HOST = stand_in.start()
+        print(f"[*] Stand-in Ollama at {gq.OLLAMA_HOST}: {args.slots} slots, {args.latency}s per request")
+
+    workdir = Path(tempfile.mkdtemp(prefix="bench-gen-"))
+    jobs = synthetic_jobs(args.questions)
+    # Keep the per-question progress lines out of the table
+    real_print, gq.print = print, lambda *a, **k: None
+    rows = []
+    for level in [int(x) for x in args.levels.split(',')]:
+        before = (stand_in.requests, len(stand_in.connections)) if stand_in else None
+        started = time.perf_counter()
+        saved = run_level(level, jobs, workdir)
+        elapsed = time.perf_counter() - started
+        row = {'level': level, 'saved': saved, 'seconds': elapsed, 'per_min': saved * 60 / elapsed}
+        if stand_in:
+            row['connections'] = len(stand_in.connections) - before[1]
+        rows.append(row)
+
+    real_print(f"{'concurrency':>11}{'saved':>7}{'seconds':>9}{'q/min':>9}{'speedup':>9}"
+               + (f"{'conns':>7}" if stand_in else ""))
+    for row in rows:
+        real_print(f"{row['level']:>11}{row['saved']:>7}{row['seconds']:>9.2f}{row['per_min']:>9.1f}"
+                   f"{row['per_min'] / rows[0]['per_min']:>8.2f}x"
+                   + (f"{row['connections']:>7}" if stand_in else ""))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Load-time and RSS benchmark: combined_syllabuses.json vs. the objective store.
+
+Builds NDJSON and .objs copies of a combined JSON file (optionally replicated with
+--scale to stand in for a larger corpus), then times the access patterns the
+generator scripts use: load everything, scan a few fields, look up objectives by ID.
+Each case runs in a fresh interpreter so peak RSS is per case; 'baseline/noop' is
+the interpreter floor.
+
+Usage (from the repo root):
+    python scripts/bench_objective_store.py --combined syllabuses/output/combined_syllabuses.json
+    python scripts/bench_objective_store.py --combined ... --scale 10 --output results.json
+"""
+
+import sys
+import json
+import time
+import random
+import argparse
+import resource
+import subprocess
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+SCAN_FIELDS = ['id', 'source_file', 'difficulty']
+LOOKUPS = 200
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss survives exec on Linux (it would report the parent's peak from building
+    # the inputs), so prefer this process's own high-water mark
+    try:
+        for line in Path('/proc/self/status').read_text().splitlines():
+            if line.startswith('VmHWM:'):
+                return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    scale = 1024 * 1024 if sys.platform == 'darwin' else 1024  # bytes on macOS, KiB elsewhere
+    return round(own / scale, 1)
+
+
+def build_inputs(combined: Path, workdir: Path, scale: int) -> dict:
+    sys.path.insert(0, str(ROOT))
+    from objective_store import write_store
+
+    objectives = json.loads(combined.read_text(encoding='utf-8'))
+    if scale > 1:
+        objectives = [dict(obj, id=f"{obj.get('id')}-x{copy}") for copy in range(scale) for obj in objectives]
+    paths = {'json': workdir / "combined.json", 'ndjson': workdir / "combined.ndjson", 'store': workdir / "combined.objs"}
+    paths['json'].write_text(json.dumps(objectives, indent=2, ensure_ascii=False), encoding='utf-8')
+    with open(paths['ndjson'], 'w', encoding='utf-8') as f:
+        for obj in objectives:
+            f.write(json.dumps(obj, ensure_ascii=False) + "\n")
+    write_store(paths['store'], objectives)
+    ids = random.Random(7).sample([obj['id'] for obj in objectives], min(LOOKUPS, len(objectives)))
+    return {'paths': {k: str(v) for k, v in paths.items()}, 'ids': ids, 'objectives': len(objectives),
+            'sizes': {k: v.stat().st_size for k, v in paths.items()}}
+
+
+def run_case(case: dict) -> dict:
+    """Executed in a fresh interpreter (see --run-case)."""
+    sys.path.insert(0, str(ROOT))
+    from objective_store import ObjectiveStore, load_objectives
+
+    paths, ids, kind = case['paths'], case['ids'], case['name']
+    started = time.perf_counter()
+    touched = 0
+    if kind == 'baseline/noop':
+        pass
+    elif kind.startswith('json/'):
+        with open(paths['json'], 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if kind == 'json/lookup':
+            by_id = {obj['id']: obj for obj in data}
+            touched = sum(1 for i in ids if i in by_id)
+        elif kind == 'json/scan_fields':
+            touched = len([{k: obj.get(k) for k in SCAN_FIELDS} for obj in data])
+        else:
+            touched = len(data)
+    elif kind == 'ndjson/scan_fields':
+        with open(paths['ndjson'], 'r', encoding='utf-8') as f:
+            touched = len([{k: obj.get(k) for k in SCAN_FIELDS} for obj in map(json.loads, f)])
+    elif kind == 'store/load_all':
+        touched = len(load_objectives(paths['store']))
+    else:
+        with ObjectiveStore(paths['store']) as store:
+            if kind == 'store/lookup':
+                touched = sum(len(store.by_id(i)) for i in ids)
+            elif kind == 'store/scan_fields':
+                touched = len(list(store.iter(SCAN_FIELDS)))
+            else:
+                touched = len(store)
+    elapsed = time.perf_counter() - started
+    return {'ms': round(elapsed * 1000, 2), 'touched': touched, 'peak_rss_mb': _peak_rss_mb()}
+
+
+CASES = ['baseline/noop', 'json/load_all', 'json/scan_fields', 'json/lookup', 'ndjson/scan_fields',
+         'store/open', 'store/lookup', 'store/scan_fields', 'store/load_all']
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the objective store against the combined JSON.")
+    parser.add_argument("--combined", type=str, default="syllabuses/output/combined_syllabuses.json",
+                        help="Combined JSON produced by main.py")
+    parser.add_argument("--scale", type=int, default=1, help="Replicate the objectives this many times")
+    parser.add_argument("--workdir", type=str, default=None, help="Where to write the inputs (default: temp dir)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per case; the fastest is reported")
+    parser.add_argument("--output", type=str, default=None, help="Also write results JSON here")
+    parser.add_argument("--run-case", type=str, default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_case:
+        print(json.dumps(run_case(json.loads(args.run_case))))
+        return
+
+    workdir = Path(args.workdir) if args.workdir else Path(tempfile.mkdtemp(prefix="bench-store-"))
+    workdir.mkdir(parents=True, exist_ok=True)
+    inputs = build_inputs(Path(args.combined), workdir, args.scale)
+    print(f"[*] {inputs['objectives']} objectives; sizes: "
+          + ", ".join(f"{k} {v / 1024:.0f} KiB" for k, v in inputs['sizes'].items()))
+
+    results = {}
+    for name in CASES:
+        runs = []
+        for _ in range(args.repeat):
+            case = {'name': name, 'paths': inputs['paths'], 'ids': inputs['ids']}
+            proc = subprocess.run([sys.executable, __file__, "--run-case", json.dumps(case)],
+                                  capture_output=True, text=True)
+            if proc.returncode != 0:
+                print(f"  [!] {name} failed:\n{proc.stderr[-2000:]}")
+                break
+            runs.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+        if not runs:
+            continue
+        results[name] = min(runs, key=lambda r: r['ms'])
+        r = results[name]
+        print(f"  {name:<22} {r['ms']:>10.2f} ms  {r['peak_rss_mb']:>7} MB  ({r['touched']} touched)")
+
+    if args.output:
+        report = {'cases': results, 'objectives': inputs['objectives'], 'sizes': inputs['sizes'],
+                  'python': sys.version.split()[0], 'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S')}
+        Path(args.output).write_text(json.dumps(report, indent=2), encoding='utf-8')
+
+
+if __name__ == "__main__":
+    main()
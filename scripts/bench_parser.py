@@ -0,0 +1,304 @@
+"""
+Throughput benchmark for EnhancedCXCSyllabusParser on synthetic syllabus PDFs.
+
+Generates deterministic CXC-style PDFs (ruled objective/content tables, text-column
+pages, bullets, SECTION/TOPIC headers, CXC header/footer bands) with a tiny built-in
+PDF writer, then times parse_single_pdf and process_directory across worker counts.
+Each case runs in a fresh interpreter so peak RSS is per case.
+
+Usage (from the repo root):
+    python scripts/bench_parser.py                       # run and print
+    python scripts/bench_parser.py --save-baseline       # store results as the baseline
+    python scripts/bench_parser.py --compare             # diff against the stored baseline
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import logging
+import argparse
+import resource
+import subprocess
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "bench_parser_baseline.json"
+SIZES = {'small': 12, 'medium': 48, 'large': 160}
+CORPUS = [('small', 0), ('small', 1), ('medium', 0), ('medium', 1), ('large', 0)]
+
+PAGE_W, PAGE_H = 612, 792
+VERBS = ['explain', 'describe', 'list', 'state', 'define', 'discuss', 'identify', 'analyse',
+         'evaluate', 'calculate', 'interpret', 'demonstrate', 'compare', 'outline']
+NOUNS = ['photosynthesis', 'the water cycle', 'market structures', 'soil fertility', 'trade unions',
+         'cell division', 'the circulatory system', 'colonial economies', 'budget deficits',
+         'climate zones', 'population growth', 'data storage', 'network topologies', 'enzymes',
+         'sources of finance', 'plate tectonics', 'consumer protection', 'rhythm and metre']
+QUALIFIERS = ['in the Caribbean', 'in a small business', 'using examples', 'and its importance',
+              'with reference to CARICOM', 'in everyday life', 'using simple diagrams']
+TOPICS = ['CELL BIOLOGY', 'ECOLOGY', 'PRODUCTION', 'MARKETING', 'MAP READING', 'PROGRAMMING',
+          'FINANCE', 'GOVERNMENT', 'HEALTH AND DISEASE', 'WEATHER AND CLIMATE']
+
+
+# --- Synthetic PDF generation ---
+
+def _pdf_string(text: str) -> str:
+    return '(' + text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)') + ')'
+
+
+def _wrap(text: str, width: int) -> list:
+    lines, line = [], ''
+    for word in text.split():
+        if line and len(line) + 1 + len(word) > width:
+            lines.append(line)
+            line = word
+        else:
+            line = f"{line} {word}".strip()
+    return lines + ([line] if line else [])
+
+
+class SyntheticPage:
+    def __init__(self):
+        self.ops = []
+
+    def text(self, x: float, y: float, s: str, size: int = 9) -> None:
+        self.ops.append(f"BT /F1 {size} Tf {x:.1f} {y:.1f} Td {_pdf_string(s)} Tj ET")
+
+    def line(self, x1: float, y1: float, x2: float, y2: float) -> None:
+        self.ops.append(f"0.5 w {x1:.1f} {y1:.1f} m {x2:.1f} {y2:.1f} l S")
+
+    def content(self) -> bytes:
+        return "\n".join(self.ops).encode('cp1252')
+
+
+def _objective(rng: random.Random) -> tuple:
+    n = rng.randint(1, 12)
+    obj = f"{n}. {rng.choice(VERBS).capitalize()} {rng.choice(NOUNS)} {rng.choice(QUALIFIERS)}"
+    if rng.random() < 0.4:
+        obj += f"; {rng.choice(VERBS)} {rng.choice(NOUNS)}"
+    items = [f"{rng.choice(NOUNS).capitalize()} {rng.choice(QUALIFIERS)}" for _ in range(rng.randint(1, 4))]
+    sep = '; ' if rng.random() < 0.5 else ' \u2022 '
+    content = sep.join(items)
+    if rng.random() < 0.3:
+        content += f" ({rng.choice(['KC', 'AK', 'AS', 'UK'])})"
+    return obj, content
+
+
+def _build_page(rng: random.Random, page_num: int, state: dict) -> SyntheticPage:
+    page = SyntheticPage()
+    page.text(50, PAGE_H - 30, f"CXC 31/G/SYLL {state['syll']}", 8)
+    page.text(PAGE_W - 90, 30, f"Page {page_num}", 8)
+    y = PAGE_H - 60
+    if page_num % 9 == 1:
+        state['section'] += 1
+        page.text(50, y, f"SECTION {state['section']}: {rng.choice(TOPICS)}", 12)
+        y -= 20
+    if page_num % 3 == 1:
+        state['topic'] += 1
+        page.text(50, y, f"TOPIC {state['topic']}: {rng.choice(TOPICS)}", 10)
+        y -= 20
+
+    ruled = page_num % 3 != 0
+    cols = [50, 300, PAGE_W - 50]
+    page.text(cols[0] + 4, y - 12, "SPECIFIC OBJECTIVES", 9)
+    page.text(cols[1] + 4, y - 12, "CONTENT", 9)
+    rows_top = y
+    y -= 18
+    if ruled:
+        page.line(cols[0], rows_top, cols[2], rows_top)
+        page.line(cols[0], y, cols[2], y)
+    while y > 90:
+        obj, content = _objective(rng)
+        left, right = _wrap(obj, 44), _wrap(content, 44)
+        height = 12 * max(len(left), len(right)) + 8
+        if y - height < 60:
+            break
+        for i, ln in enumerate(left):
+            page.text(cols[0] + 4, y - 12 - 12 * i, ln)
+        for i, ln in enumerate(right):
+            page.text(cols[1] + 4, y - 12 - 12 * i, ln)
+        y -= height
+        if ruled:
+            page.line(cols[0], y, cols[2], y)
+    if ruled:
+        for x in cols:
+            page.line(x, rows_top, x, y)
+    return page
+
+
+def write_synthetic_pdf(path: Path, pages: int, seed: int) -> None:
+    """Write a deterministic multi-page syllabus-like PDF using only the standard Helvetica font."""
+    rng = random.Random(seed)
+    state = {'section': 0, 'topic': 0, 'syll': 10 + seed % 20}
+    contents = [_build_page(rng, n, state).content() for n in range(1, pages + 1)]
+
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # page tree, filled in once page object numbers are known
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+    ]
+    kids = []
+    for stream in contents:
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        content_ref = len(objects)
+        objects.append((f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {PAGE_W} {PAGE_H}] "
+                        f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_ref} 0 R >>").encode())
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>".encode()
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for num, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % num + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for off in offsets:
+        out += b"%010d 00000 n \n" % off
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    path.write_bytes(bytes(out))
+
+
+def build_corpus(workdir: Path) -> dict:
+    """Generate (or reuse) the synthetic PDFs; returns {size: path} plus the corpus directory."""
+    corpus_dir = workdir / "corpus"
+    corpus_dir.mkdir(parents=True, exist_ok=True)
+    singles = {}
+    for size, seed in CORPUS:
+        path = corpus_dir / f"CSEC-Synthetic-{size.capitalize()}-{seed}-Syllabus.pdf"
+        if not path.exists():
+            write_synthetic_pdf(path, SIZES[size], seed=seed * 101 + SIZES[size])
+        singles.setdefault(size, path)
+    return {'corpus_dir': corpus_dir, 'singles': singles}
+
+
+# --- Cases ---
+
+def _peak_rss_mb() -> float:
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    scale = 1024 * 1024 if sys.platform == 'darwin' else 1024  # bytes on macOS, KiB elsewhere
+    return round(max(own, children) / scale, 1)
+
+
+def run_case(case: dict) -> dict:
+    """Executed in a fresh interpreter (see --run-case)."""
+    sys.path.insert(0, str(ROOT))
+    from main import EnhancedCXCSyllabusParser
+    logging.getLogger().setLevel(logging.WARNING)
+
+    out_dir = Path(tempfile.mkdtemp(prefix="bench-out-"))
+    try:
+        parser = EnhancedCXCSyllabusParser(output_dir=str(out_dir), num_workers=case.get('workers', 1), use_cache=False)
+        started = time.perf_counter()
+        if case['kind'] == 'single':
+            result = parser.parse_single_pdf(Path(case['pdf']), force=True, return_objectives=False)
+            pages, objectives = result['pages'], result['count']
+        else:
+            summary = parser.process_directory(case['dir'], force=True, pages_per_chunk=case.get('pages_per_chunk', 0),
+                                               lean_ipc=True)
+            pages, objectives = summary['throughput']['pages_parsed'], summary['stats']['total_objectives']
+        elapsed = time.perf_counter() - started
+    finally:
+        shutil.rmtree(out_dir, ignore_errors=True)
+    return {
+        'pages': pages,
+        'objectives': objectives,
+        'seconds': round(elapsed, 3),
+        'pages_per_sec': round(pages / elapsed, 2),
+        'objectives_per_sec': round(objectives / elapsed, 2),
+        'peak_rss_mb': _peak_rss_mb(),
+    }
+
+
+def plan_cases(corpus: dict, workers: list, pages_per_chunk: int) -> dict:
+    cases = {}
+    for size, pdf in corpus['singles'].items():
+        cases[f"single/{size}"] = {'kind': 'single', 'pdf': str(pdf)}
+    for n in workers:
+        cases[f"directory/file/w{n}"] = {'kind': 'directory', 'dir': str(corpus['corpus_dir']), 'workers': n}
+        cases[f"directory/page/w{n}"] = {'kind': 'directory', 'dir': str(corpus['corpus_dir']), 'workers': n,
+                                         'pages_per_chunk': pages_per_chunk}
+    return cases
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> bool:
+    """Print per-case deltas; returns False if any case regressed beyond the tolerance."""
+    ok = True
+    print(f"\n{'case':<24}{'pages/s':>10}{'base':>10}{'delta':>9}{'rss MB':>9}{'base':>8}")
+    for name, res in results.items():
+        base = baseline.get('cases', {}).get(name)
+        if not base:
+            print(f"{name:<24}{res['pages_per_sec']:>10}{'-':>10}{'new':>9}{res['peak_rss_mb']:>9}{'-':>8}")
+            continue
+        delta = (res['pages_per_sec'] - base['pages_per_sec']) / base['pages_per_sec']
+        rss_delta = (res['peak_rss_mb'] - base['peak_rss_mb']) / base['peak_rss_mb']
+        flag = ''
+        if delta < -tolerance or rss_delta > tolerance:
+            flag = '  REGRESSION'
+            ok = False
+        print(f"{name:<24}{res['pages_per_sec']:>10}{base['pages_per_sec']:>10}{delta:>+9.1%}"
+              f"{res['peak_rss_mb']:>9}{base['peak_rss_mb']:>8}{flag}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the syllabus parser on synthetic PDFs.")
+    parser.add_argument("--workdir", type=str, default=None, help="Where to keep generated PDFs (default: temp dir)")
+    parser.add_argument("--workers", type=str, default=None, help="Comma-separated worker counts (default: 1,2,4 up to CPU count)")
+    parser.add_argument("--pages-per-chunk", type=int, default=16, help="Chunk size for the page-mode cases")
+    parser.add_argument("--only", type=str, default=None, help="Run only cases whose name contains this string")
+    parser.add_argument("--baseline", type=str, default=str(DEFAULT_BASELINE), help="Baseline results file")
+    parser.add_argument("--save-baseline", action="store_true", help="Write these results as the new baseline")
+    parser.add_argument("--compare", action="store_true", help="Compare against the baseline; exit 1 on regression")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="Allowed relative slowdown / RSS growth")
+    parser.add_argument("--output", type=str, default=None, help="Also write results JSON here")
+    parser.add_argument("--run-case", type=str, default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_case:
+        print(json.dumps(run_case(json.loads(args.run_case))))
+        return
+
+    cpus = os.cpu_count() or 1
+    workers = [int(w) for w in args.workers.split(',')] if args.workers else sorted({1, min(2, cpus), min(4, cpus)})
+    workdir = Path(args.workdir) if args.workdir else Path(tempfile.mkdtemp(prefix="bench-parser-"))
+    corpus = build_corpus(workdir)
+    cases = plan_cases(corpus, workers, args.pages_per_chunk)
+    if args.only:
+        cases = {k: v for k, v in cases.items() if args.only in k}
+
+    print(f"[*] Synthetic corpus in {corpus['corpus_dir']} ({sum(SIZES[s] for s, _ in CORPUS)} pages)")
+    results = {}
+    for name, case in cases.items():
+        proc = subprocess.run([sys.executable, __file__, "--run-case", json.dumps(case)],
+                              capture_output=True, text=True, cwd=str(workdir))
+        if proc.returncode != 0:
+            print(f"  [!] {name} failed:\n{proc.stderr[-2000:]}")
+            continue
+        results[name] = json.loads(proc.stdout.strip().splitlines()[-1])
+        r = results[name]
+        print(f"  {name:<24} {r['pages']:>4} pages  {r['pages_per_sec']:>8} pages/s  "
+              f"{r['objectives_per_sec']:>9} obj/s  {r['peak_rss_mb']:>7} MB")
+
+    report = {'cases': results, 'cpu_count': cpus, 'python': sys.version.split()[0],
+              'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S')}
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2), encoding='utf-8')
+    if args.save_baseline:
+        Path(args.baseline).write_text(json.dumps(report, indent=2), encoding='utf-8')
+        print(f"[*] Baseline saved to {args.baseline}")
+    if args.compare:
+        baseline_path = Path(args.baseline)
+        if not baseline_path.exists():
+            print(f"[!] No baseline at {baseline_path}; run with --save-baseline first.")
+            sys.exit(2)
+        if not compare(results, json.loads(baseline_path.read_text(encoding='utf-8')), args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Microbenchmark for the table-row post-processing in EnhancedCXCSyllabusParser.
+
+Replays raw pages (text + table cells) from a raw page cache through the current
+RowPostProcessor and through the previous per-row path (kept below as legacy_rows),
+checks the objectives serialize byte-identically and reports rows/sec for each.
+Without --cache-dir the synthetic corpus from bench_parser.py is extracted once.
+
+Usage (from the repo root):
+    python scripts/bench_row_postprocess.py --cache-dir syllabuses/output/.cache/raw
+    python scripts/bench_row_postprocess.py                  # synthetic PDFs
+Exits 1 if the two paths disagree on any page.
+"""
+
+import re
+import sys
+import json
+import time
+import logging
+import argparse
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "scripts"))
+
+from main import EnhancedCXCSyllabusParser, Objective  # noqa: E402
+
+EXTRACTION_DATE = "2026-01-01T00:00:00"
+
+
+def legacy_rows(parser: EnhancedCXCSyllabusParser, tables: list, page_num: int, section: str,
+                subsection: str, source_file: str) -> list:
+    """The per-row loop objectives_from_raw ran before RowPostProcessor."""
+    objectives = []
+    for table in tables:
+        if not table or len(table) < 1: continue
+        for row in table:
+            row_str = " ".join([str(c) for c in row if c])
+            if parser.patterns['noise'].match(row_str) or not row_str: continue
+            if "SPECIFIC OBJECTIVE" in row_str.upper() or "CONTENT" in row_str.upper(): continue
+            cells = [parser.clean_text(c) for c in row if c]
+            if len(cells) < 2: continue
+            obj_text = cells[0]
+            cont_text = cells[1] if len(cells) > 1 else ""
+            if len(obj_text) < 20: continue
+            if re.match(r'^\d+\.?\s*$', obj_text): continue
+            if any(kw in obj_text.upper() for kw in ["ADDRESS", "E-MAIL", "TEL:", "FAX:", "WWW.", "HTTP"]): continue
+            skills = parser.extract_skills(obj_text + " " + cont_text)
+            specific_objs = parser.split_into_items(obj_text)
+            content_items = parser.split_into_items(cont_text)
+            combined_text = f"{obj_text} {cont_text}"
+            objectives.append(Objective(
+                id="", section=section, subsection=subsection, objective=obj_text, content=cont_text,
+                specific_objectives=specific_objs, content_items=content_items, skills=skills,
+                difficulty=parser.estimate_difficulty(obj_text), page_number=page_num,
+                keywords=parser.extract_keywords(combined_text), hash=parser.generate_hash(combined_text),
+                source_file=source_file, extraction_date=EXTRACTION_DATE
+            ))
+    return objectives
+
+
+def load_pages(cache_dir: Path) -> list:
+    """[(source name, page number, raw page)] from every document in a raw page cache."""
+    pages = []
+    for path in sorted(cache_dir.glob("*/*/p[0-9]*.json")):
+        raw = json.loads(path.read_text(encoding='utf-8'))
+        pages.append((path.parent.parent.name + ".pdf", int(path.stem[1:]), raw))
+    return pages
+
+
+def synthetic_pages(workdir: Path) -> list:
+    from bench_parser import build_corpus
+    corpus = build_corpus(workdir)
+    parser = EnhancedCXCSyllabusParser(output_dir=str(workdir / "out"), cache_dir=str(workdir / "raw"),
+                                       build_index=False, emit_store=False)
+    for pdf in sorted(corpus['corpus_dir'].glob("*.pdf")):
+        parser.parse_single_pdf(pdf, force=True, return_objectives=False)
+    return load_pages(workdir / "raw")
+
+
+def time_path(fn, pages: list, repeat: int) -> tuple:
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        out = [fn(name, page_num, raw) for name, page_num, raw in pages]
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return out, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rows/sec of table-row post-processing, new vs legacy path.")
+    parser.add_argument("--cache-dir", type=str, default=None, help="Raw page cache to replay (default: synthetic PDFs)")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per path; the best is reported")
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+
+    workdir = Path(tempfile.mkdtemp(prefix="bench-rows-"))
+    pages = load_pages(Path(args.cache_dir)) if args.cache_dir else synthetic_pages(workdir)
+    syllabus = EnhancedCXCSyllabusParser(output_dir=str(workdir / "out"), build_index=False, emit_store=False)
+    if not pages:
+        print(f"[!] No cached pages under {args.cache_dir or workdir}")
+        sys.exit(2)
+    rows = sum(len(table) for _, _, raw in pages for table in raw['tables'] if table)
+
+    def current(name, page_num, raw):
+        objs, _, _ = syllabus.objectives_from_raw(raw, page_num, "General", "Unknown", name,
+                                                  extraction_date=EXTRACTION_DATE)
+        return objs
+
+    def legacy(name, page_num, raw):
+        section, subsection = syllabus._update_context(raw['text'], "General", "Unknown")
+        return legacy_rows(syllabus, raw['tables'], page_num, section, subsection, name)
+
+    new_out, new_seconds = time_path(current, pages, args.repeat)
+    old_out, old_seconds = time_path(legacy, pages, args.repeat)
+    mismatched = [pages[i][:2] for i, (a, b) in enumerate(zip(new_out, old_out))
+                  if json.dumps([o.to_dict() for o in a], ensure_ascii=False)
+                  != json.dumps([o.to_dict() for o in b], ensure_ascii=False)]
+
+    objectives = sum(len(objs) for objs in new_out)
+    print(f"[*] {len(pages)} pages, {rows} table rows, {objectives} objectives (best of {args.repeat})")
+    print(f"    legacy   {old_seconds:8.3f}s  {rows / old_seconds:>10.0f} rows/s")
+    print(f"    current  {new_seconds:8.3f}s  {rows / new_seconds:>10.0f} rows/s  ({old_seconds / new_seconds:.2f}x)")
+    if mismatched:
+        print(f"[!] Output differs on {len(mismatched)} pages, e.g. {mismatched[:5]}")
+        sys.exit(1)
+    print("[*] Output byte-identical")
+
+
+if __name__ == "__main__":
+    main()
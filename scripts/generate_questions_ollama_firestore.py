@@ -3,10 +3,16 @@ import json
 import time
 import hashlib
 import argparse
-import urllib.request
-import urllib.error
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from objective_store import ObjectiveStore, STORE_SUFFIX
+from objective_links import ObjectiveLinks
+from syllabus_io import find_combined
+from ollama_client import OllamaClient, OllamaError
+
 # Defaults
 DEFAULT_MODEL = "kimi-k2.5:cloud"
 DEFAULT_HOST = "http://127.0.0.1:11434"
@@ -14,6 +20,10 @@ OUTPUT_FILE = "generated_questions.json"
 
 # LIMIT CONCURRENCY TO PREVENT GPU OOM
 CONCURRENCY_LIMIT = int(os.getenv('OLLAMA_CONCURRENCY', '1'))
+# Objectives dispatched ahead of the one being merged, per request slot; bounds the
+# buffered results while one slow objective holds up in-order merging
+LOOKAHEAD_PER_SLOT = 4
+TARGET_PER_OBJECTIVE = 3
 
 def _subject_from_objective(obj: dict) -> str:
     oid = str(obj.get('id') or '')
@@ -42,30 +52,12 @@ def _normalize_text(s: str) -> str:
 def _hash_text(s: str) -> str:
     return hashlib.sha1(_normalize_text(s).encode('utf-8')).hexdigest()
 
-def _ollama_generate(host: str, model: str, prompt: str, temperature: float, timeout_sec: int, num_predict: int) -> str:
-    url = f"{host}/api/generate"
-    payload = {
-        'model': model,
-        'prompt': prompt,
-        'stream': False,
-        'format': 'json',
-        'temperature': temperature,
-        'options': {'num_predict': num_predict},
-    }
-    
-    data = json.dumps(payload).encode('utf-8')
-    req = urllib.request.Request(url, data=data, headers={'Content-Type': 'application/json'})
-    
+def _ollama_generate(client: OllamaClient, model: str, prompt: str, temperature: float, timeout_sec: int, num_predict: int) -> str:
     try:
-        print(f"    -> Requesting {model} at {url}...")
-        with urllib.request.urlopen(req, timeout=timeout_sec) as response:
-            if response.status == 200:
-                result = json.loads(response.read().decode('utf-8'))
-                return result.get('response', '')
-            else:
-                print(f"    [!] Error: Status {response.status}")
-                return ""
-    except Exception as e:
+        print(f"    -> Requesting {model} at {client.host}/api/generate...")
+        return client.generate(model, prompt, timeout=timeout_sec, format='json', temperature=temperature,
+                               num_predict=num_predict)
+    except OllamaError as e:
         print(f"    [!] Error during Ollama generation: {e}")
         return ""
 
@@ -156,6 +148,15 @@ def _iter_objectives(syllabus_dir: Path):
         print(f"[!] Syllabus directory not found: {syllabus_dir}")
         return
 
+    store = find_combined(syllabus_dir)
+    if store.suffix == STORE_SUFFIX:
+        # One mmap'd file instead of parsing every per-subject JSON, while it is no older than the combined output
+        with ObjectiveStore(store) as objectives:
+            for obj in objectives:
+                if obj.get('id'):
+                    yield obj
+        return
+
     for p in sorted(syllabus_dir.glob('*.json')):
         if p.name in {'combined_syllabuses.json', 'processing_summary.json'}: continue
         try:
@@ -178,21 +179,98 @@ def _load_existing_questions(filepath: Path) -> list[dict]:
     except:
         return []
 
+def _reuse_linked(obj: dict, subject: str, links: ObjectiveLinks, by_objective: dict, count: int) -> list[dict]:
+    """Copies of questions already written for objectives linked to this one in other subjects."""
+    obj_id = str(obj.get('id'))
+    reused = []
+    for link in links.linked(obj):
+        for q in by_objective.get((str(link['id']), _subject_from_objective(link)), []):
+            if len(reused) >= count:
+                return reused
+            # IDs repeat across syllabuses sharing a prefix (BIO), so check the objective hash where recorded
+            source_hash = (q.get('metadata') or {}).get('objectiveHash')
+            if source_hash and source_hash != link['hash']:
+                continue
+            reused.append(dict(
+                q,
+                id=f"{obj_id}_{hashlib.md5(q['questionText'].encode()).hexdigest()[:8]}",
+                objectiveId=obj_id,
+                subjectId=subject.lower().replace(" ", "_"),
+                subjectName=subject,
+                tags=(obj.get('keywords') or [])[:10],
+                metadata=dict(q.get('metadata') or {}, objectiveHash=obj.get('hash'), reusedFrom=q.get('id'),
+                              linkSimilarity=link['similarity'],
+                              timestamp=time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime())),
+            ))
+    return reused
+
+def _generate_batch(obj: dict, subject: str, difficulty: int, client: OllamaClient, model: str) -> list[dict]:
+    """One objective's model call; runs on a worker thread and touches no shared state."""
+    prompt = _build_prompt(
+        obj,
+        subject,
+        _difficulty_text(difficulty),
+        TARGET_PER_OBJECTIVE,
+        [],
+        1200,
+        5,
+        150
+    )
+    return _parse_questions_json(_ollama_generate(client, model, prompt, 0.7, 90, 2000))
+
+def _new_questions(obj: dict, subject: str, difficulty: int, parsed_batch: list[dict], existing_hashes: set,
+                   model: str) -> list[dict]:
+    obj_id = str(obj.get('id'))
+    valid_batch = []
+    for q in parsed_batch:
+        h = _hash_text(q['question'])
+        if h in existing_hashes:
+            continue
+        existing_hashes.add(h)
+
+        final_q = {
+            'id': f"{obj_id}_{hashlib.md5(q['question'].encode()).hexdigest()[:8]}",
+            'objectiveId': obj_id,
+            'subjectId': subject.lower().replace(" ", "_"),
+            'subjectName': subject,
+            'topic': q.get('topic') or str(obj.get('objective') or obj_id),
+            'difficulty': difficulty,
+            'difficultyLabel': _difficulty_text(difficulty),
+            'questionText': q['question'],
+            'options': q['options'],
+            'correctAnswer': q['correctAnswer'],
+            'explanation': q['explanation'],
+            'storyElement': q['storyElement'],
+            'tags': (obj.get('keywords') or [])[:10],
+            'metadata': {
+                'generatedBy': f"ollama:{model}",
+                'objectiveHash': obj.get('hash'),
+                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime())
+            }
+        }
+        valid_batch.append(final_q)
+    return valid_batch
+
 def main():
     parser = argparse.ArgumentParser(description="Generate CSEC questions using Ollama (local or cloud).")
     parser.add_argument("--model", type=str, default=DEFAULT_MODEL, help="Ollama model name (e.g., llama3.1, mistral)")
     parser.add_argument("--host", type=str, default=DEFAULT_HOST, help="Ollama host URL (e.g., http://127.0.0.1:11434)")
     parser.add_argument("--output", type=str, default=OUTPUT_FILE, help="Output JSON file path")
-    parser.add_argument("--concurrency", type=int, default=CONCURRENCY_LIMIT, help="Max requests (sequential in this version, kept for compat)")
+    parser.add_argument("--concurrency", type=int, default=CONCURRENCY_LIMIT,
+                        help="Requests in flight; match the server's OLLAMA_NUM_PARALLEL (output order does not depend on it)")
     parser.add_argument("--syllabus-dir", type=str, default="syllabuses/output", help="Directory containing syllabus JSONs")
     parser.add_argument("--force", action="store_true", help="Force regenerate even if output exists (appends)")
+    parser.add_argument("--no-links", action="store_true",
+                        help="Always call the model, even when a linked objective in another subject already has questions")
     
     args = parser.parse_args()
+    concurrency = max(1, args.concurrency)
 
     syllabus_dir = Path(args.syllabus_dir)
     output_path = Path(args.output)
     
-    print(f"[*] Configuration:\n    Model: {args.model}\n    Host: {args.host}\n    Output: {output_path}")
+    print(f"[*] Configuration:\n    Model: {args.model}\n    Host: {args.host}\n    Output: {output_path}\n"
+          f"    Concurrency: {concurrency}")
 
     objectives = list(_iter_objectives(syllabus_dir))
     print(f"[*] Found {len(objectives)} objectives in {syllabus_dir}")
@@ -201,72 +279,80 @@ def main():
     existing_hashes = {_hash_text(q.get('questionText', '')) for q in all_questions}
     print(f"[*] Loaded {len(all_questions)} existing questions.")
 
+    links = ObjectiveLinks() if args.no_links else ObjectiveLinks.load(syllabus_dir)
+    by_objective = {}
+    for q in all_questions:
+        by_objective.setdefault((str(q.get('objectiveId')), q.get('subjectName')), []).append(q)
+    if len(links):
+        print(f"[*] Loaded {len(links)} cross-subject objective links.")
+
     newly_generated_count = 0
-    
-    for idx, obj in enumerate(objectives, start=1):
-        obj_id = str(obj.get('id'))
-        subject = _subject_from_objective(obj)
-        difficulty = int(obj.get('difficulty') or 1)
-        
-        target_per_objective = 3
-        
-        print(f"[{idx}/{len(objectives)}] {obj_id} ({subject}) - Generating...")
-
-        prompt = _build_prompt(
-            obj, 
-            subject, 
-            _difficulty_text(difficulty), 
-            target_per_objective, 
-            [], 
-            1200, 
-            5, 
-            150
-        )
-
-        result_json = _ollama_generate(args.host, args.model, prompt, 0.7, 90, 2000)
-        parsed_batch = _parse_questions_json(result_json)
-        
-        if not parsed_batch:
-            print("    [!] No valid JSON returned.")
-            continue
 
-        valid_batch = []
-        for q in parsed_batch:
-            h = _hash_text(q['question'])
-            if h in existing_hashes:
+    def save() -> None:
+        try:
+            output_path.write_text(json.dumps(all_questions, indent=2), encoding='utf-8')
+        except Exception as e:
+            print(f"    [!] Error saving file: {e}")
+
+    def describe(idx: int) -> tuple:
+        obj = objectives[idx]
+        return obj, str(obj.get('id')), _subject_from_objective(obj), int(obj.get('difficulty') or 1)
+
+    def reusable(obj: dict, obj_id: str, subject: str) -> list[dict]:
+        if by_objective.get((obj_id, subject)):
+            return []
+        return _reuse_linked(obj, subject, links, by_objective, TARGET_PER_OBJECTIVE)
+
+    # Model calls run on `concurrency` threads, dispatched up to a window ahead; results are
+    # merged strictly in objective order on this thread, so existing_hashes/by_objective need
+    # no locks and the output file is the same whatever order the requests finish in
+    window = concurrency * LOOKAHEAD_PER_SLOT
+    futures = {}
+    next_dispatch = 0
+    # One keep-alive connection per request slot, shared by the worker threads
+    with ThreadPoolExecutor(max_workers=concurrency) as pool, OllamaClient(args.host, pool_size=concurrency) as client:
+        def dispatch(idx: int) -> None:
+            obj, obj_id, subject, difficulty = describe(idx)
+            # Skip the request when linked questions will cover it; reuse only grows as results merge
+            if reusable(obj, obj_id, subject):
+                return
+            print(f"[{idx + 1}/{len(objectives)}] {obj_id} ({subject}) - Generating...")
+            futures[idx] = pool.submit(_generate_batch, obj, subject, difficulty, client, args.model)
+
+        for idx in range(len(objectives)):
+            while next_dispatch < len(objectives) and next_dispatch < idx + window:
+                dispatch(next_dispatch)
+                next_dispatch += 1
+
+            obj, obj_id, subject, difficulty = describe(idx)
+            future = futures.pop(idx, None)
+            reused = reusable(obj, obj_id, subject)
+            if reused:
+                if future is not None:
+                    future.cancel()
+                print(f"[{idx + 1}/{len(objectives)}] {obj_id} ({subject}) - Reused {len(reused)} questions "
+                      f"from linked objectives.")
+                all_questions.extend(reused)
+                by_objective[(obj_id, subject)] = reused
+                save()
                 continue
-            existing_hashes.add(h)
-            
-            final_q = {
-                'id': f"{obj_id}_{hashlib.md5(q['question'].encode()).hexdigest()[:8]}",
-                'objectiveId': obj_id,
-                'subjectId': subject.lower().replace(" ", "_"),
-                'subjectName': subject,
-                'topic': q.get('topic') or str(obj.get('objective') or obj_id),
-                'difficulty': difficulty,
-                'difficultyLabel': _difficulty_text(difficulty),
-                'questionText': q['question'],
-                'options': q['options'],
-                'correctAnswer': q['correctAnswer'],
-                'explanation': q['explanation'],
-                'storyElement': q['storyElement'],
-                'tags': (obj.get('keywords') or [])[:10],
-                'metadata': {
-                    'generatedBy': f"ollama:{args.model}",
-                    'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime())
-                }
-            }
-            valid_batch.append(final_q)
-
-        if valid_batch:
-            print(f"    [+] Added {len(valid_batch)} questions.")
-            all_questions.extend(valid_batch)
-            newly_generated_count += len(valid_batch)
-            
-            try:
-                output_path.write_text(json.dumps(all_questions, indent=2), encoding='utf-8')
-            except Exception as e:
-                print(f"    [!] Error saving file: {e}")
+            if future is None:
+                # Looked reusable at dispatch, but an earlier merge gave this objective questions of its own
+                print(f"[{idx + 1}/{len(objectives)}] {obj_id} ({subject}) - Generating...")
+                future = pool.submit(_generate_batch, obj, subject, difficulty, client, args.model)
+
+            parsed_batch = future.result()
+            if not parsed_batch:
+                print(f"    [!] {obj_id}: No valid JSON returned.")
+                continue
+
+            valid_batch = _new_questions(obj, subject, difficulty, parsed_batch, existing_hashes, args.model)
+            if valid_batch:
+                print(f"    [+] {obj_id}: Added {len(valid_batch)} questions.")
+                all_questions.extend(valid_batch)
+                by_objective.setdefault((obj_id, subject), []).extend(valid_batch)
+                newly_generated_count += len(valid_batch)
+                save()
 
     print(f"\n[*] Done. Generated {newly_generated_count} new questions. Total in file: {len(all_questions)}")
 
@@ -3,32 +3,28 @@ Ollama Explanation Generator for BrightEd
 Generates lightweight explanations for wrong answers using local Ollama models
 """
 
-import requests
+import sys
 import json
+from pathlib import Path
 from typing import Optional
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from ollama_client import OllamaError, OllamaUnavailable, shared_client
+
 OLLAMA_HOST = "http://localhost:11434"
 DEFAULT_MODEL = "llama3.2:latest"  # Lightweight model, ~2GB
 
 
 def check_ollama_available() -> bool:
     """Check if Ollama is running"""
-    try:
-        response = requests.get(f"{OLLAMA_HOST}/api/tags", timeout=2)
-        return response.status_code == 200
-    except:
-        return False
+    return shared_client(OLLAMA_HOST).available(timeout=2)
 
 
 def get_available_models() -> list:
     """Get list of available Ollama models"""
     try:
-        response = requests.get(f"{OLLAMA_HOST}/api/tags", timeout=5)
-        if response.status_code == 200:
-            data = response.json()
-            return [m["name"] for m in data.get("models", [])]
-        return []
-    except Exception as e:
+        return shared_client(OLLAMA_HOST).models(timeout=5)
+    except OllamaError as e:
         print(f"Error fetching models: {e}")
         return []
 
@@ -70,36 +66,19 @@ Generate a 2-3 sentence explanation that:
 Keep it under 100 words. Be encouraging."""
 
     try:
-        response = requests.post(
-            f"{OLLAMA_HOST}/api/generate",
-            json={
-                "model": model,
-                "prompt": prompt,
-                "stream": False,
-                "options": {
-                    "temperature": 0.7,
-                    "num_predict": 150,  # Limit output tokens
-                }
-            },
-            timeout=30
-        )
+        explanation = shared_client(OLLAMA_HOST).generate(
+            model, prompt, timeout=30,
+            temperature=0.7,
+            num_predict=150,  # Limit output tokens
+        ).strip()
         
-        if response.status_code == 200:
-            result = response.json()
-            explanation = result.get("response", "").strip()
-            
-            # Clean up common issues
-            explanation = _clean_explanation(explanation)
-            
-            return explanation
-        else:
-            print(f"Ollama error: {response.status_code} - {response.text}")
-            return None
+        # Clean up common issues
+        return _clean_explanation(explanation)
             
-    except requests.exceptions.ConnectionError:
+    except OllamaUnavailable:
         print("Ollama not running - cannot generate explanation")
         return None
-    except Exception as e:
+    except OllamaError as e:
         print(f"Error generating explanation: {e}")
         return None
 
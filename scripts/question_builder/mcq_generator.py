@@ -3,11 +3,15 @@ AI MCQ Question Generator for BrightEd
 Generates complete MCQ questions from topic descriptions using Ollama
 """
 
-import requests
+import sys
 import json
 import re
+from pathlib import Path
 from typing import Optional, Dict
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from ollama_client import OllamaError, OllamaUnavailable, shared_client
+
 OLLAMA_HOST = "http://localhost:11434"
 DEFAULT_MODEL = "gemma3:1b"
 
@@ -55,43 +59,24 @@ Rules:
 Output ONLY in the format above."""
 
     try:
-        response = requests.post(
-            f"{OLLAMA_HOST}/api/generate",
-            json={
-                "model": model,
-                "prompt": prompt,
-                "stream": False,
-                "options": {
-                    "temperature": 0.8,
-                    "num_predict": 300,
-                }
-            },
-            timeout=60
-        )
-        
-        if response.status_code == 200:
-            result = response.json()
-            raw_output = result.get("response", "").strip()
-            
-            # Parse the generated output
-            parsed = _parse_mcq_output(raw_output)
-            
-            if parsed and _validate_generated_mcq(parsed):
-                return parsed
-            else:
-                print(f"Failed to parse or validate generated MCQ: {raw_output}")
-                return None
-        else:
-            print(f"Ollama error: {response.status_code} - {response.text}")
-            return None
-            
-    except requests.exceptions.ConnectionError:
+        raw_output = shared_client(OLLAMA_HOST).generate(model, prompt, timeout=60, temperature=0.8,
+                                                         num_predict=300).strip()
+    except OllamaUnavailable:
         print("Ollama not running - cannot generate question")
         return None
-    except Exception as e:
+    except OllamaError as e:
         print(f"Error generating MCQ: {e}")
         return None
 
+    # Parse the generated output
+    parsed = _parse_mcq_output(raw_output)
+
+    if parsed and _validate_generated_mcq(parsed):
+        return parsed
+    else:
+        print(f"Failed to parse or validate generated MCQ: {raw_output}")
+        return None
+
 
 def _parse_mcq_output(output: str) -> Optional[Dict]:
     """Parse the LLM output into structured MCQ data"""
@@ -229,34 +214,20 @@ Rules:
 Output ONLY in the format above."""
 
     try:
-        response = requests.post(
-            f"{OLLAMA_HOST}/api/generate",
-            json={
-                "model": model,
-                "prompt": prompt,
-                "stream": False,
-                "options": {
-                    "temperature": 0.9,  # Slightly higher for variety
-                    "num_predict": 300,
-                }
-            },
-            timeout=60
-        )
-        
-        if response.status_code == 200:
-            result = response.json()
-            raw_output = result.get("response", "").strip()
-            parsed = _parse_mcq_output(raw_output)
-            
-            if parsed and _validate_generated_mcq(parsed):
-                return parsed
-            
-        return None
-        
-    except Exception as e:
+        raw_output = shared_client(OLLAMA_HOST).generate(
+            model, prompt, timeout=60,
+            temperature=0.9,  # Slightly higher for variety
+            num_predict=300,
+        ).strip()
+    except OllamaError as e:
         print(f"Error regenerating MCQ: {e}")
         return None
 
+    parsed = _parse_mcq_output(raw_output)
+    if parsed and _validate_generated_mcq(parsed):
+        return parsed
+    return None
+
 
 # Testing
 if __name__ == "__main__":
@@ -1,12 +1,16 @@
 import os
+import sys
 import json
 import time
 import hashlib
 import argparse
-import urllib.request
-import urllib.error
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from syllabus_io import iter_objectives
+from objective_store import ObjectiveStore, STORE_SUFFIX
+from ollama_client import OllamaError, shared_client
+
 # --- Configuration Defaults ---
 DEFAULT_MODEL = "kimi-k2.5:cloud" # Recommended for logic and formatting
 DEFAULT_HOST = "http://127.0.0.1:11434"
@@ -19,24 +23,11 @@ def _hash_text(s: str) -> str:
     return hashlib.md5(s.strip().lower().encode('utf-8')).hexdigest()
 
 def _ollama_generate(host: str, model: str, prompt: str, temperature: float = 0.7) -> str:
-    url = f"{host}/api/generate"
-    payload = {
-        'model': model,
-        'prompt': prompt,
-        'stream': False,
-        'format': 'json',
-        'options': {'temperature': temperature, 'num_predict': 4000}
-    }
-    
-    data = json.dumps(payload).encode('utf-8')
-    req = urllib.request.Request(url, data=data, headers={'Content-Type': 'application/json'})
-    
+    # One pooled client per host, so batches and retries reuse the same connection
     try:
-        with urllib.request.urlopen(req, timeout=120) as response:
-            if response.status == 200:
-                result = json.loads(response.read().decode('utf-8'))
-                return result.get('response', '')
-    except Exception as e:
+        return shared_client(host).generate(model, prompt, timeout=120, format='json', temperature=temperature,
+                                            num_predict=4000)
+    except OllamaError as e:
         print(f"    [!] Ollama Error: {e}")
     return ""
 
@@ -69,7 +60,8 @@ Rules:
 Output ONLY the JSON array.
 """
 
-def process_syllabus(subject_file: Path, target_count: int, host: str, model: str):
+def process_syllabus(subject_file: Path, target_count: int, host: str, model: str, topics=None):
+    """topics: optional lazy iterable of objectives (e.g. streamed from the combined NDJSON)."""
     subject_name = subject_file.stem.replace("CSEC-", "").replace("-Syllabus", "")
     print(f"\n[*] Scaling {subject_name} ({subject_file.name})")
     
@@ -84,11 +76,14 @@ def process_syllabus(subject_file: Path, target_count: int, host: str, model: st
     
     existing_ids = {q.get('id') for q in existing_questions}
     
-    try:
-        syllabus_data = json.loads(subject_file.read_text(encoding='utf-8'))
-    except Exception as e:
-        print(f" [!] Error reading syllabus: {e}")
-        return
+    if topics is not None:
+        syllabus_data = topics
+    else:
+        try:
+            syllabus_data = list(iter_objectives(subject_file))
+        except Exception as e:
+            print(f" [!] Error reading syllabus: {e}")
+            return
 
     new_questions = []
     for topic in syllabus_data:
@@ -180,6 +175,19 @@ def process_syllabus(subject_file: Path, target_count: int, host: str, model: st
             output_file.write_text(json.dumps(combined, indent=2), encoding='utf-8')
             print(f"Done in {duration:.1f}s. Added {added_count} new questions.")
 
+def _iter_combined_subject(combined_file: Path, source_stem: str):
+    """Stream one subject's objectives out of a combined NDJSON file without loading the rest."""
+    if combined_file.suffix == STORE_SUFFIX:
+        # Only source_file is decoded for the other subjects' records
+        with ObjectiveStore(combined_file) as store:
+            for number in range(len(store)):
+                if Path(str(store.record(number, ('source_file',)).get('source_file') or '')).stem == source_stem:
+                    yield store.record(number)
+        return
+    for obj in iter_objectives(combined_file):
+        if Path(str(obj.get('source_file') or '')).stem == source_stem:
+            yield obj
+
 # --- Main Flow ---
 
 def main():
@@ -188,9 +196,24 @@ def main():
     parser.add_argument("--target", type=int, default=50, help="Target questions per topic (default 50).")
     parser.add_argument("--model", type=str, default=DEFAULT_MODEL, help="Ollama model name.")
     parser.add_argument("--host", type=str, default=DEFAULT_HOST, help="Ollama host URL.")
+    parser.add_argument("--combined", type=str, help="Stream objectives from a combined NDJSON file (main.py --format ndjson) or objective store (.objs) instead of per-subject JSONs.")
     
     args = parser.parse_args()
     
+    if args.combined:
+        combined_file = Path(args.combined)
+        stems = sorted({Path(str(o.get('source_file') or '')).stem for o in iter_objectives(combined_file)} - {''})
+        if args.subject:
+            stems = [s for s in stems if args.subject.lower() in s.lower()]
+        if not stems:
+            print("[!] No matching subjects in combined file.")
+            return
+        print(f"[*] Starting generation for {len(stems)} subjects from {combined_file}. Target: {args.target} questions/topic.")
+        for stem in stems:
+            process_syllabus(SYLLABUS_DIR / f"{stem}.json", args.target, args.host, args.model,
+                             topics=_iter_combined_subject(combined_file, stem))
+        return
+
     if args.subject:
         files = [f for f in SYLLABUS_DIR.glob(f"*{args.subject}*.json") 
                  if f.name not in ['combined_syllabuses.json', 'processing_summary.json']]
@@ -0,0 +1,220 @@
+"""
+SQLite index over parsed objectives (<output>/syllabus_index.db), built by
+main.py next to the combined output. Plain B-tree indexes serve lookups by ID,
+subject, page and keyword; an FTS5 table serves full-text search over objective,
+content, keywords, section and subsection. Stdlib only, like syllabus_io.
+"""
+
+import json
+import os
+import re
+import sqlite3
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+from syllabus_io import iter_objectives
+
+INDEX_DB = "syllabus_index.db"
+
+SCHEMA = """
+CREATE TABLE objectives (
+    rowid INTEGER PRIMARY KEY,
+    id TEXT,
+    hash TEXT,
+    source_file TEXT,
+    subject TEXT,
+    section TEXT,
+    subsection TEXT,
+    objective TEXT,
+    content TEXT,
+    keywords TEXT,
+    page_number INTEGER,
+    difficulty INTEGER,
+    data TEXT
+);
+CREATE TABLE objective_keywords (
+    keyword TEXT,
+    objective_rowid INTEGER
+);
+CREATE VIRTUAL TABLE objectives_fts USING fts5(
+    objective, content, keywords, section, subsection,
+    content='objectives', content_rowid='rowid', tokenize='porter unicode61'
+);
+"""
+
+# Created after the bulk load so a full build fills the FTS table in one 'rebuild' pass
+INDEXES = """
+CREATE INDEX idx_objectives_id ON objectives(id);
+CREATE INDEX idx_objectives_subject_page ON objectives(subject, page_number);
+CREATE INDEX idx_objectives_source_page ON objectives(source_file, page_number);
+CREATE INDEX idx_objective_keywords ON objective_keywords(keyword);
+CREATE INDEX idx_objective_keywords_rowid ON objective_keywords(objective_rowid);
+CREATE TRIGGER objectives_ai AFTER INSERT ON objectives BEGIN
+    INSERT INTO objectives_fts(rowid, objective, content, keywords, section, subsection)
+    VALUES (new.rowid, new.objective, new.content, new.keywords, new.section, new.subsection);
+END;
+CREATE TRIGGER objectives_ad AFTER DELETE ON objectives BEGIN
+    INSERT INTO objectives_fts(objectives_fts, rowid, objective, content, keywords, section, subsection)
+    VALUES ('delete', old.rowid, old.objective, old.content, old.keywords, old.section, old.subsection);
+    DELETE FROM objective_keywords WHERE objective_rowid = old.rowid;
+END;
+"""
+
+_SOURCE_SUFFIX = re.compile(r'-(Syllabus|Effective)\b.*$', re.IGNORECASE)
+
+
+def subject_from_source(source_file: str) -> str:
+    """'CSEC-Principles-of-Business-Syllabus-.pdf' -> 'Principles of Business'."""
+    stem = Path(source_file or '').stem
+    stem = re.sub(r'^(CSEC|CAPE)-', '', stem, flags=re.IGNORECASE)
+    return _SOURCE_SUFFIX.sub('', stem).replace('-', ' ').strip() or 'General'
+
+
+def _row(obj: Dict) -> tuple:
+    keywords = obj.get('keywords') or []
+    return (obj.get('id'), obj.get('hash'), obj.get('source_file'), subject_from_source(obj.get('source_file')),
+            obj.get('section'), obj.get('subsection'), obj.get('objective'), obj.get('content'), ' '.join(keywords),
+            obj.get('page_number'), obj.get('difficulty'), json.dumps(obj, ensure_ascii=False))
+
+
+class SyllabusIndex:
+    """Read/patch access to a built index. Query helpers return the stored objective dicts."""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.conn = sqlite3.connect(self.path)
+
+    @classmethod
+    def build(cls, path: Union[str, Path], objectives: Iterable[Dict]) -> 'SyllabusIndex':
+        """Build from scratch into '<path>.partial' and move it into place, so readers never see half an index."""
+        path = Path(path)
+        partial = path.with_name(path.name + ".partial")
+        partial.unlink(missing_ok=True)
+        conn = sqlite3.connect(partial)
+        try:
+            conn.executescript(SCHEMA)
+            with conn:
+                cls._insert(conn, objectives)
+                conn.execute("INSERT INTO objectives_fts(objectives_fts) VALUES ('rebuild')")
+                conn.executescript(INDEXES)
+            conn.execute("ANALYZE")
+        except BaseException:
+            conn.close()
+            partial.unlink(missing_ok=True)
+            raise
+        conn.close()
+        os.replace(partial, path)
+        return cls(path)
+
+    @staticmethod
+    def _insert(conn: sqlite3.Connection, objectives: Iterable[Dict]) -> int:
+        count = 0
+        for obj in objectives:
+            cursor = conn.execute("INSERT INTO objectives (id, hash, source_file, subject, section, subsection, "
+                                  "objective, content, keywords, page_number, difficulty, data) "
+                                  "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", _row(obj))
+            conn.executemany("INSERT INTO objective_keywords (keyword, objective_rowid) VALUES (?, ?)",
+                             [(kw.lower(), cursor.lastrowid) for kw in set(obj.get('keywords') or [])])
+            count += 1
+        return count
+
+    def replace_sources(self, replacements: Dict[str, Union[str, Path, List[Dict]]],
+                        removed: Iterable[str] = ()) -> Dict:
+        """
+        Swap in the objectives of re-parsed files ({source_file: per-file JSON, or the rows
+        themselves}) and drop removed ones; the triggers keep the FTS and keyword tables in step.
+        """
+        stats = {'removed': 0, 'added': 0}
+        with self.conn:
+            for source_file in list(replacements) + list(removed):
+                stats['removed'] += self.conn.execute("DELETE FROM objectives WHERE source_file = ?",
+                                                      (source_file,)).rowcount
+            for shard in replacements.values():
+                rows = shard if isinstance(shard, list) else iter_objectives(shard)
+                stats['added'] += self._insert(self.conn, rows)
+        return stats
+
+    def _objects(self, sql: str, params: tuple = ()) -> List[Dict]:
+        return [json.loads(data) for (data,) in self.conn.execute(sql, params)]
+
+    def by_id(self, objective_id: str) -> List[Dict]:
+        """All objectives with this ID (prefixes are shared by some syllabuses, e.g. BIO)."""
+        return self._objects("SELECT data FROM objectives WHERE id = ?", (objective_id,))
+
+    def subjects(self) -> Dict[str, int]:
+        return dict(self.conn.execute("SELECT subject, COUNT(*) FROM objectives GROUP BY subject ORDER BY subject"))
+
+    def by_subject(self, subject: str, limit: Optional[int] = None) -> List[Dict]:
+        sql = "SELECT data FROM objectives WHERE subject = ? ORDER BY page_number, rowid"
+        if limit:
+            return self._objects(sql + " LIMIT ?", (subject, limit))
+        return self._objects(sql, (subject,))
+
+    def by_page(self, subject: str, page_number: int) -> List[Dict]:
+        return self._objects("SELECT data FROM objectives WHERE subject = ? AND page_number = ? ORDER BY rowid",
+                             (subject, page_number))
+
+    def by_keyword(self, keyword: str, subject: Optional[str] = None) -> List[Dict]:
+        sql = ("SELECT o.data FROM objective_keywords k JOIN objectives o ON o.rowid = k.objective_rowid "
+               "WHERE k.keyword = ?")
+        params = (keyword.lower(),)
+        if subject:
+            sql += " AND o.subject = ?"
+            params += (subject,)
+        return self._objects(sql + " ORDER BY o.rowid", params)
+
+    def search(self, query: str, subject: Optional[str] = None, limit: int = 20) -> List[Dict]:
+        """FTS5 query (MATCH syntax), best bm25 match first."""
+        sql = ("SELECT o.data FROM objectives_fts f JOIN objectives o ON o.rowid = f.rowid "
+               "WHERE objectives_fts MATCH ?")
+        params = (query,)
+        if subject:
+            sql += " AND o.subject = ?"
+            params += (subject,)
+        return self._objects(sql + " ORDER BY bm25(objectives_fts) LIMIT ?", params + (limit,))
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def find_index(output_dir: Union[str, Path]) -> Optional[Path]:
+    path = Path(output_dir) / INDEX_DB
+    return path if path.exists() else None
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Query the syllabus objective index")
+    parser.add_argument("query", nargs="?", help="Full-text query (FTS5 syntax)")
+    parser.add_argument("--index", type=str, default=f"syllabuses/output/{INDEX_DB}", help="Index database")
+    parser.add_argument("--subject", type=str, help="Restrict to one subject (e.g. Biology)")
+    parser.add_argument("--id", type=str, help="Look up an objective ID")
+    parser.add_argument("--keyword", type=str, help="Exact keyword lookup")
+    parser.add_argument("--page", type=int, help="Objectives on this page of --subject")
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    with SyllabusIndex(args.index) as index:
+        if args.id:
+            found = index.by_id(args.id)
+        elif args.keyword:
+            found = index.by_keyword(args.keyword, args.subject)
+        elif args.page is not None and args.subject:
+            found = index.by_page(args.subject, args.page)
+        elif args.query:
+            found = index.search(args.query, args.subject, args.limit)
+        elif args.subject:
+            found = index.by_subject(args.subject, args.limit)
+        else:
+            for subject, count in index.subjects().items():
+                print(f"{count:6d}  {subject}")
+            raise SystemExit(0)
+        for obj in found[:args.limit]:
+            print(f"{obj.get('id')}  p{obj.get('page_number')}  [{subject_from_source(obj.get('source_file'))}]  "
+                  f"{(obj.get('objective') or '')[:100]}")
@@ -0,0 +1,180 @@
+"""
+Streaming readers/writers for syllabus parser output.
+Kept free of pdfplumber so the question generators can import it cheaply.
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Union
+
+from objective_store import ObjectiveStore, STORE_SUFFIX
+
+NDJSON_SUFFIXES = {'.ndjson', '.jsonl'}
+COMBINED_JSON = "combined_syllabuses.json"
+COMBINED_NDJSON = "combined_syllabuses.ndjson"
+COMBINED_STORE = "combined_syllabuses" + STORE_SUFFIX
+
+
+class _CombinedWriter:
+    """
+    Base for streaming combined-output writers. Writes go to '<path>.partial' and
+    are moved into place on close, so readers never see a half-written corpus.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.partial_path = self.path.with_name(self.path.name + ".partial")
+        self.count = 0
+        self._file = None
+
+    def open(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.partial_path, 'w', encoding='utf-8')
+        self._begin()
+        return self
+
+    def write_many(self, objectives: Iterable[Dict]) -> int:
+        written = 0
+        for obj in objectives:
+            self._write_one(obj)
+            written += 1
+        self._file.flush()
+        self.count += written
+        return written
+
+    def close(self) -> None:
+        if self._file is None:
+            return
+        self._end()
+        self._file.close()
+        self._file = None
+        self.partial_path.replace(self.path)
+
+    def _begin(self) -> None:
+        pass
+
+    def _write_one(self, obj: Dict) -> None:
+        raise NotImplementedError
+
+    def _end(self) -> None:
+        pass
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            # Keep the previous combined file intact if the run blew up
+            self._file.close()
+            self._file = None
+            self.partial_path.unlink(missing_ok=True)
+
+
+class NDJSONWriter(_CombinedWriter):
+    """Appends objectives to a newline-delimited JSON file, one object per line."""
+
+    def _write_one(self, obj: Dict) -> None:
+        self._file.write(json.dumps(obj, ensure_ascii=False))
+        self._file.write("\n")
+
+
+class JSONArrayWriter(_CombinedWriter):
+    """
+    Streams objectives into a JSON array. The bytes match
+    json.dump(objectives, f, indent=2, ensure_ascii=False) on the full list.
+    """
+
+    def _write_one(self, obj: Dict) -> None:
+        body = json.dumps(obj, indent=2, ensure_ascii=False).replace("\n", "\n  ")
+        self._file.write((",\n  " if self._pending else "[\n  ") + body)
+        self._pending = True
+
+    def _begin(self) -> None:
+        self._pending = False
+
+    def _end(self) -> None:
+        self._file.write("\n]" if self._pending else "[]")
+
+
+def iter_objectives(path: Union[str, Path]) -> Iterator[Dict]:
+    """
+    Yield objectives from parser output. NDJSON files (.ndjson/.jsonl) are streamed
+    line by line, an objective store (.objs) is memory-mapped and decoded record by
+    record, and a plain JSON array is loaded once and then yielded.
+    """
+    path = Path(path)
+    if path.suffix.lower() == STORE_SUFFIX:
+        with ObjectiveStore(path) as store:
+            yield from store
+        return
+    if path.suffix.lower() in NDJSON_SUFFIXES:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+        return
+
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if isinstance(data, list):
+        yield from data
+
+
+def find_combined(output_dir: Union[str, Path]) -> Path:
+    """
+    The newer of the NDJSON and JSON combined files (a run with the other --format leaves
+    the old one behind), or the objective store when it is at least as new as that.
+    """
+    output_dir = Path(output_dir)
+    existing = [p for p in (output_dir / COMBINED_NDJSON, output_dir / COMBINED_JSON) if p.exists()]
+    combined = max(existing, key=lambda p: p.stat().st_mtime_ns) if existing else output_dir / COMBINED_JSON
+    store = output_dir / COMBINED_STORE
+    if store.exists() and (not combined.exists() or store.stat().st_mtime_ns >= combined.stat().st_mtime_ns):
+        return store
+    return combined
+
+
+def writer_for(path: Union[str, Path]) -> _CombinedWriter:
+    path = Path(path)
+    return NDJSONWriter(path) if path.suffix.lower() in NDJSON_SUFFIXES else JSONArrayWriter(path)
+
+
+def patch_combined(path: Union[str, Path], replacements: Dict[str, Union[str, Path]],
+                   removed: Iterable[str] = ()) -> Dict[str, int]:
+    """
+    Rewrite a combined file, merging on objective hash. replacements maps a source_file
+    to its freshly written per-file JSON: objectives whose hash is still present are
+    replaced in place, new hashes are appended and vanished ones dropped. Every objective
+    from a source_file in removed is dropped. Unaffected sources stream straight through.
+    """
+    path = Path(path)
+    removed = set(removed)
+    fresh = {src: {o.get('hash'): o for o in iter_objectives(shard)} for src, shard in replacements.items()}
+    stats = {'kept': 0, 'updated': 0, 'added': 0, 'removed': 0}
+
+    def merged() -> Iterator[Dict]:
+        if path.exists():
+            for obj in iter_objectives(path):
+                src = obj.get('source_file')
+                if src in removed:
+                    stats['removed'] += 1
+                elif src in fresh:
+                    new = fresh[src].pop(obj.get('hash'), None)
+                    if new is None:
+                        stats['removed'] += 1
+                    else:
+                        stats['updated'] += 1
+                        yield new
+                else:
+                    stats['kept'] += 1
+                    yield obj
+        for objs in fresh.values():
+            stats['added'] += len(objs)
+            yield from objs.values()
+
+    with writer_for(path) as writer:
+        writer.write_many(merged())
+    return stats
@@ -0,0 +1,28 @@
+import sys
+import logging
+from pathlib import Path
+
+import pytest
+
+# The parser modules live at the repo root and are imported as top-level modules;
+# scripts/ holds the synthetic syllabus PDF writer from the parser benchmark
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "scripts"))
+
+from bench_parser import write_synthetic_pdf  # noqa: E402
+
+
+@pytest.fixture
+def syllabus_pdf():
+    """Write a small deterministic CXC-style syllabus PDF: syllabus_pdf(path, pages=4, seed=0)."""
+    def write(path: Path, pages: int = 4, seed: int = 0) -> Path:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        write_synthetic_pdf(path, pages, seed)
+        return path
+    return write
+
+
+@pytest.fixture(autouse=True)
+def _quiet_parser_logs(caplog):
+    caplog.set_level(logging.WARNING)
@@ -0,0 +1,35 @@
+import pdfplumber
+
+from main import BodyRegion, CROP_SETTINGS
+
+
+def test_repeated_header_and_footer_are_cropped_and_body_rows_kept(tmp_path, syllabus_pdf):
+    path = syllabus_pdf(tmp_path / 'CSEC-Biology-Syllabus.pdf', pages=6, seed=5)
+    with pdfplumber.open(path) as pdf:
+        region = BodyRegion.learn(pdf, CROP_SETTINGS)
+        assert list(region.cuts) == ['612.0x792.0']
+        header, footer = region.cuts['612.0x792.0']
+        assert 0 < header < 792 * CROP_SETTINGS['band_fraction']
+        assert 0 < footer < 792 * CROP_SETTINGS['band_fraction']
+
+        for number, page in enumerate(pdf.pages, 1):
+            body, bbox = region.crop(page)
+            assert bbox == (0, header, 612, 792 - footer)
+            text = body.extract_text()
+            assert "CXC 31/G/SYLL" not in text and f"Page {number}" not in text
+            assert "SPECIFIC OBJECTIVES" in text
+            # Everything between the bands survives, and table rulings are kept whole
+            inside = [w['text'] for w in page.extract_words() if header <= w['top'] and w['bottom'] <= 792 - footer]
+            assert [w['text'] for w in body.extract_words()] == inside
+            assert len(body.lines) == len(page.lines)
+            page.close()
+
+
+def test_sizes_without_a_recurring_band_are_left_whole(tmp_path, syllabus_pdf):
+    path = syllabus_pdf(tmp_path / 'CSEC-Biology-Syllabus.pdf', pages=6, seed=5)
+    with pdfplumber.open(path) as pdf:
+        # Two sampled pages cannot show a repeat when at least three must agree
+        region = BodyRegion.learn(pdf, dict(CROP_SETTINGS, sample_pages=2, min_repeat=1.5))
+        assert region.cuts == {}
+        body, bbox = region.crop(pdf.pages[0])
+        assert body is pdf.pages[0] and bbox is None
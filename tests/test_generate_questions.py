@@ -0,0 +1,65 @@
+import json
+import asyncio
+
+import generate_questions as gq
+from objective_links import ObjectiveLinks
+
+RESPONSE = json.dumps({"question": "Which organelle releases energy?", "options": ["A", "B", "C", "D"],
+                       "correctAnswer": 1, "explanation": "", "storyElement": ""})
+
+
+def objective(oid, text, obj_hash, source):
+    return {'id': oid, 'objective': text, 'content': '', 'difficulty': 1, 'hash': obj_hash, 'source_file': source}
+
+
+def stored(conn):
+    return conn.execute('SELECT id, subject_id, objective_id, variation FROM questions ORDER BY id').fetchall()
+
+
+def test_shared_objective_ids_across_syllabuses_save_separately(tmp_path, monkeypatch):
+    # Biology and Human & Social Biology both use BIO- IDs and both map to 'Biology'
+    subjects = {'Biology': [objective('BIO-001', 'describe cells', 'aaaa', 'CSEC-Biology-Syllabus.pdf'),
+                            objective('BIO-001', 'describe diet', 'bbbb', 'CSEC-Human-and-Social-Biology.pdf')]}
+    conn = gq.init_db(tmp_path / 'questions.db')
+    jobs = gq.plan_jobs(conn, subjects, ObjectiveLinks())
+    assert len(jobs) == 2 * gq.target_variations_for(subjects['Biology'])
+
+    async def answer(client, prompt):
+        return RESPONSE
+    monkeypatch.setattr(gq, 'call_ollama_async', answer)
+    counts = asyncio.run(gq.generate_concurrently(conn, jobs, 8))
+
+    assert counts == {'Biology': len(jobs)}
+    rows = stored(conn)
+    assert len(rows) == len(jobs) == len({r[0] for r in rows})
+
+
+def test_plan_jobs_drops_repeated_objectives(tmp_path):
+    same = objective('BIO-001', 'describe cells', 'aaaa', 'CSEC-Biology-Syllabus.pdf')
+    subjects = {'Biology': [same, dict(same, source_file='CSEC-Human-and-Social-Biology.pdf')]}
+    conn = gq.init_db(tmp_path / 'questions.db')
+    jobs = gq.plan_jobs(conn, subjects, ObjectiveLinks())
+    assert [variation for _, _, variation in jobs] == list(range(gq.target_variations_for(subjects['Biology'])))
+
+
+def test_writer_survives_a_failed_insert(tmp_path):
+    conn = gq.init_db(tmp_path / 'questions.db')
+    conn.execute("CREATE TRIGGER reject BEFORE INSERT ON questions WHEN NEW.topic = 'reject' "
+                 "BEGIN SELECT RAISE(ABORT, 'rejected'); END")
+    entries = [(objective('BIO-001', 'describe cells', 'aaaa', 'bio.pdf'), 'Biology', 0, RESPONSE),
+               (objective('BIO-002', 'reject', 'bbbb', 'bio.pdf'), 'Biology', 0, RESPONSE),
+               (objective('BIO-003', 'describe diet', 'cccc', 'bio.pdf'), 'Biology', 0, RESPONSE),
+               (objective('BIO-004', 'not json', 'dddd', 'bio.pdf'), 'Biology', 0, '{oops')]
+
+    async def run():
+        queue = asyncio.Queue()
+        counts = {}
+        writer = asyncio.create_task(gq._db_writer(conn, queue, counts))
+        for entry in entries:
+            await queue.put(entry)
+        await queue.put(None)
+        await writer
+        return counts
+
+    assert asyncio.run(run()) == {'Biology': 2}
+    assert [r[2] for r in stored(conn)] == ['BIO-001', 'BIO-003']
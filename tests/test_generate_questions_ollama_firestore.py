@@ -0,0 +1,103 @@
+import json
+import re
+import sys
+import threading
+import time
+
+import pytest
+
+import generate_questions_ollama_firestore as gen
+from objective_links import LINKS_FILE
+
+BIOLOGY = [{'id': f"BIO-{n:03d}", 'objective': f"biology topic {n}", 'hash': f"b{n}", 'difficulty': 1}
+           for n in range(10)]
+# Linked to BIO-000, so its questions can be copied instead of generated
+ECONOMICS = [{'id': 'ECON-001', 'objective': "economics topic", 'hash': 'e1', 'difficulty': 2}]
+
+
+class StubClient:
+    """Stands in for OllamaClient: three questions per topic; with two or more slots the first objective answers last."""
+
+    def __init__(self, host, pool_size=1):
+        self.host = host
+        self.pool_size = pool_size
+        self.lock = threading.Lock()
+        self.others_done = threading.Condition(self.lock)
+        self.started, self.finished = [], []
+        self.started_while_first_ran = None
+
+    def generate(self, model, prompt, **options):
+        topic = re.search(r"^Topic: (.*)$", prompt, re.MULTILINE).group(1)
+        with self.lock:
+            self.started.append(topic)
+        if topic == BIOLOGY[0]['objective'] and self.pool_size > 1:
+            # Hold until everything else in the lookahead window has finished, so merging waits on this one
+            with self.others_done:
+                self.others_done.wait_for(lambda: len(self.finished) >= 7, timeout=5)
+            time.sleep(0.05)
+            self.started_while_first_ran = list(self.started)
+        with self.lock:
+            self.finished.append(topic)
+            self.others_done.notify_all()
+        questions = [{'question': f"Question {n} on {topic}?", 'options': ["A", "B", "C", "D"], 'correctAnswer': 1,
+                      'explanation': "Because."} for n in range(3)]
+        return json.dumps({'questions': questions})
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+@pytest.fixture
+def syllabus_dir(tmp_path):
+    directory = tmp_path / 'syllabuses'
+    directory.mkdir()
+    (directory / 'bio.json').write_text(json.dumps(BIOLOGY), encoding='utf-8')
+    (directory / 'econ.json').write_text(json.dumps(ECONOMICS), encoding='utf-8')
+    link = {'similarity': 0.9, 'a': {'id': 'BIO-000', 'source_file': 'bio.json', 'hash': 'b0'},
+            'b': {'id': 'ECON-001', 'source_file': 'econ.json', 'hash': 'e1'}}
+    (directory / LINKS_FILE).write_text(json.dumps({'links': [link]}), encoding='utf-8')
+    return directory
+
+
+def run(monkeypatch, syllabus_dir, output, *flags):
+    clients = []
+
+    def client(*args, **kwargs):
+        clients.append(StubClient(*args, **kwargs))
+        return clients[-1]
+    monkeypatch.setattr(gen, 'OllamaClient', client)
+    monkeypatch.setattr(sys, 'argv', ['generate', '--syllabus-dir', str(syllabus_dir), '--output', str(output),
+                                      *flags])
+    gen.main()
+    questions = json.loads(output.read_text(encoding='utf-8'))
+    for q in questions:
+        del q['metadata']['timestamp']
+    return clients[0], questions
+
+
+def test_results_merge_in_objective_order_whatever_order_they_finish(tmp_path, monkeypatch, syllabus_dir):
+    client, questions = run(monkeypatch, syllabus_dir, tmp_path / 'parallel.json', '--concurrency', '2')
+    # The first objective finished after the rest of its window and held the merge back
+    assert client.finished[0] != BIOLOGY[0]['objective'] and client.finished[7] == BIOLOGY[0]['objective']
+    # Two slots dispatch at most LOOKAHEAD_PER_SLOT * 2 objectives ahead of the one being merged
+    assert client.started_while_first_ran == [o['objective'] for o in BIOLOGY[:2 * gen.LOOKAHEAD_PER_SLOT]]
+
+    assert [q['objectiveId'] for q in questions] == [o['id'] for o in BIOLOGY for _ in range(3)] + ['ECON-001'] * 3
+    assert [q['questionText'] for q in questions[:3]] == [f"Question {n} on biology topic 0?" for n in range(3)]
+    reused = questions[-3:]
+    assert [q['metadata']['reusedFrom'] for q in reused] == [q['id'] for q in questions[:3]]
+    assert {q['subjectName'] for q in reused} == {'Economics'}
+
+    _, sequential = run(monkeypatch, syllabus_dir, tmp_path / 'sequential.json', '--concurrency', '1')
+    assert sequential == questions
+
+
+def test_no_links_generates_for_every_objective(tmp_path, monkeypatch, syllabus_dir):
+    client, questions = run(monkeypatch, syllabus_dir, tmp_path / 'out.json', '--concurrency', '2', '--no-links')
+    economics = [q for q in questions if q['objectiveId'] == 'ECON-001']
+    assert [q['questionText'] for q in economics] == [f"Question {n} on economics topic?" for n in range(3)]
+    assert all('reusedFrom' not in q['metadata'] for q in questions)
+    assert sorted(client.started) == sorted(o['objective'] for o in BIOLOGY + ECONOMICS)
@@ -0,0 +1,61 @@
+import pytest
+
+from main import EnhancedCXCSyllabusParser
+from objective_keywords import CorpusKeywords
+from syllabus_io import iter_objectives
+
+pytest.importorskip('numpy')
+
+
+def obj(source, obj_hash, objective, content=""):
+    return {'source_file': source, 'hash': obj_hash, 'objective': objective, 'content': content}
+
+
+BIOLOGY = [obj('bio.pdf', 'b1', "describe the cell membrane", "cell wall (KC)"),
+           obj('bio.pdf', 'b2', "describe the cell nucleus"),
+           obj('bio.pdf', 'b3', "explain osmosis in the cell")]
+ECONOMICS = [obj('econ.pdf', 'e1', "describe market structures", "monopoly and oligopoly"),
+             obj('econ.pdf', 'e2', "explain inflation")]
+
+
+def test_rank_orders_terms_by_tfidf_with_alphabetical_ties():
+    model = CorpusKeywords(top_k=3)
+    assert model.update(BIOLOGY + ECONOMICS) == 5
+    ranked = model.rank()
+    assert set(ranked) == {'bio.pdf', 'econ.pdf'}
+    # Twice in b1, "cell" outscores the rarer "membrane" there; once in b2 it ties "describe" (same df)
+    assert ranked['bio.pdf']['b1'] == ['cell', 'membrane', 'wall']
+    assert ranked['bio.pdf']['b2'] == ['nucleus', 'cell', 'describe']
+    # Stopwords and parenthesized skill labels are never terms
+    assert 'kc' not in model.vocab and 'the' not in model.vocab and 'and' not in model.vocab
+    assert ranked['econ.pdf']['e2'] == ['inflation', 'explain']
+    assert model.rank(['econ.pdf']) == {'econ.pdf': ranked['econ.pdf']}
+
+
+def test_incremental_update_and_remove_match_a_rebuild():
+    edited = [obj('bio.pdf', 'b1', "describe the cell membrane"), obj('bio.pdf', 'b4', "state the uses of enzymes")]
+    model = CorpusKeywords()
+    model.update(BIOLOGY + ECONOMICS)
+    model.remove('bio.pdf')
+    assert model.rows == 2
+    assert model.update(edited + ECONOMICS, {'bio.pdf'}) == 2
+
+    rebuilt = CorpusKeywords()
+    rebuilt.update(edited + ECONOMICS)
+    assert model.rank() == rebuilt.rank()
+
+    model.remove('econ.pdf')
+    model.remove('missing.pdf')
+    assert set(model.rank()) == {'bio.pdf'} and model.rows == 2
+
+
+def test_per_file_json_carries_the_reranked_keywords(tmp_path, syllabus_pdf):
+    syllabus_pdf(tmp_path / 'in' / 'CSEC-Biology-Syllabus.pdf', pages=3, seed=8)
+    syllabus_pdf(tmp_path / 'in' / 'CSEC-Economics-Syllabus.pdf', pages=3, seed=9)
+    parser = EnhancedCXCSyllabusParser(str(tmp_path / 'out'), num_workers=1, build_index=False, emit_store=False)
+    parser.process_directory(str(tmp_path / 'in'))
+    combined = {(o['source_file'], o['hash']): o['keywords'] for o in iter_objectives(parser.combined_path())}
+    shards = {(o['source_file'], o['hash']): o['keywords']
+              for name in ('CSEC-Biology-Syllabus.json', 'CSEC-Economics-Syllabus.json')
+              for o in iter_objectives(tmp_path / 'out' / name)}
+    assert combined and shards == combined
@@ -0,0 +1,44 @@
+import pytest
+
+import main
+from main import DEFAULT_WORKER_RSS_MB, EnhancedCXCSyllabusParser
+from syllabus_io import iter_objectives
+
+
+def without_dates(path):
+    return [{k: v for k, v in o.items() if k != 'extraction_date'} for o in iter_objectives(path)]
+
+
+def test_low_memory_run_matches_the_default_run(tmp_path, syllabus_pdf):
+    syllabus_pdf(tmp_path / 'in' / 'CSEC-Biology-Syllabus.pdf', pages=5, seed=6)
+    syllabus_pdf(tmp_path / 'in' / 'CSEC-Economics-Syllabus.pdf', pages=4, seed=7)
+    combined = {}
+    for mode, low_memory in (('default', False), ('low', True)):
+        parser = EnhancedCXCSyllabusParser(str(tmp_path / mode), num_workers=2, build_index=False,
+                                           emit_store=False, low_memory=low_memory)
+        parser.process_directory(str(tmp_path / 'in'))
+        combined[mode] = without_dates(parser.combined_path())
+        for shard in ('CSEC-Biology-Syllabus.json', 'CSEC-Economics-Syllabus.json'):
+            combined[mode, shard] = without_dates(tmp_path / mode / shard)
+    assert combined['default']
+    assert combined['low'] == combined['default']
+    for shard in ('CSEC-Biology-Syllabus.json', 'CSEC-Economics-Syllabus.json'):
+        assert combined['low', shard] == combined['default', shard]
+    # Objectives went through the spill directory, and each spill is removed once its file is finalized
+    assert (tmp_path / 'low' / '.spill').is_dir() and not (tmp_path / 'default' / '.spill').exists()
+    assert not list((tmp_path / 'low').glob('.spill/*'))
+
+
+@pytest.mark.parametrize('budget, expected', [(None, 4), (1000, 3), (700, 2), (300, 1), (50, 1)])
+def test_workers_for_budget(tmp_path, monkeypatch, budget, expected):
+    monkeypatch.setattr(main, 'current_rss_mb', lambda: 100.0)
+    parser = EnhancedCXCSyllabusParser(str(tmp_path), num_workers=4, memory_budget_mb=budget)
+    parser.manifest.documents = {'h1': {'peak_rss_mb': 300.0}, 'h2': {'peak_rss_mb': 250.0}, 'h9': {}}
+    # h3 was never measured, so it is expected to peak like the hungriest recorded file (300 MB)
+    assert parser.workers_for_budget(['h1', 'h2', 'h3']) == expected
+
+
+def test_fresh_output_assumes_the_default_worker_peak(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, 'current_rss_mb', lambda: 0.0)
+    parser = EnhancedCXCSyllabusParser(str(tmp_path), num_workers=8, memory_budget_mb=DEFAULT_WORKER_RSS_MB * 3.5)
+    assert parser.workers_for_budget(['a', 'b', 'c', 'd', 'e']) == 3
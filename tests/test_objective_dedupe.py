@@ -0,0 +1,70 @@
+import random
+import zlib
+from types import SimpleNamespace
+
+import pytest
+
+from objective_dedupe import (LSHIndex, MinHasher, candidate_probability, jaccard, lsh_params,
+                              merge_near_duplicates, shingles)
+
+
+def crc(text):
+    return zlib.crc32(text.encode())
+
+
+def test_shingles_normalise_case_punctuation_and_hyphenation():
+    assert shingles("Explain the water-\n cycle, using DIAGRAMS.") == shingles("explain the watercycle using diagrams")
+    assert shingles("Explain the water cycle") == {crc("explain the water"), crc("the water cycle")}
+
+
+def test_short_and_empty_texts():
+    assert shingles("state two uses") == {crc("state two uses")}
+    assert shingles("") == frozenset()
+    assert jaccard(shingles(""), shingles("")) == 1.0
+
+
+@pytest.mark.parametrize("threshold", [0.7, 0.8, 0.85, 0.9])
+def test_lsh_params_make_pairs_at_the_threshold_candidates(threshold):
+    bands, rows = lsh_params(threshold, 64)
+    assert bands * rows <= 64
+    assert candidate_probability(threshold, bands, rows) >= 0.99
+
+
+def test_lsh_recall_at_the_threshold():
+    """Pairs at Jaccard ~0.85 must nearly always reach the exact comparison."""
+    bands, rows = lsh_params(0.85, 64)
+    hasher = MinHasher(64)
+    rng = random.Random(7)
+    found = 0
+    trials = 300
+    for trial in range(trials):
+        base = rng.sample(range(1 << 30), 108)
+        a, b = frozenset(base[:100]), frozenset(base[8:])
+        assert jaccard(a, b) == pytest.approx(92 / 108)
+        index = LSHIndex(bands, rows)
+        index.insert('a', hasher.signature(a))
+        found += bool(index.insert('b', hasher.signature(b)))
+    assert found / trials >= 0.97
+
+
+def objective(text, obj_hash):
+    return SimpleNamespace(objective=text, content="", hash=obj_hash)
+
+
+def test_merge_keeps_the_first_of_each_cluster():
+    text = ("explain the importance of the water cycle in the Caribbean with reference to rainfall, "
+            "evaporation, condensation, run-off and the replenishment of aquifers used for drinking water")
+    rows = [objective(text, 'h1'),
+            objective("list three sources of finance for a small business", 'h2'),
+            objective(text.replace("drinking water", "drinking-water."), 'h3'),   # Jaccard 1.0
+            objective(text.replace("drinking water", "potable water"), 'h4'),     # 0.852
+            objective(text.replace("Caribbean", "region"), 'h5')]                 # 0.786
+    kept, report = merge_near_duplicates(rows, threshold=0.85)
+    assert [o.hash for o in kept] == ['h1', 'h2', 'h5']
+    assert report == [{'kept': 'h1', 'objective': text[:120], 'merged': ['h3', 'h4']}]
+
+
+def test_distinct_objectives_are_not_merged():
+    kept, report = merge_near_duplicates([objective("define osmosis", 'a'), objective("define diffusion", 'b')])
+    assert [o.hash for o in kept] == ['a', 'b']
+    assert report == []
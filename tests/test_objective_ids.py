@@ -0,0 +1,94 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from main import EnhancedCXCSyllabusParser, Objective, ObjectiveIdTable
+from syllabus_io import iter_objectives
+from worker_pool import TaskTimeout
+
+
+def row(text, content, obj_hash):
+    return Objective(id="", section="SECTION A", subsection="", objective=text, content=content,
+                     specific_objectives=[], content_items=[], skills=[], difficulty=1, page_number=1,
+                     keywords=[], hash=obj_hash, source_file="CSEC-Biology-Syllabus.pdf",
+                     extraction_date="2026-01-01")
+
+
+def assign(table, rows):
+    table.assign(rows)
+    return [r.id for r in rows]
+
+
+def test_ids_survive_insertions_edits_and_reloads(tmp_path):
+    path = tmp_path / 'ids.json'
+    table = ObjectiveIdTable(path, 'BIO')
+    first = assign(table, [row("define osmosis", "water", 'h1'), row("state uses of enzymes", "", 'h2'),
+                           row("explain diffusion", "gases", 'h3')])
+    assert first == ['BIO-00001', 'BIO-00002', 'BIO-00003']
+    table.save()
+
+    # A new row in the middle, an edited content column on h3 and h2 gone
+    table = ObjectiveIdTable(path, 'BIO')
+    second = assign(table, [row("define osmosis", "water", 'h1'), row("list food tests", "", 'h4'),
+                            row("explain diffusion", "gases and liquids", 'h5')])
+    assert second == ['BIO-00001', 'BIO-00004', 'BIO-00003']
+    table.save()
+
+    # h2 coming back later does not collide with anything issued since
+    third = assign(ObjectiveIdTable(path, 'BIO'), [row("state uses of enzymes", "", 'h2')])
+    assert third == ['BIO-00002']
+
+
+def test_ambiguous_retired_text_mints_a_new_id(tmp_path):
+    table = ObjectiveIdTable(tmp_path / 'ids.json', 'BIO')
+    assign(table, [row("define osmosis", "a", 'h1'), row("define osmosis", "b", 'h2')])
+    assert assign(table, [row("define osmosis", "c", 'h3')]) == ['BIO-00003']
+
+
+def test_seeded_from_an_existing_output(tmp_path):
+    output = tmp_path / 'CSEC-Biology-Syllabus.json'
+    output.write_text(json.dumps([{'id': 'BIO-00007', 'hash': 'h1', 'objective': 'define osmosis'}]))
+    table = ObjectiveIdTable(tmp_path / 'ids.json', 'BIO', seed_file=output)
+    assert assign(table, [row("define osmosis", "", 'h1'), row("new", "", 'h9')]) == ['BIO-00007', 'BIO-00008']
+
+
+def parsed(out_dir):
+    return {o['hash']: o['id'] for o in iter_objectives(out_dir / 'CSEC-Biology-Syllabus.json')}
+
+
+def test_reparse_keeps_every_id(tmp_path, syllabus_pdf):
+    syllabus_pdf(tmp_path / 'in' / 'CSEC-Biology-Syllabus.pdf', pages=6, seed=3)
+    parser = EnhancedCXCSyllabusParser(str(tmp_path / 'out'), num_workers=1, build_index=False, emit_store=False)
+    parser.process_directory(str(tmp_path / 'in'))
+    before = parsed(tmp_path / 'out')
+    assert before and len(set(before.values())) == len(before)
+
+    parser = EnhancedCXCSyllabusParser(str(tmp_path / 'out'), num_workers=1, build_index=False, emit_store=False,
+                                       use_cache=False)
+    parser.process_directory(str(tmp_path / 'in'), force=True)
+    assert parsed(tmp_path / 'out') == before
+
+
+def test_timeout_mid_write_keeps_the_previous_output(tmp_path, monkeypatch):
+    parser = EnhancedCXCSyllabusParser(str(tmp_path), num_workers=1, build_index=False, emit_store=False)
+    pdf_path = Path('CSEC-Biology-Syllabus.pdf')
+    rows = [row("define osmosis", "water", 'h1'), row("explain diffusion", "gases", 'h2')]
+    parser.finalize_objectives(pdf_path, rows)
+    output = tmp_path / 'CSEC-Biology-Syllabus.json'
+    before = output.read_bytes()
+
+    # The per-file deadline fires while the new row is being encoded, after the rows before it
+    iterencode = json.JSONEncoder.iterencode
+
+    def interrupted(self, o, *args, **kwargs):
+        for chunk in iterencode(self, o, *args, **kwargs):
+            if "list food tests" in chunk:
+                raise TaskTimeout()
+            yield chunk
+
+    monkeypatch.setattr(json.JSONEncoder, 'iterencode', interrupted)
+    with pytest.raises(TaskTimeout):
+        parser.finalize_objectives(pdf_path, rows + [row("list food tests", "", 'h3')])
+    assert output.read_bytes() == before
+    assert not list(tmp_path.glob('*.partial'))
@@ -0,0 +1,101 @@
+import random
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+import generate_questions as gq  # noqa: E402
+from objective_keywords import CorpusKeywords  # noqa: E402
+from objective_links import ObjectiveLinks, build_links, similar_pairs  # noqa: E402
+from syllabus_index import subject_from_source  # noqa: E402
+
+BIOLOGY = 'CSEC-Biology-Syllabus.pdf'
+HSB = 'CSEC-Human-and-Social-Biology-Syllabus.pdf'
+CHEMISTRY = 'CSEC-Chemistry-Syllabus.pdf'
+
+
+def objective(oid, text, obj_hash, source, content=""):
+    return {'id': oid, 'objective': text, 'content': content, 'difficulty': 1, 'hash': obj_hash,
+            'source_file': source}
+
+
+CORPUS = [
+    objective('BIO-001', "describe the process of osmosis in living cells", 'b1', BIOLOGY),
+    objective('BIO-002', "explain how enzymes digest starch proteins fats", 'b2', BIOLOGY),
+    objective('BIO-003', "describe the process of osmosis in plant cells", 'b3', BIOLOGY),
+    objective('BIO-001', "describe the process of osmosis in living cells", 'h1', HSB),
+    objective('BIO-002', "explain how enzymes digest starch and proteins", 'h2', HSB),
+    objective('BIO-003', "list the functions of the skeleton", 'h3', HSB),
+    objective('CHEM-01', "balance equations for redox reactions", 'c1', CHEMISTRY),
+    objective('CHEM-02', "explain the effect of temperature on reaction rate", 'c2', CHEMISTRY),
+]
+
+
+def linked_hashes(table):
+    return {frozenset((link['a']['hash'], link['b']['hash'])): link['similarity'] for link in table['links']}
+
+
+def test_links_join_equivalent_objectives_of_different_subjects():
+    table = build_links(CORPUS, 0.6, subject_from_source)
+    links = linked_hashes(table)
+    assert table['objectives'] == len(CORPUS)
+    # Same text in Biology and HSB; an edited row still clears the threshold
+    assert links[frozenset(('b1', 'h1'))] == pytest.approx(1.0)
+    assert 0.6 <= links[frozenset(('b2', 'h2'))] < 1.0
+    assert 0.6 <= links[frozenset(('b3', 'h1'))] < 1.0
+    # b1/b3 are one subject; the skeleton, redox and reaction-rate rows match nothing
+    assert frozenset(('b1', 'b3')) not in links
+    assert not {'h3', 'c1', 'c2'} & {h for pair in links for h in pair}
+    assert list(links.values()) == sorted(links.values(), reverse=True)
+
+    # One group for both biology syllabuses: nothing left to link
+    assert build_links(CORPUS, 0.6, lambda src: 'biology' if 'Biology' in src else src)['links'] == []
+
+
+@pytest.mark.parametrize('threshold', [0.2, 0.5, 0.8])
+def test_similar_pairs_match_brute_force_cosine(threshold):
+    rng = random.Random(7)
+    words = [f"term{i}" for i in range(40)] + ['common'] * 10
+    rows = [objective(f"X-{n}", " ".join(rng.choice(words) for _ in range(rng.randint(1, 8))), f"h{n}",
+                      f"CSEC-Subject{n % 3}-Syllabus.pdf") for n in range(150)]
+    rows.append(objective('X-empty', "of the and", 'h-empty', BIOLOGY))
+    model = CorpusKeywords()
+    model.update(rows)
+    keys, pairs = similar_pairs(model, threshold, lambda src: src, block_rows=16)
+
+    names, blocks, indptr, term_ids, weights = model.matrix(normalize=True)
+    dense = np.zeros((len(keys), len(model.terms)))
+    for row in range(len(keys)):
+        dense[row, term_ids[indptr[row]:indptr[row + 1]]] = weights[indptr[row]:indptr[row + 1]]
+    sims = dense @ dense.T
+    expected = {(i, j) for i in range(len(keys)) for j in range(i + 1, len(keys))
+                if sims[i, j] >= threshold and keys[i][0] != keys[j][0]}
+    found = {(i, j) for i, j, _ in pairs}
+    # float32 scoring may differ from float64 only for pairs right at the threshold
+    assert {p for p in found ^ expected if abs(sims[p] - threshold) > 1e-5} == set()
+    assert expected
+    for i, j, sim in pairs:
+        assert sim == pytest.approx(sims[i, j], abs=1e-5)
+
+
+def test_reuse_linked_copies_questions_across_subjects(tmp_path):
+    conn = gq.init_db(tmp_path / 'questions.db')
+    cursor = conn.cursor()
+    chemistry_rate = objective('CHEM-02', "explain the effect of temperature on reaction rate", 'c2', CHEMISTRY)
+    biology_rate = objective('BIO-009', "explain the effect of temperature on reaction rate", 'b9', BIOLOGY)
+    for variation in range(3):
+        cursor.execute('INSERT INTO questions (id, subject_id, objective_id, topic, difficulty, variation, '
+                       'question_json) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                       (f"CHEM-02_{variation}", 'Chemistry', 'CHEM-02', chemistry_rate['objective'], 1, variation,
+                        '{"question": "q"}'))
+    links = ObjectiveLinks(build_links(CORPUS + [biology_rate], 0.6, subject_from_source))
+    assert [link['id'] for link in links.linked(biology_rate)] == ['CHEM-02']
+
+    assert gq.reuse_linked(cursor, biology_rate, 'Biology', links, 2) == 2
+    assert gq.reuse_linked(cursor, biology_rate, 'Biology', links, 2) == 0
+    copied = conn.execute("SELECT id, subject_id, objective_id, variation FROM questions WHERE subject_id = 'Biology' "
+                          "ORDER BY id").fetchall()
+    assert copied == [('BIO-009_from_CHEM-02_0', 'Biology', 'BIO-009', 0),
+                      ('BIO-009_from_CHEM-02_1', 'Biology', 'BIO-009', 1)]
+    # Nothing is linked to the skeleton row, so nothing is copied
+    assert gq.reuse_linked(cursor, CORPUS[5], 'Biology', links, 2) == 0
@@ -0,0 +1,51 @@
+import pytest
+
+from objective_store import ObjectiveStore, load_objectives, write_store
+
+OBJECTIVES = [
+    {'id': 'BIO-00002', 'section': 'SECTION A', 'subsection': None, 'objective': 'define osmosis',
+     'keywords': ['osmosis', 'water'], 'difficulty': 1, 'page_number': 3, 'extra': {'crop': [0, 1.5]},
+     'source_file': 'CSEC-Biology-Syllabus.pdf'},
+    {'id': 'BIO-00001', 'section': 'SECTION A', 'subsection': 'CELLS', 'objective': 'état des cellules',
+     'keywords': [], 'difficulty': 3, 'page_number': 4, 'extra': None,
+     'source_file': 'CSEC-Biology-Syllabus.pdf'},
+    {'id': 'BIO-00001', 'section': 'SECTION B', 'subsection': 'DIET', 'objective': 'list food groups',
+     'keywords': ['diet'], 'difficulty': 2, 'page_number': 9, 'extra': [1, 'two'],
+     'source_file': 'CSEC-Human-and-Social-Biology-Syllabus.pdf'},
+]
+
+
+@pytest.fixture
+def store(tmp_path):
+    path = tmp_path / 'combined_syllabuses.objs'
+    assert write_store(path, OBJECTIVES) == len(OBJECTIVES)
+    with ObjectiveStore(path) as opened:
+        yield opened
+
+
+def test_round_trip(store):
+    assert len(store) == 3
+    assert list(store) == OBJECTIVES
+    assert store[1] == OBJECTIVES[1]
+    assert load_objectives(store.path) == OBJECTIVES
+
+
+def test_field_subset_and_lookups(store):
+    assert list(store.iter(fields=('id', 'keywords'))) == [{'id': o['id'], 'keywords': o['keywords']}
+                                                           for o in OBJECTIVES]
+    assert store.by_id('BIO-00001') == OBJECTIVES[1:]
+    assert store.by_id('BIO-00003') == []
+    assert list(store.where('section', 'SECTION B')) == [OBJECTIVES[2]]
+    with pytest.raises(IndexError):
+        store.record(3)
+
+
+def test_empty_store(tmp_path):
+    write_store(tmp_path / 'empty.objs', [])
+    assert load_objectives(tmp_path / 'empty.objs') == []
+
+
+def test_rejects_other_files(tmp_path):
+    (tmp_path / 'bad.objs').write_bytes(b'not a store at all')
+    with pytest.raises(ValueError):
+        ObjectiveStore(tmp_path / 'bad.objs')
@@ -0,0 +1,110 @@
+import json
+import socket
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from ollama_client import (AsyncOllamaClient, OllamaClient, OllamaError, OllamaTimeout, OllamaUnavailable,
+                           build_payload)
+
+
+class FakeOllama(BaseHTTPRequestHandler):
+    """/api/generate echoes the request body back as the response text; other paths misbehave on purpose."""
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        if self.path == '/slow':
+            time.sleep(1)
+        if self.path == '/broken':
+            return self.reply(500, b'model not found')
+        if self.path == '/garbled':
+            return self.reply(200, b'{not json')
+        self.reply(200, json.dumps({'response': body.decode()}).encode())
+
+    def reply(self, status, body):
+        self.send_response(status)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope='module')
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), FakeOllama)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def closed_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return f"http://127.0.0.1:{sock.getsockname()[1]}"
+
+
+def test_build_payload_nests_sampling_settings_under_options():
+    assert build_payload('llama3', 'hi') == {'model': 'llama3', 'prompt': 'hi', 'stream': False}
+    payload = build_payload('llama3', 'hi', format='json', temperature=0.7, num_predict=150,
+                            options={'top_p': 0.9, 'temperature': 0.1})
+    assert payload == {'model': 'llama3', 'prompt': 'hi', 'stream': False, 'format': 'json',
+                       'options': {'top_p': 0.9, 'temperature': 0.7, 'num_predict': 150}}
+    # A temperature of 0 is a setting, not a missing value
+    assert build_payload('llama3', 'hi', temperature=0)['options'] == {'temperature': 0}
+
+
+def test_generate_posts_the_built_payload(server):
+    with OllamaClient(server) as client:
+        sent = json.loads(client.generate('llama3', 'hi', temperature=0.5, format='json'))
+    assert sent == build_payload('llama3', 'hi', temperature=0.5, format='json')
+
+
+def test_errors_map_to_unavailable_timeout_or_error(server, closed_port, monkeypatch):
+    with OllamaClient(closed_port) as client:
+        with pytest.raises(OllamaUnavailable):
+            client.generate('llama3', 'hi')
+        assert client.available() is False
+
+    with OllamaClient(server) as client:
+        # A slow generation is not a missing server
+        with pytest.raises(OllamaTimeout):
+            client._request('POST', '/slow', 0.2, json={})
+        with pytest.raises(OllamaError, match='HTTP 500') as error:
+            client._request('POST', '/broken', 5, json={})
+        assert error.value.status == 500 and not isinstance(error.value, OllamaUnavailable)
+        with pytest.raises(OllamaError, match='invalid JSON'):
+            client._request('POST', '/garbled', 5, json={})
+
+        def connect_timeout(*args, **kwargs):
+            raise requests.ConnectTimeout("connect timed out")
+        monkeypatch.setattr(client.session, 'request', connect_timeout)
+        with pytest.raises(OllamaUnavailable):
+            client.generate('llama3', 'hi')
+
+
+def test_async_client_maps_errors_the_same_way(server, closed_port):
+    pytest.importorskip('aiohttp')
+
+    async def outcome(host, path, timeout):
+        async with AsyncOllamaClient(host) as client:
+            try:
+                return await client._request('POST', path, timeout, json={'prompt': 'hi'})
+            except OllamaError as e:
+                return type(e)
+
+    async def run():
+        return [await outcome(server, '/api/generate', 5), await outcome(server, '/slow', 0.2),
+                await outcome(server, '/broken', 5), await outcome(closed_port, '/api/generate', 5)]
+
+    ok, slow, broken, refused = asyncio.run(run())
+    assert json.loads(ok['response']) == {'prompt': 'hi'}
+    assert (slow, broken, refused) == (OllamaTimeout, OllamaError, OllamaUnavailable)
@@ -0,0 +1,16 @@
+from main import EnhancedCXCSyllabusParser
+from syllabus_io import iter_objectives
+
+
+def test_page_chunks_stitch_to_the_whole_file_output(tmp_path, syllabus_pdf):
+    syllabus_pdf(tmp_path / 'in' / 'CSEC-Biology-Syllabus.pdf', pages=7, seed=4)
+    outputs = {}
+    for mode, chunk in (('file', 0), ('page', 2)):
+        out_dir = tmp_path / mode
+        parser = EnhancedCXCSyllabusParser(str(out_dir), num_workers=2, build_index=False, emit_store=False,
+                                           tfidf_keywords=False, link_threshold=0)
+        parser.process_directory(str(tmp_path / 'in'), pages_per_chunk=chunk)
+        outputs[mode] = [{k: v for k, v in o.items() if k != 'extraction_date'}
+                         for o in iter_objectives(out_dir / 'CSEC-Biology-Syllabus.json')]
+    assert outputs['file']
+    assert outputs['page'] == outputs['file']
@@ -0,0 +1,63 @@
+import json
+import shutil
+
+import pytest
+
+from past_papers import PastPaperParser
+
+
+def paper(items):
+    return {'source_file': 'Paper.pdf', 'subject': 'Biology', 'items': items}
+
+
+def item(number, answer):
+    return {'number': number, 'stem': f"Item {number}?", 'options': ['a', 'b', 'c', 'd'], 'page': 1,
+            'stimulus': '', 'correctAnswer': answer}
+
+
+def test_question_rows_leave_out_items_without_an_answer():
+    rows = PastPaperParser.question_rows(paper([item(1, 2), item(2, None), item(3, 0)]))
+    assert [row[0] for row in rows] == ['PP_Biology_Paper_001', 'PP_Biology_Paper_003']
+    assert [json.loads(row[-1])['correctAnswer'] for row in rows] == [2, 0]
+
+
+def test_copy_under_another_folder_is_skipped_from_the_manifest(tmp_path, syllabus_pdf):
+    papers = tmp_path / 'papers'
+    syllabus_pdf(papers / 'Biology' / 'June-2019.pdf', pages=2)
+    parser = PastPaperParser(str(tmp_path / 'out'), num_workers=1)
+    first = parser.process_directory(str(papers))
+    assert first['stats']['processed'] == 1
+    assert first['stats']['loaded_into_db'] == 0
+    assert not (tmp_path / 'questions.db').exists()
+
+    (papers / 'Integrated').mkdir()
+    shutil.copy(papers / 'Biology' / 'June-2019.pdf', papers / 'Integrated' / 'June-2019.pdf')
+    second = PastPaperParser(str(tmp_path / 'out'), num_workers=1).process_directory(str(papers))
+    assert second['stats']['skipped'] == 2
+    assert second['stats']['failed'] == 0
+    assert second['stats']['image_only_pages'] == first['stats']['image_only_pages']
+
+
+def test_missing_output_is_parsed_again(tmp_path, syllabus_pdf):
+    papers = tmp_path / 'papers'
+    syllabus_pdf(papers / 'Biology' / 'June-2019.pdf', pages=2)
+    PastPaperParser(str(tmp_path / 'out'), num_workers=1).process_directory(str(papers))
+    for output in (tmp_path / 'out').glob('Biology-*.json'):
+        output.unlink()
+    again = PastPaperParser(str(tmp_path / 'out'), num_workers=1).process_directory(str(papers))
+    assert again['stats']['processed'] == 1
+
+
+@pytest.mark.parametrize('heading', ["Items 4-5 refer to the diagram of a flower below.",
+                                     "Items 4 and 5 refer to the diagram of a flower below."])
+def test_shared_stimulus_range_keeps_each_item_number(tmp_path, heading):
+    column = "\n".join([
+        "3. Which organ produces bile?", "(A) Liver", "(B) Heart", "(C) Lung", "(D) Kidney",
+        heading,
+        "4. Which part is the stigma?", "(A) P", "(B) Q", "(C) R", "(D) S",
+        "5. Which part produces pollen?", "(A) P", "(B) Q", "(C) R", "(D) S",
+    ])
+    items = PastPaperParser(str(tmp_path), num_workers=1).parse_items([{'columns': [column]}])
+    assert [i['number'] for i in items] == [3, 4, 5]
+    assert [bool(i['stimulus']) for i in items] == [False, True, True]
+    assert items[1]['stimulus'] == items[2]['stimulus'] == heading
@@ -0,0 +1,59 @@
+import json
+
+import pytest
+
+from bench_row_postprocess import EXTRACTION_DATE, legacy_rows
+from main import EnhancedCXCSyllabusParser
+
+TABLES = [
+    [
+        ["SPECIFIC OBJECTIVES", "CONTENT", "SKILLS"],
+        ["1.  describe   the structure\tof the\nanimal cell;", "Nucleus,  cytoplasm\n and  membrane", "KC"],
+        ["2. explain how enzymes are affected by temperature and pH", "• Optimum temperature; • denaturation", "UK AK"],
+        # Continuation rows: an empty objective cell, then a row split over the cell below
+        [None, "further details of the previous row", None],
+        ["", "identify the parts of a flower and state their functions", "cross-pollination and self-pollination"],
+        ["analyse data from a food web   (KC, UK)", "Producers (plants); consumers", ""],
+        ["list the functions of the skeleton   CXC 21/G/SYLL 17", "Support and movement Page 12", "PS"],
+    ],
+    [
+        ["3.", "a number only"],
+        ["Short objective", "too short to keep"],
+        ["For queries write to the ADDRESS below, Tel: 555", "contact details"],
+        ["TOTAL", "30 marks"],
+        ["évaluate the café's energy use — critique it", "naïve approaches – and résumé", "RE"],
+        ["- design an experiment to investigate osmosis", "1. potato strips\n2. salt solutions", None],
+        ["single cell only"],
+        [],
+    ],
+    [],
+    None,
+]
+
+
+def serialized(objectives):
+    return json.dumps([o.to_dict() for o in objectives], ensure_ascii=False, indent=2)
+
+
+@pytest.fixture(scope='module')
+def parser(tmp_path_factory):
+    return EnhancedCXCSyllabusParser(str(tmp_path_factory.mktemp('out')), build_index=False, emit_store=False)
+
+
+def test_single_pass_matches_the_per_row_helpers(parser):
+    raw = {'text': "SECTION A: LIVING ORGANISMS\nTOPIC 1: CELLS", 'tables': TABLES}
+    current, _, _ = parser.objectives_from_raw(raw, 4, "General", "Unknown", "CSEC-Biology-Syllabus.pdf",
+                                               extraction_date=EXTRACTION_DATE)
+    section, subsection = parser._update_context(raw['text'], "General", "Unknown")
+    legacy = legacy_rows(parser, TABLES, 4, section, subsection, "CSEC-Biology-Syllabus.pdf")
+    assert len(current) >= 6
+    assert serialized(current) == serialized(legacy)
+
+
+@pytest.mark.parametrize('index', range(len(TABLES[0]) + len(TABLES[1])))
+def test_each_row_on_its_own(parser, index):
+    row = (TABLES[0] + TABLES[1])[index]
+    current, _, _ = parser.objectives_from_raw({'text': "", 'tables': [[row]]}, 1, "General", "Unknown",
+                                               "CSEC-Biology-Syllabus.pdf", extraction_date=EXTRACTION_DATE)
+    assert serialized(current) == serialized(legacy_rows(parser, [[row]], 1, "General", "Unknown",
+                                                         "CSEC-Biology-Syllabus.pdf"))
@@ -0,0 +1,46 @@
+import json
+
+from syllabus_index import SyllabusIndex, subject_from_source
+
+
+def obj(oid, text, source, keywords=(), page=1):
+    return {'id': oid, 'hash': oid.lower(), 'objective': text, 'content': '', 'section': 'SECTION A',
+            'subsection': '', 'keywords': list(keywords), 'page_number': page, 'difficulty': 1,
+            'source_file': source}
+
+
+BIO = 'CSEC-Biology-Syllabus.pdf'
+POB = 'CSEC-Principles-of-Business-Syllabus-.pdf'
+
+
+def test_subject_from_source():
+    assert subject_from_source(POB) == 'Principles of Business'
+    assert subject_from_source('CSEC-Social-Studies-Effective-from-2010-2024.pdf') == 'Social Studies'
+    assert subject_from_source(None) == 'General'
+
+
+def test_replace_sources_keeps_fts_and_keywords_in_step(tmp_path):
+    index = SyllabusIndex.build(tmp_path / 'index.db', [
+        obj('BIO-1', 'describe photosynthesis in plants', BIO, ['photosynthesis']),
+        obj('BIO-2', 'explain osmosis', BIO, ['osmosis']),
+        obj('POB-1', 'outline sources of finance', POB, ['finance'])])
+    with index:
+        assert [o['id'] for o in index.search('photosynthesis')] == ['BIO-1']
+
+        shard = tmp_path / 'CSEC-Biology-Syllabus.json'
+        shard.write_text(json.dumps([obj('BIO-3', 'describe respiration in cells', BIO, ['respiration'])]))
+        stats = index.replace_sources({BIO: shard})
+        assert stats == {'removed': 2, 'added': 1}
+        assert index.search('photosynthesis') == []
+        assert index.by_keyword('osmosis') == []
+        assert [o['id'] for o in index.search('respiration')] == ['BIO-3']
+        assert [o['id'] for o in index.by_keyword('respiration', 'Biology')] == ['BIO-3']
+
+        assert index.replace_sources({}, removed=[POB]) == {'removed': 1, 'added': 0}
+        assert index.subjects() == {'Biology': 1}
+        assert index.search('finance') == []
+        assert index.by_keyword('finance') == []
+
+        # Rows can be passed directly as well as a per-file JSON
+        index.replace_sources({POB: [obj('POB-2', 'define a budget', POB, ['budget'], page=5)]})
+        assert [o['id'] for o in index.by_page('Principles of Business', 5)] == ['POB-2']
@@ -0,0 +1,73 @@
+import os
+import json
+
+from objective_store import write_store
+from syllabus_io import (COMBINED_JSON, COMBINED_NDJSON, COMBINED_STORE, find_combined, iter_objectives,
+                         patch_combined, writer_for)
+
+
+def write(path, objectives, mtime):
+    with writer_for(path) as writer:
+        writer.write_many(objectives)
+    os.utime(path, ns=(mtime, mtime))
+    return path
+
+
+def obj(oid, text, source='CSEC-Biology-Syllabus.pdf'):
+    return {'id': oid, 'objective': text, 'content': '', 'hash': oid.lower(), 'source_file': source}
+
+
+def test_find_combined_picks_the_newer_combined_format(tmp_path):
+    write(tmp_path / COMBINED_NDJSON, [obj('BIO-1', 'old')], 1_000_000_000)
+    write(tmp_path / COMBINED_JSON, [obj('BIO-1', 'new')], 2_000_000_000)
+    assert find_combined(tmp_path) == tmp_path / COMBINED_JSON
+    os.utime(tmp_path / COMBINED_NDJSON, ns=(3_000_000_000, 3_000_000_000))
+    assert find_combined(tmp_path) == tmp_path / COMBINED_NDJSON
+
+
+def test_find_combined_uses_the_store_only_while_current(tmp_path):
+    assert find_combined(tmp_path) == tmp_path / COMBINED_JSON
+    write(tmp_path / COMBINED_JSON, [obj('BIO-1', 'a')], 2_000_000_000)
+    write_store(tmp_path / COMBINED_STORE, [obj('BIO-1', 'a')])
+    os.utime(tmp_path / COMBINED_STORE, ns=(2_000_000_000, 2_000_000_000))
+    assert find_combined(tmp_path) == tmp_path / COMBINED_STORE
+    os.utime(tmp_path / COMBINED_JSON, ns=(3_000_000_000, 3_000_000_000))
+    assert find_combined(tmp_path) == tmp_path / COMBINED_JSON
+
+
+def test_json_writer_matches_json_dump(tmp_path):
+    objectives = [obj('BIO-1', 'état'), obj('BIO-2', 'two\nlines')]
+    write(tmp_path / COMBINED_JSON, objectives, 1_000_000_000)
+    assert (tmp_path / COMBINED_JSON).read_text(encoding='utf-8') == json.dumps(objectives, indent=2,
+                                                                               ensure_ascii=False)
+    assert list(iter_objectives(tmp_path / COMBINED_JSON)) == objectives
+
+
+def test_generator_skips_a_stale_store(tmp_path):
+    import generate_questions_ollama_firestore as firestore
+    (tmp_path / 'CSEC-Biology-Syllabus.json').write_text(json.dumps([obj('BIO-1', 'reparsed')]), encoding='utf-8')
+    write(tmp_path / COMBINED_JSON, [obj('BIO-1', 'reparsed')], 3_000_000_000)
+    write_store(tmp_path / COMBINED_STORE, [obj('BIO-1', 'stale')])
+    os.utime(tmp_path / COMBINED_STORE, ns=(2_000_000_000, 2_000_000_000))
+    assert [o['objective'] for o in firestore._iter_objectives(tmp_path)] == ['reparsed']
+
+    os.utime(tmp_path / COMBINED_STORE, ns=(4_000_000_000, 4_000_000_000))
+    assert [o['objective'] for o in firestore._iter_objectives(tmp_path)] == ['stale']
+
+
+def test_patch_combined_merges_on_hash(tmp_path):
+    combined = write(tmp_path / COMBINED_NDJSON, [obj('BIO-1', 'kept'), obj('BIO-2', 'edited'), obj('BIO-3', 'gone'),
+                                                  obj('POB-1', 'other subject', 'CSEC-POB.pdf'),
+                                                  obj('CHEM-1', 'deleted file', 'CSEC-Chemistry.pdf')],
+                     1_000_000_000)
+    shard = tmp_path / 'CSEC-Biology-Syllabus.json'
+    shard.write_text(json.dumps([obj('BIO-1', 'kept'), dict(obj('BIO-2', 'edited'), content='new column'),
+                                 obj('BIO-4', 'added')]), encoding='utf-8')
+
+    stats = patch_combined(combined, {'CSEC-Biology-Syllabus.pdf': shard}, removed=['CSEC-Chemistry.pdf'])
+
+    assert stats == {'kept': 1, 'updated': 2, 'added': 1, 'removed': 2}
+    patched = list(iter_objectives(combined))
+    assert [o['id'] for o in patched] == ['BIO-1', 'BIO-2', 'POB-1', 'BIO-4']
+    assert patched[1]['content'] == 'new column'
+    assert not combined.with_name(combined.name + '.partial').exists()
@@ -0,0 +1,47 @@
+import pytest
+
+from main import LINE_TABLE_SETTINGS, TEXT_TABLE_SETTINGS, TableStrategySelector
+
+TABLE = [["SPECIFIC OBJECTIVES", "CONTENT"], ["describe the cell", "nucleus"]]
+
+
+class FakePage:
+    """Ruling objects plus canned extract_tables answers per strategy."""
+
+    def __init__(self, ruling=0, lines=(), text=()):
+        self.lines, self.rects, self.curves = [object()] * ruling, [], []
+        self.answers = {id(LINE_TABLE_SETTINGS): list(lines), id(TEXT_TABLE_SETTINGS): list(text)}
+        self.tried = []
+
+    def extract_tables(self, settings):
+        self.tried.append('lines' if settings is LINE_TABLE_SETTINGS else 'text')
+        return self.answers[id(settings)]
+
+
+@pytest.mark.parametrize('ruling, text_tables, expected', [
+    (0, True, ['text']), (1, True, ['lines', 'text']), (40, True, ['lines', 'text']),
+    (0, False, []), (3, False, ['lines']),
+])
+def test_choose_follows_the_page_rulings(ruling, text_tables, expected):
+    assert TableStrategySelector(text_tables=text_tables).choose(FakePage(ruling)) == expected
+
+
+def test_choice_does_not_depend_on_earlier_pages():
+    selector = TableStrategySelector()
+    # Many sparse pages whose tables only the text strategy finds
+    for _ in range(5):
+        assert selector.extract_tables(FakePage(2, text=[TABLE])) == ([TABLE], 'text')
+    page = FakePage(2, lines=[TABLE], text=[TABLE[:1]])
+    assert selector.extract_tables(page) == ([TABLE], 'lines') and page.tried == ['lines']
+
+
+def test_extract_tables_falls_back_and_counts():
+    selector = TableStrategySelector()
+    ruled_miss, bare, empty = FakePage(4, text=[TABLE]), FakePage(0, text=[TABLE]), FakePage(4)
+    assert selector.extract_tables(ruled_miss) == ([TABLE], 'text') and ruled_miss.tried == ['lines', 'text']
+    assert selector.extract_tables(bare) == ([TABLE], 'text') and bare.tried == ['text']
+    assert selector.extract_tables(empty) == ([], None)
+    stats = selector.stats
+    assert (stats['pages'], stats['lines_passes_skipped']) == (3, 1)
+    assert (stats['lines']['attempts'], stats['lines']['hits']) == (2, 0)
+    assert (stats['text']['attempts'], stats['text']['hits']) == (3, 2)
@@ -0,0 +1,70 @@
+import pickle
+import shutil
+
+from main import EnhancedCXCSyllabusParser
+from syllabus_io import iter_objectives
+
+SOCIAL = 'CSEC-Social-Studies-Syllabus.pdf'
+BIOLOGY = 'CSEC-Biology-Syllabus.pdf'
+
+
+def parse_once(tmp_path, syllabus_pdf):
+    syllabus_pdf(tmp_path / 'in' / SOCIAL, seed=1)
+    syllabus_pdf(tmp_path / 'in' / BIOLOGY, seed=2)
+    parser = EnhancedCXCSyllabusParser(str(tmp_path / 'out'), num_workers=1, build_index=False, emit_store=False)
+    pool = parser.worker_pool(1)
+    parser.process_directory(str(tmp_path / 'in'), lean_ipc=True, pool=pool)
+    return parser, pool
+
+
+def sources(parser):
+    counts = {}
+    for obj in iter_objectives(parser.combined_path()):
+        counts[obj['source_file']] = counts.get(obj['source_file'], 0) + 1
+    return counts
+
+
+def test_deleting_original_keeps_output_of_a_copy(tmp_path, syllabus_pdf):
+    parser, pool = parse_once(tmp_path, syllabus_pdf)
+    in_dir = tmp_path / 'in'
+    with pool:
+        before = sources(parser)
+        assert before[SOCIAL] > 0
+
+        shutil.copy(in_dir / SOCIAL, in_dir / 'Copy-Social.pdf')
+        parser._apply_changes(pool, in_dir, ['Copy-Social.pdf'], [], 'json', 0)
+        (in_dir / SOCIAL).unlink()
+        parser._apply_changes(pool, in_dir, [], [SOCIAL], 'json', 0)
+
+        assert sources(parser) == before
+        entry = next(e for e in parser.manifest.documents.values() if e['filename'] == SOCIAL)
+        assert entry['sources'] == [str(in_dir / 'Copy-Social.pdf')]
+        assert (parser.output_dir / entry['output_file']).exists()
+
+        # The last copy going away takes the output with it
+        (in_dir / 'Copy-Social.pdf').unlink()
+        parser._apply_changes(pool, in_dir, [], ['Copy-Social.pdf'], 'json', 0)
+        assert sources(parser) == {BIOLOGY: before[BIOLOGY]}
+        assert not (parser.output_dir / entry['output_file']).exists()
+
+
+def test_copies_present_at_startup_are_sources_too(tmp_path, syllabus_pdf):
+    syllabus_pdf(tmp_path / 'in' / 'Copy-Social.pdf', seed=1)
+    parser, pool = parse_once(tmp_path, syllabus_pdf)
+    in_dir = tmp_path / 'in'
+    with pool:
+        before = sources(parser)
+        parsed = next(name for name in ('Copy-Social.pdf', SOCIAL) if name in before)
+        (in_dir / parsed).unlink()
+        parser._apply_changes(pool, in_dir, [], [parsed], 'json', 0)
+        assert sources(parser) == before
+
+
+def test_pool_tasks_leave_the_keyword_model_behind(tmp_path, syllabus_pdf):
+    parser, pool = parse_once(tmp_path, syllabus_pdf)
+    pool.shutdown()
+    assert parser.keyword_model is not None
+    task = pickle.loads(pickle.dumps(parser.parse_single_pdf))
+    assert task.__self__.keyword_model is None
+    assert task.__self__.output_dir == parser.output_dir
+    assert parser.keyword_model is not None
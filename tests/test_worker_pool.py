@@ -0,0 +1,149 @@
+import os
+import json
+import time
+import signal
+
+import pytest
+
+import worker_pool
+from worker_pool import SupervisedPool, TaskTimeout, WorkerCrashed
+
+
+def echo(value):
+    return value
+
+
+def pid(_):
+    return os.getpid()
+
+
+def sleep_for(seconds):
+    time.sleep(seconds)
+    return seconds
+
+
+def stubborn(seconds):
+    # Stands in for a task stuck in native code, which the interval timer cannot interrupt
+    signal.signal(signal.SIGALRM, signal.SIG_IGN)
+    time.sleep(seconds)
+    return seconds
+
+
+def crash_on(value):
+    if value == 'bad':
+        os._exit(1)
+    return value
+
+
+def huge_rss():
+    return 10_000.0
+
+
+def run(pool):
+    with pool:
+        return {key: (result, error) for key, result, error in pool.completed()}
+
+
+def test_results_and_task_errors():
+    pool = SupervisedPool(2)
+    for n in range(5):
+        pool.submit(n, echo, n * n)
+    pool.submit('boom', int, 'not a number')
+    results = run(pool)
+    assert {k: r for k, (r, e) in results.items() if e is None} == {n: n * n for n in range(5)}
+    assert isinstance(results['boom'][1], ValueError)
+
+
+def test_deadline_raises_task_timeout():
+    pool = SupervisedPool(2, timeout=0.5)
+    pool.submit('slow', sleep_for, 10)
+    pool.submit('fast', sleep_for, 0.01)
+    started = time.monotonic()
+    results = run(pool)
+    assert time.monotonic() - started < 5
+    assert isinstance(results['slow'][1], TaskTimeout)
+    assert results['fast'] == (0.01, None)
+    assert pool.stats['timeouts'] == 1 and pool.stats['killed'] == 0
+
+
+def test_stuck_task_is_killed_and_bystanders_rerun(monkeypatch):
+    monkeypatch.setattr(worker_pool, 'KILL_GRACE_SECONDS', 0.2)
+    pool = SupervisedPool(2, timeout=3.0)
+    pool.submit('stuck', stubborn, 60)
+    # The other worker runs 0-2.5s and 2.5-5s, so the bystander is in flight at the kill (~3.5s)
+    pool.submit('first', sleep_for, 2.5)
+    pool.submit('bystander', sleep_for, 2.5)
+    started = time.monotonic()
+    results = run(pool)
+    assert time.monotonic() - started < 20
+    assert isinstance(results['stuck'][1], TaskTimeout)
+    assert results['first'] == results['bystander'] == (2.5, None)
+    assert pool.stats['killed'] == 1
+    assert pool.stats['requeued'] == 1
+
+
+def test_crash_fails_only_the_task_that_caused_it():
+    pool = SupervisedPool(2)
+    for key in ('a', 'bad', 'b', 'c'):
+        pool.submit(key, crash_on, key)
+    results = run(pool)
+    assert isinstance(results['bad'][1], WorkerCrashed)
+    assert {k: results[k] for k in 'abc'} == {k: (k, None) for k in 'abc'}
+    assert pool.stats['crashes'] == 1
+    assert pool.stats['requeued'] >= 1
+
+
+def test_recycles_after_n_tasks_per_worker():
+    pool = SupervisedPool(1, max_tasks_per_worker=2)
+    for n in range(6):
+        pool.submit(n, pid, n)
+    results = run(pool)
+    assert all(error is None for _, error in results.values())
+    pids = [results[n][0] for n in range(6)]
+    assert pids[0] == pids[1] != pids[2] == pids[3] != pids[4] == pids[5]
+    assert pool.stats['recycled'] == 3
+
+
+@pytest.mark.parametrize('limit, recycled', [(100.0, True), (None, False)])
+def test_recycles_on_worker_rss(limit, recycled):
+    pool = SupervisedPool(1, recycle_rss_mb=limit, rss_probe=huge_rss)
+    for n in range(3):
+        pool.submit(n, pid, n)
+    results = run(pool)
+    pids = {result for result, _ in results.values()}
+    assert (len(pids) == 3) is recycled
+    assert (pool.stats['recycled'] >= 2) is recycled
+
+
+def parsed(seconds, **extra):
+    return dict({'success': True, 'pages': 4, 'timings': {'elapsed_seconds': seconds}}, **extra)
+
+
+def test_outliers_ignore_skipped_duplicate_and_failed_files(tmp_path):
+    from main import EnhancedCXCSyllabusParser
+
+    parser = EnhancedCXCSyllabusParser(str(tmp_path), num_workers=1, file_timeout=30)
+    results = {'a.pdf': parsed(1.0), 'b.pdf': parsed(1.2), 'c.pdf': parsed(9.0),
+               'skipped.pdf': {'success': True, 'skipped': True},
+               'copy.pdf': {'success': True, 'skipped': True, 'duplicate_of': 'a.pdf'},
+               'failed.pdf': {'success': False, 'error': 'bad xref'},
+               'stuck.pdf': {'success': False, 'timed_out': True, 'error': 'timed out'}}
+    outliers = parser.outliers(results)
+    assert [(o['file'], o['reason']) for o in outliers] == [('stuck.pdf', 'timed_out'), ('c.pdf', 'slow')]
+    assert outliers[1]['times_median'] == 7.5
+
+
+def test_rerun_with_skipped_files_writes_a_summary(tmp_path, syllabus_pdf):
+    from main import EnhancedCXCSyllabusParser
+
+    names = [f"CSEC-Subject{i}-Syllabus.pdf" for i in range(4)]
+    for seed, name in enumerate(names):
+        syllabus_pdf(tmp_path / 'in' / name, pages=2, seed=seed)
+    parser = EnhancedCXCSyllabusParser(str(tmp_path / 'out'), num_workers=1, build_index=False, emit_store=False)
+    parser.process_directory(str(tmp_path / 'in'))
+    for seed, name in enumerate(names[1:], start=10):
+        syllabus_pdf(tmp_path / 'in' / name, pages=2, seed=seed)
+    parser.process_directory(str(tmp_path / 'in'))
+    summary = json.loads((tmp_path / 'out' / 'processing_summary.json').read_text())
+    assert (summary['stats']['processed'], summary['stats']['skipped'], summary['stats']['failed']) == (3, 1, 0)
+    assert summary['outliers'] == []
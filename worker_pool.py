@@ -0,0 +1,211 @@
+"""
+Supervised process pool for the syllabus parser: per-task deadlines, worker recycling
+and crash isolation on top of ProcessPoolExecutor.
+
+At most `workers` tasks are in flight, so a task starts when it is handed to the
+executor and its deadline can be measured from there. Inside the worker a deadline
+is an interval timer that raises TaskTimeout (where signal.setitimer exists); a task
+stuck past its deadline plus KILL_GRACE_SECONDS, e.g. in native code, gets its pool
+generation terminated. A generation is also retired after max_tasks_per_worker tasks
+per worker or once a worker reports more than recycle_rss_mb resident, and later
+tasks go to a fresh one. Tasks caught in a crashed or killed generation are re-run;
+one that was in flight during a crash re-runs alone, so a second crash is its own.
+"""
+
+import time
+import signal
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Iterator, Optional
+
+# Past its deadline plus this, a task that has not raised TaskTimeout is killed with its pool
+KILL_GRACE_SECONDS = 15.0
+
+
+class TaskTimeout(BaseException):
+    """
+    A task ran past its deadline. A BaseException so the parsing code's own
+    `except Exception` handlers let it through, like KeyboardInterrupt.
+    """
+
+
+class WorkerCrashed(Exception):
+    """The worker running a task died, and the task crashed its worker again when re-run alone."""
+
+
+def _raise_timeout(signum, frame):
+    raise TaskTimeout()
+
+
+def _call(fn: Callable, args: tuple, timeout: Optional[float], rss_probe: Optional[Callable]) -> tuple:
+    """Worker side: run fn(*args) under an interval timer; returns (result, worker RSS in MB)."""
+    armed = (timeout and hasattr(signal, 'setitimer')
+             and threading.current_thread() is threading.main_thread())
+    if armed:
+        previous = signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        result = fn(*args)
+    finally:
+        if armed:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous)
+    return result, rss_probe() if rss_probe else None
+
+
+class _Task:
+    __slots__ = ('key', 'fn', 'args', 'solo', 'started', 'generation', 'overdue')
+
+    def __init__(self, key, fn: Callable, args: tuple, solo: bool = False):
+        self.key = key
+        self.fn = fn
+        self.args = args
+        self.solo = solo
+        self.started = None
+        self.generation = None
+        self.overdue = False
+
+
+class _Generation:
+    """One ProcessPoolExecutor; retired generations finish their in-flight tasks and exit."""
+
+    __slots__ = ('executor', 'completed', 'killed')
+
+    def __init__(self, workers: int):
+        self.executor = ProcessPoolExecutor(max_workers=workers)
+        self.completed = 0
+        self.killed = False
+
+    def terminate(self) -> None:
+        # ProcessPoolExecutor has no per-task cancel once running; ending its processes
+        # breaks the pool, which fails every future it holds with BrokenProcessPool
+        self.killed = True
+        for process in list((getattr(self.executor, '_processes', None) or {}).values()):
+            process.terminate()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+class SupervisedPool:
+    """
+    submit() queues a task under a key; completed() runs the queue and yields
+    (key, result, error) as tasks finish, error being None, TaskTimeout, WorkerCrashed
+    or the task's own exception. Tasks may be submitted while completed() is iterating.
+    """
+
+    def __init__(self, workers: int, timeout: Optional[float] = None, max_tasks_per_worker: int = 0,
+                 recycle_rss_mb: Optional[float] = None, rss_probe: Optional[Callable] = None):
+        self.workers = max(1, workers)
+        self.timeout = timeout or None
+        self.max_tasks_per_worker = max_tasks_per_worker
+        self.recycle_rss_mb = recycle_rss_mb
+        # Called in the worker after each task when recycle_rss_mb is set (picklable, e.g. a module function)
+        self.rss_probe = rss_probe if recycle_rss_mb else None
+        self._queue = deque()
+        self._running = {}
+        self._generation = None
+        self.stats = {'timeouts': 0, 'killed': 0, 'crashes': 0, 'recycled': 0, 'requeued': 0}
+
+    def submit(self, key, fn: Callable, *args) -> None:
+        self._queue.append(_Task(key, fn, args))
+
+    def _current(self) -> _Generation:
+        if self._generation is None:
+            self._generation = _Generation(self.workers)
+        return self._generation
+
+    def _retire(self, generation: _Generation, reason: str) -> None:
+        if generation is self._generation:
+            self._generation = None
+            generation.executor.shutdown(wait=False)
+            self.stats[reason] += 1
+
+    def _start(self, task: _Task) -> None:
+        generation = self._current()
+        task.started = time.monotonic()
+        task.generation = generation
+        future = generation.executor.submit(_call, task.fn, task.args, self.timeout, self.rss_probe)
+        self._running[future] = task
+
+    def _fill(self) -> None:
+        while self._queue and len(self._running) < self.workers:
+            if any(t.solo for t in self._running.values()):
+                return
+            if self._queue[0].solo:
+                if self._running:
+                    return
+                self._start(self._queue.popleft())
+                return
+            self._start(self._queue.popleft())
+
+    def _overdue(self) -> None:
+        if self.timeout is None:
+            return
+        limit = self.timeout + KILL_GRACE_SECONDS
+        now = time.monotonic()
+        for task in list(self._running.values()):
+            if now - task.started > limit and not task.generation.killed:
+                task.overdue = True
+                self.stats['killed'] += 1
+                if task.generation is self._generation:
+                    self._generation = None
+                task.generation.terminate()
+
+    def _finish(self, future, task: _Task) -> Optional[tuple]:
+        """(key, result, error) for a finished future, or None when the task was re-queued."""
+        generation = task.generation
+        result, rss, error = None, None, None
+        try:
+            result, rss = future.result()
+        except TaskTimeout as e:
+            self.stats['timeouts'] += 1
+            error = e
+        except BrokenProcessPool as e:
+            if generation is self._generation:
+                self._generation = None
+            if task.overdue:
+                self.stats['timeouts'] += 1
+                return task.key, None, TaskTimeout()
+            if generation.killed:
+                # Bystander of a killed task: run it again as if nothing happened
+                self.stats['requeued'] += 1
+                self._queue.appendleft(_Task(task.key, task.fn, task.args, task.solo))
+                return None
+            if task.solo:
+                self.stats['crashes'] += 1
+                return task.key, None, WorkerCrashed(str(e) or "worker process died")
+            self.stats['requeued'] += 1
+            self._queue.append(_Task(task.key, task.fn, task.args, solo=True))
+            return None
+        except Exception as e:
+            error = e
+        # Failed and timed-out tasks count too: a worker that hit its deadline is the one to retire
+        generation.completed += 1
+        if self.recycle_rss_mb and rss and rss > self.recycle_rss_mb:
+            self._retire(generation, 'recycled')
+        elif self.max_tasks_per_worker and generation.completed >= self.max_tasks_per_worker * self.workers:
+            self._retire(generation, 'recycled')
+        return task.key, result, error
+
+    def completed(self) -> Iterator[tuple]:
+        while self._queue or self._running:
+            self._fill()
+            done, _ = wait(list(self._running), timeout=1.0 if self.timeout else None,
+                           return_when=FIRST_COMPLETED)
+            for future in done:
+                finished = self._finish(future, self._running.pop(future))
+                if finished is not None:
+                    yield finished
+            self._overdue()
+
+    def shutdown(self) -> None:
+        if self._generation is not None:
+            self._generation.executor.shutdown(wait=True)
+            self._generation = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()